@@ -0,0 +1,91 @@
+# benchmarks/bench_assets.py
+"""
+Client dice loading: the old per-image loader vs. DiceAtlas with a cold and a
+warm disk cache, plus the blit cost of unconverted vs. display-format faces.
+
+    python -m benchmarks.bench_assets [--repeat 5]
+
+Runs headless (SDL dummy video driver) unless a display driver is already set.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pygame
+
+from src.client.assets import DiceAtlas, DICE_COLORS, DICE_NUMBERS
+
+ASSET_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "dice")
+SIZE = (300, 300)
+
+
+def legacy_load():
+    """ What ui.py did at import time before the atlas. """
+    images = {}
+    for color in DICE_COLORS:
+        images[color] = {}
+        for number in DICE_NUMBERS:
+            img = pygame.image.load(os.path.join(ASSET_DIR, f"{color}{number}.png"))
+            images[color][number] = pygame.transform.scale(img, SIZE)
+    return images
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def blit_rate(surface, screen, seconds=0.5):
+    blits = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(50):
+            screen.blit(surface, (50, 230))
+        blits += 50
+    return blits / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    cache_dir = tempfile.mkdtemp(prefix="mindroll-bench-")
+    try:
+        def cold():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            DiceAtlas(ASSET_DIR, SIZE, cache_dir=cache_dir).load()
+
+        def warm():
+            atlas = DiceAtlas(ASSET_DIR, SIZE, cache_dir=cache_dir).load()
+            assert atlas.loaded_from_cache
+
+        print(f"{'loader':<28}{'best ms':>10}")
+        print(f"{'legacy (30 PNG + scale)':<28}{timed(legacy_load, options.repeat):>10.1f}")
+        print(f"{'atlas, cold cache':<28}{timed(cold, options.repeat):>10.1f}")
+        print(f"{'atlas, warm cache':<28}{timed(warm, options.repeat):>10.1f}")
+
+        raw = legacy_load()["red"][1]
+        face = DiceAtlas(ASSET_DIR, SIZE, cache_dir=cache_dir).get("red", 1)
+        print()
+        print(f"{'blit 300x300 face':<28}{'blits/s':>10}")
+        print(f"{'unconverted':<28}{blit_rate(raw, screen):>10.0f}")
+        print(f"{'atlas (display format)':<28}{blit_rate(face, screen):>10.0f}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_backends.py
+"""
+Login and token-validation throughput for each user store backend.
+
+    python -m benchmarks.bench_backends [--users 200] [--threads 1 4] [--mongo-uri mongodb://localhost:27017]
+
+memory, sqlite (a temporary file) and mongo-fake (MongoUserService over
+benchmarks/fake_mongo.py, sleeping --fake-latency per operation) always run;
+a real mongo runs only with --mongo-uri. bcrypt is turned down to 4 rounds so
+the store, not the hash, is what gets measured.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import bcrypt
+
+from src.common import log
+from src.common.users import Credentials, User
+from src.common.users.auth_service import AuthService
+from src.common.users.store import create_store
+from benchmarks.fake_mongo import FakeMongoClient
+
+
+def run_threads(threads, work):
+    """ work(thread_index) in `threads` threads; returns elapsed seconds. """
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def bench(store, users, threads, rounds):
+    setup_start = time.perf_counter()
+    auth = AuthService(store, debug=False, max_tokens_per_user=None)
+    startup_ms = (time.perf_counter() - setup_start) * 1000
+    store.add_users(User(f"user{i}", None, None, "pw") for i in range(users))
+
+    tokens = [None] * users
+    per_thread = users // threads
+
+    def login(t):
+        for i in range(t * per_thread, (t + 1) * per_thread):
+            tokens[i] = auth.authenticate(Credentials(f"user{i}", "pw")).signature
+
+    def validate(t):
+        mine = tokens[t * per_thread:(t + 1) * per_thread]
+        for _ in range(rounds):
+            for token in mine:
+                auth.validate_token_by_str(token)
+
+    logins = per_thread * threads / run_threads(threads, login)
+    validations = per_thread * threads * rounds / run_threads(threads, validate)
+    auth.stop()
+    return startup_ms, logins, validations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20, help="validations per token")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--fake-latency", type=float, default=0.0002, help="seconds per fake Mongo operation")
+    parser.add_argument("--mongo-uri", default=None)
+    options = parser.parse_args()
+    log.set_level("WARNING")
+    bcrypt_gensalt = bcrypt.gensalt
+    bcrypt.gensalt = lambda rounds=4, prefix=b"2b": bcrypt_gensalt(4, prefix)
+
+    tmp = tempfile.mkdtemp(prefix="mindroll-bench-")
+    backends = [
+        ("memory", "memory", lambda: {}),
+        ("sqlite", "sqlite", lambda: {"path": os.path.join(tmp, "users.db")}),
+        ("mongo-fake", "mongo", lambda: {"client": FakeMongoClient(latency=options.fake_latency)}),
+    ]
+    if options.mongo_uri:
+        backends.append(("mongo", "mongo", lambda: {"uri": options.mongo_uri, "db_name": "mindroll_bench"}))
+
+    print(f"{'backend':<12}{'threads':>8}{'startup ms':>12}{'logins/s':>12}{'validations/s':>16}")
+    try:
+        for threads in options.threads:
+            for label, backend, store_options in backends:
+                store = create_store(backend, **store_options())
+                store.delete_all_users()
+                startup_ms, logins, validations = bench(store, options.users, threads, options.rounds)
+                print(f"{label:<12}{threads:>8}{startup_ms:>12.2f}{logins:>12.0f}{validations:>16.0f}")
+                store.delete_all_users()
+                store.delete_expired(datetime.max)
+                store.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
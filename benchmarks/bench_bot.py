@@ -0,0 +1,59 @@
+# benchmarks/bench_bot.py
+"""
+Bot decisions per second for different table sizes.
+
+    python -m benchmarks.bench_bot [--seconds 1.0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.server.bot import BotPlayer, dice_sum_cdf
+from src.server.game_logic import GameRoom
+
+
+def build_room(player_count):
+    room = GameRoom("bench")
+    for i in range(player_count):
+        room.add_player(f"bot{i}")
+    room.called_number = random.randint(player_count, 6 * player_count)
+    return room
+
+
+def bench_decide(player_count, seconds):
+    room = build_room(player_count)
+    bot = BotPlayer(room.current_turn)
+    decide = bot.decide
+    decisions = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(1000):
+            decide(room)
+        decisions += 1000
+    elapsed = time.perf_counter() - start
+    return decisions / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BotPlayer decisions/sec")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per table size")
+    parser.add_argument("--max-players", type=int, default=8)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for n in range(1, args.max_players + 1):
+        dice_sum_cdf(n)
+    print(f"tables for 1..{args.max_players} dice built in {(time.perf_counter() - start) * 1e6:.1f} us")
+
+    print(f"{'players':>8} {'decisions/sec':>15} {'us/decision':>12}")
+    for n in range(2, args.max_players + 1):
+        rate = bench_decide(n, args.seconds)
+        print(f"{n:>8} {rate:>15,.0f} {1e6 / rate:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
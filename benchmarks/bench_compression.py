@@ -0,0 +1,159 @@
+# benchmarks/bench_compression.py
+"""
+CPU spent vs. bytes saved by compressing responses, across payload sizes.
+
+    python -m benchmarks.bench_compression [--pages 200] [--duration 3]
+
+First, for responses the server actually sends (a short ack, a game state,
+leaderboard, lobby and history pages of growing size), streams distinct pages
+of each kind through one FrameCompressor, as a connection would, and reports
+the bytes sent, the server's compression time and the client's extra decoding
+time per response. "pays below" is the link speed under which the bytes saved
+take longer to transmit than the CPU spent: compression only helps on slower
+links (MIN_SIZE in src/common/compression.py is set from this table).
+
+Then fetches lobby and leaderboard pages from a real server (in-process, over
+loopback) with and without negotiated compression and reports responses/s and
+bytes received per response.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench_history import make_events
+from src.client.rpc_client import MindRollClient
+from src.common import log
+from src.common.compression import FrameCompressor, FrameDecompressor, MIN_SIZE
+from src.common.utils import Request, Response, encode_message
+from src.server.rpc_server import MindRollServer
+
+
+def payloads(rng):
+    """ { name: function(i) -> the i-th distinct response of that kind } """
+    names = [f"player{rng.randrange(10 ** 6)}" for _ in range(10000)]
+    events = [event for _, event in make_events(100000, 1, rng)]
+
+    def leaderboard(k):
+        return lambda i: [{"rank": i * k + j + 1, "username": names[(i * k + j) % len(names)],
+                           "score": 10 ** 5 - (i * k + j) * 3} for j in range(k)]
+
+    def lobby(n):
+        return lambda i: {"rooms": [{"room_id": f"room{i * n + j}", "players": rng.randint(0, 6),
+                                     "started": rng.random() < 0.5, "spectators": rng.randint(0, 3)}
+                                    for j in range(n)], "total": 10 ** 4}
+
+    def history(n):
+        return lambda i: {"events": events[i * n:(i + 1) * n], "next": [i, (i + 1) * n]}
+
+    def state(i):
+        players = {names[i * 4 + j]: {"dice_number": rng.randint(1, 6), "dice_color": "red", "score": j,
+                                      "connected": True} for j in range(4)}
+        return {"players": players, "current_turn": names[i * 4], "called_number": 12, "winner": None}
+
+    return {"ack": lambda i: f"Player {names[i]} joined room room{i}", "game state": state,
+            "top 10": leaderboard(10), "lobby 20": lobby(20), "history 20": history(20),
+            "top 100": leaderboard(100), "lobby 200": lobby(200), "history 200": history(200),
+            "history 500": history(500)}
+
+
+def measure(make, pages, level):
+    """ Mean (raw bytes, sent bytes, compress seconds, extra decode seconds) per response. """
+    frames = [encode_message(Response(make(i), None, id=i)) for i in range(pages)]
+    compressor, decompressor = FrameCompressor(min_size=0, level=level), FrameDecompressor()
+    sent = compress = decode = 0
+    for frame in frames:
+        started = time.perf_counter()
+        compressed = compressor.compress(frame)
+        middle = time.perf_counter()
+        decompressor.decompress(json.loads(compressed))
+        done = time.perf_counter()
+        json.loads(frame)  # what the client spends without compression
+        decode += (done - middle) - (time.perf_counter() - done)
+        compress += middle - started
+        sent += len(compressed)
+    raw = sum(len(frame) for frame in frames)
+    return raw / pages, sent / pages, compress / pages, max(decode, 0.0) / pages
+
+
+def payload_table(pages, level):
+    print(f"\nzlib level {level}, {pages} distinct responses of each kind through one stream")
+    print(f"  {'response':<12} {'raw B':>8} {'sent B':>8} {'saved':>6} {'compress':>10} {'decode +':>10}"
+          f" {'pays below':>12}")
+    for name, make in payloads(random.Random(1)).items():
+        raw, sent, compress, decode = measure(make, pages, level)
+        saved = raw - sent
+        cpu = compress + decode
+        pays = f"{saved * 8 / cpu / 1e6:8.0f} Mb/s" if saved > 0 else "never"
+        print(f"  {name:<12} {raw:8.0f} {sent:8.0f} {saved / raw:6.0%} {compress * 1e6:8.1f}us {decode * 1e6:8.1f}us"
+              f" {pays:>12}")
+
+
+class CountingSocket:
+    """ Counts the bytes a MessageReader receives. """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.received = 0
+
+    def recv(self, bufsize):
+        data = self.sock.recv(bufsize)
+        self.received += len(data)
+        return data
+
+
+def fetch(address, compression, duration):
+    client = MindRollClient(address, auto_reconnect=False, compression=compression)
+    client.connect()
+    counter = client.reader.sock = CountingSocket(client.reader.sock)
+    rng = random.Random(2)
+    responses = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        if responses % 2:
+            response = client.list_rooms(rng.randrange(800), 200)
+        else:
+            response = client.leaderboard_top(100, rng.randrange(4900))
+        assert response is not None and response.error is None
+        responses += 1
+    client.close()
+    return responses, counter.received
+
+
+def end_to_end(duration):
+    server = MindRollServer(host="127.0.0.1", port=0, backend="memory", rate_limits=False)
+    threading.Thread(target=server.start, daemon=True).start()
+    while not server.running:
+        time.sleep(0.01)
+    try:
+        for i in range(1000):
+            server.create_room(Request("create_room", [f"room{i:04}"]))
+        rng = random.Random(3)
+        for i in range(5000):
+            server.leaderboard.add(f"player{rng.randrange(10 ** 6)}", rng.randint(1, 10 ** 4))
+        address = ("127.0.0.1", server.server_socket.getsockname()[1])
+        print(f"\nlobby pages of 200 and leaderboard pages of 100 over loopback, min_size {MIN_SIZE}")
+        for label, compression in (("uncompressed", False), ("compressed", True)):
+            responses, received = fetch(address, compression, duration)
+            print(f"  {label:<14} {responses / duration:8.0f} responses/s {received / responses:9.0f} B/response")
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="distinct responses per kind")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per end-to-end run")
+    args = parser.parse_args()
+    log.set_level("ERROR")
+    for level in (1, 6):
+        payload_table(args.pages, level)
+    end_to_end(args.duration)
+
+
+if __name__ == "__main__":
+    main()
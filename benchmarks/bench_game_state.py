@@ -0,0 +1,88 @@
+# benchmarks/bench_game_state.py
+"""
+Serialization CPU of get_game_state under polling, with and without the per-room encoding cache.
+
+    python -m benchmarks.bench_game_state [--rooms 20] [--polls 200000] [--players 4]
+
+Every room is polled round-robin (as 50 clients polling once a second would)
+and changes once every --polls-per-change polls. "dump per poll" is the
+previous behaviour: build the state dict and json.dumps it in encode_message
+for every response. "cached" is get_game_state now: the room re-encodes only
+after a change and the response splices those bytes.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.common import log
+from src.common.utils import Request, Response, encode_message
+from src.server.rpc_server import MindRollServer
+
+
+def make_server(rooms, players):
+    server = MindRollServer(port=0, backend="memory")
+    for r in range(rooms):
+        server.create_room(Request("create_room", [f"room{r}"]))
+        for p in range(players):
+            server.games[f"room{r}"].add_player(f"player{p}")
+    return server
+
+
+def change(game):
+    if game.called_number and game.called_number > 40:
+        game.reveal_result(game.current_turn)
+    else:
+        game.call_number(game.current_turn, (game.called_number or 3 * len(game.players) + 1) + 1)
+
+
+def dump_per_poll(server, request):
+    room_id = request.args[0]
+    game = server.games[room_id]
+    game.check_reconnection_timeout()
+    game.maybe_clear_result()
+    server.run_bots(room_id)
+    return encode_message(Response(game.state(), None, request.id))
+
+
+def cached(server, request):
+    response = server.get_game_state(request)
+    response.id = request.id
+    return encode_message(response)
+
+
+def run(poll, server, rooms, polls, polls_per_change):
+    requests = [Request("get_game_state", [f"room{r}"], id=1) for r in range(rooms)]
+    games = [server.games[f"room{r}"] for r in range(rooms)]
+    start = time.process_time()
+    for i in range(polls):
+        if i % polls_per_change == 0:
+            change(games[(i // polls_per_change) % rooms])
+        poll(server, requests[i % rooms])
+    return (time.process_time() - start) / polls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--polls", type=int, default=200000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--polls-per-change", type=int, nargs="+", default=[1, 10, 50, 500])
+    args = parser.parse_args()
+    log.set_level("WARNING")
+
+    print(f"{args.rooms} rooms x {args.players} players, {args.polls} polls; CPU per poll")
+    print(f"{'polls/change':>12}{'dump per poll':>16}{'cached':>12}{'saved':>8}")
+    for polls_per_change in args.polls_per_change:
+        results = []
+        for poll in (dump_per_poll, cached):
+            server = make_server(args.rooms, args.players)
+            results.append(run(poll, server, args.rooms, args.polls, polls_per_change))
+            server.stop()
+        before, after = results
+        print(f"{polls_per_change:>12}{before * 1e6:>14.2f}us{after * 1e6:>10.2f}us{1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# benchmarks/bench_handoff.py
+"""
+Pause seen by clients while a running server hands over to a new process.
+
+    python -m benchmarks.bench_handoff [--pollers 20] [--before 3] [--after 3]
+
+Starts a server process with --handoff (sqlite backend, so sessions survive)
+and keeps one table playing call_number / reveal_result plus get_game_state
+pollers running against it. After --before seconds a second process is
+started with the same flags; it takes over the listening socket and the
+rooms. Reports the pause the new server logged (old one stops serving to new
+one accepting), the worst latency clients saw, and requests that failed
+instead of being retried.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench_overload import free_port, client
+from src.common import log
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def spawn(port, directory, name):
+    stderr = open(os.path.join(directory, f"{name}.log"), "w")
+    return subprocess.Popen([sys.executable, "-m", "src.server.rpc_server", "--port", str(port),
+                             "--backend", "sqlite", "--db-path", os.path.join(directory, "users.db"),
+                             "--history-dir", os.path.join(directory, "history"), "--no-rate-limit",
+                             "--handoff", os.path.join(directory, "handoff.sock")],
+                            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=stderr), stderr
+
+
+class Worst:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.failed = {}
+        self.done = {}
+
+    def add(self, kind, seconds, ok):
+        with self.lock:
+            self.latency[kind] = max(self.latency.get(kind, 0.0), seconds)
+            self.done[kind] = self.done.get(kind, 0) + 1
+            if not ok:
+                self.failed[kind] = self.failed.get(kind, 0) + 1
+
+
+def sit_down(address):
+    """ alice and bob, each with a client of their own, so both sessions resume after the handoff. """
+    seats = {}
+    for name in ("alice", "bob"):
+        c = seats[name] = client(address)
+        c.register(name, "pw")
+        c.login(name, "pw")
+    seats["alice"].create_room("duel")
+    for name, c in seats.items():
+        c.join_room("duel", name)
+    return seats
+
+
+def play(seats, deadline, worst):
+    names, turn, number = ["alice", "bob"], 0, 7
+    while time.time() < deadline:
+        start = time.perf_counter()
+        c = seats[names[turn]]
+        if number > 30:
+            resp = c.reveal_result("duel", names[turn])
+            turn, number = 0, 7
+        else:
+            number += 1
+            resp = c.call_number("duel", names[turn], number)
+            turn = 1 - turn
+        worst.add("game action", time.perf_counter() - start, resp is not None and resp.error is None)
+        if resp is None or resp.error:
+            return
+    for c in seats.values():
+        c.close()
+
+
+def poll(address, deadline, worst):
+    c = client(address)
+    while time.time() < deadline:
+        start = time.perf_counter()
+        resp = c.get_game_state("duel")
+        worst.add("get_game_state", time.perf_counter() - start, resp is not None and resp.error is None)
+        time.sleep(0.01)
+    c.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pollers", type=int, default=20)
+    parser.add_argument("--before", type=float, default=3.0, help="seconds of load before the handoff")
+    parser.add_argument("--after", type=float, default=3.0, help="seconds of load after it")
+    options = parser.parse_args()
+    log.set_level("ERROR")
+
+    port = free_port()
+    address = ("127.0.0.1", port)
+    with tempfile.TemporaryDirectory() as directory:
+        old, old_log = spawn(port, directory, "old")
+        new = new_log = None
+        try:
+            while not os.path.exists(os.path.join(directory, "handoff.sock")):
+                time.sleep(0.05)
+            table = sit_down(address)
+            deadline = time.time() + options.before + options.after
+            worst = Worst()
+            threads = [threading.Thread(target=play, args=(table, deadline, worst), daemon=True)]
+            threads += [threading.Thread(target=poll, args=(address, deadline, worst), daemon=True)
+                        for _ in range(options.pollers)]
+            for thread in threads:
+                thread.start()
+            time.sleep(options.before)
+            new, new_log = spawn(port, directory, "new")
+            old.wait(30)
+            for thread in threads:
+                thread.join(options.after + 30)
+        finally:
+            for process in (old, new):
+                if process and process.poll() is None:
+                    process.terminate()
+                    process.wait(10)
+            for stderr in (old_log, new_log):
+                if stderr:
+                    stderr.close()
+        with open(os.path.join(directory, "new.log")) as f:
+            pause = re.search(r"Handoff complete .*pause_ms=([\d.]+)", f.read())
+
+    print(f"{options.pollers} pollers + one table, handoff after {options.before:.0f}s")
+    print(f"  old process exit code {old.returncode}")
+    print(f"  pause logged by the new server  {pause.group(1) + ' ms' if pause else 'not found'}")
+    for kind in ("game action", "get_game_state"):
+        print(f"  {kind:<16} worst latency {worst.latency.get(kind, 0.0) * 1e3:7.1f} ms   "
+              f"{worst.done.get(kind, 0)} requests, {worst.failed.get(kind, 0)} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_history.py
+"""
+Room history write throughput and replay latency.
+
+    python -m benchmarks.bench_history [--events 200000] [--rooms 1000] [--replays 2000]
+
+Appends game events for many rooms the way the server does (append() on the
+request thread, a background writer compressing them into segments), then
+replays random rooms from a random point in time and reports p50/p99 latency.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.common import log
+from src.server.history import RoomHistory
+
+
+def make_events(count, rooms, rng):
+    names = ["alice", "bob", "carol", "dave"]
+    events = []
+    for i in range(count):
+        kind = rng.choice(("call", "call", "call", "reveal", "join", "leave"))
+        event = {"t": time.time() + i * 1e-4, "type": kind, "player": rng.choice(names)}
+        if kind == "call":
+            event["number"] = rng.randint(7, 24)
+        elif kind == "reveal":
+            dice = {name: rng.randint(1, 6) for name in names}
+            event.update(number=rng.randint(7, 24), total=sum(dice.values()), dice=dice, winner="DRAW",
+                         result=f"{event['player']} loses! (Called number 20 > total dice sum {sum(dice.values())})")
+        events.append((f"room{rng.randrange(rooms)}", event))
+    return events
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--replays", type=int, default=2000)
+    parser.add_argument("--page", type=int, default=200, help="events per replay page")
+    args = parser.parse_args()
+    log.set_level("WARNING")
+    rng = random.Random(1)
+    events = make_events(args.events, args.rooms, rng)
+    raw_bytes = sum(len(json.dumps(event)) + 1 for _, event in events)
+
+    directory = tempfile.mkdtemp(prefix="mindroll-history-")
+    try:
+        history = RoomHistory(directory)
+        history.start()
+        start = time.perf_counter()
+        for room_id, event in events:
+            history.append(room_id, event)
+        appended = time.perf_counter() - start
+        while history.backlog():
+            time.sleep(0.01)
+        history.stop()
+        persisted = time.perf_counter() - start
+        print(f"{args.events} events over {args.rooms} rooms")
+        print(f"  append (request path)  {args.events / appended:>12,.0f} events/s  "
+              f"{appended / args.events * 1e6:.2f} us/event")
+        print(f"  persisted              {args.events / persisted:>12,.0f} events/s")
+        print(f"  on disk                {history.bytes_written / args.events:>12.1f} bytes/event "
+              f"({raw_bytes / history.bytes_written:.1f}x smaller than JSON lines)")
+
+        history = RoomHistory(directory)  # cold: index rebuilt from .idx files and block headers
+        times = [event["t"] for _, event in events]
+        latencies, returned = [], 0
+        for _ in range(args.replays):
+            room_id = f"room{rng.randrange(args.rooms)}"
+            since = rng.choice(times)
+            started = time.perf_counter()
+            page, _ = history.read(room_id, since=since, limit=args.page)
+            latencies.append(time.perf_counter() - started)
+            returned += len(page)
+        history.stop()
+        print(f"random replays ({args.replays}, up to {args.page} events each, {returned / args.replays:.0f} on average)")
+        print(f"  p50 {percentile(latencies, 50) * 1e3:.3f} ms   p99 {percentile(latencies, 99) * 1e3:.3f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_leaderboard.py
+"""
+Leaderboard cost as the number of ranked players grows.
+
+    python -m benchmarks.bench_leaderboard [--players 1000 10000 100000] [--ops 20000]
+
+Compares the SkipList-backed Leaderboard with a plain sorted list (bisect,
+O(n) inserts and removals) for score updates, rank lookups and top-10 pages,
+then compares write-behind with writing every change to SQLite and to the
+in-process Mongo stand-in.
+"""
+import argparse
+import bisect
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.fake_mongo import FakeMongoClient
+from src.common import log
+from src.common.users.store import create_store
+from src.server.leaderboard import Leaderboard
+
+
+class SortedListBoard:
+    """ The obvious alternative: one sorted list of (-score, username). """
+
+    def __init__(self):
+        self.scores = {}
+        self.ranking = []
+
+    def add(self, username, delta):
+        old = self.scores.get(username)
+        if old is not None:
+            del self.ranking[bisect.bisect_left(self.ranking, (-old, username))]
+        score = (old or 0) + delta
+        self.scores[username] = score
+        bisect.insort(self.ranking, (-score, username))
+
+    def rank(self, username):
+        return bisect.bisect_left(self.ranking, (-self.scores[username], username)) + 1
+
+    def top(self, k=10):
+        return self.ranking[:k]
+
+
+def per_sec(fn, ops):
+    start = time.perf_counter()
+    fn()
+    return ops / (time.perf_counter() - start)
+
+
+def bench_structures(players, ops, rng):
+    names = [f"player{i}" for i in range(players)]
+    print(f"\n{players} players, {ops} operations each")
+    print(f"{'structure':<14}{'updates/s':>12}{'ranks/s':>12}{'top10/s':>12}")
+    for label, board in (("skiplist", Leaderboard()), ("sorted list", SortedListBoard())):
+        for name in names:
+            board.add(name, rng.randint(-20, 20))
+        picks = [rng.choice(names) for _ in range(ops)]
+        updates = per_sec(lambda: [board.add(name, rng.choice((-1, 1))) for name in picks], ops)
+        ranks = per_sec(lambda: [board.rank(name) for name in picks], ops)
+        tops = per_sec(lambda: [board.top(10) for _ in range(ops)], ops)
+        print(f"{label:<14}{updates:>12.0f}{ranks:>12.0f}{tops:>12.0f}")
+
+
+def bench_persistence(ops, rng, latency):
+    tmp = tempfile.mkdtemp(prefix="mindroll-bench-")
+    stores = [
+        ("sqlite", lambda: create_store("sqlite", path=os.path.join(tmp, "scores.db"))),
+        ("mongo-fake", lambda: create_store("mongo", client=FakeMongoClient(latency=latency))),
+    ]
+    names = [f"player{i}" for i in range(1000)]
+    picks = [rng.choice(names) for _ in range(ops)]
+    print(f"\n{ops} score changes over 1000 players (mongo-fake: {latency * 1e6:.0f}us per operation)")
+    print(f"{'store':<12}{'write-through/s':>17}{'write-behind/s':>16}{'flush ms':>10}")
+    try:
+        for label, make_store in stores:
+            store = make_store()
+            scores = {}
+
+            def write_through():
+                for name in picks:
+                    scores[name] = scores.get(name, 0) + 1
+                    store.save_scores({name: scores[name]})
+
+            board = Leaderboard(store)
+            through = per_sec(write_through, ops)
+            behind = per_sec(lambda: [board.add(name, 1) for name in picks], ops)  # the request path
+            start = time.perf_counter()
+            board.flush()
+            flush_ms = (time.perf_counter() - start) * 1000
+            print(f"{label:<12}{through:>17.0f}{behind:>16.0f}{flush_ms:>10.1f}")
+            store.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.0002, help="seconds per fake Mongo operation")
+    options = parser.parse_args()
+    log.set_level("WARNING")
+    rng = random.Random(42)
+    for players in options.players:
+        bench_structures(players, options.ops, rng)
+    bench_persistence(options.ops, rng, options.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# benchmarks/bench_overload.py
+"""
+Game actions under overload, with and without the admission controller.
+
+    python -m benchmarks.bench_overload [--duration 10] [--pollers 40] [--lobby 10] [--logins 4]
+
+Starts a real server process (memory backend, no rate limits) and, next to
+one table playing call_number / reveal_result back to back, floods it with
+get_game_state pollers, list_rooms readers and a login storm (real bcrypt).
+Flooding clients are plain MindRollClients: a shed request is retried after
+the wait the server asks for. The run is repeated with --max-concurrency 0
+(no admission control, the old behaviour) and with admission control, and
+reports the game-action latency and what was shed.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.loadgen import percentile
+from src.client.rpc_client import MindRollClient
+from src.common import log
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, concurrency, history_dir, extra=()):
+    server = subprocess.Popen([sys.executable, "-m", "src.server.rpc_server", "--port", str(port),
+                               "--backend", "memory", "--no-rate-limit", "--max-concurrency", str(concurrency),
+                               "--history-dir", history_dir, *extra],
+                              cwd=os.path.join(os.path.dirname(__file__), ".."),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+class Counts:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ok = {}
+        self.shed = {}
+
+    def add(self, method, resp):
+        if resp is None:
+            return
+        if resp.error is None:
+            table = self.ok
+        elif resp.error.startswith("Server overloaded"):
+            table = self.shed
+        else:
+            return
+        with self.lock:
+            table[method] = table.get(method, 0) + 1
+
+
+class CountingClient(MindRollClient):
+    """ A normal client (it waits out "retry after X ms"), counting every raw response. """
+
+    def __init__(self, address, counts=None):
+        super().__init__(address, auto_reconnect=False)
+        self.counts = counts
+
+    def _send_request(self, method, args):
+        resp = super()._send_request(method, args)
+        if self.counts:
+            self.counts.add(method, resp)
+        return resp
+
+
+def client(address, counts=None):
+    c = CountingClient(address, counts)
+    c.connect()
+    return c
+
+
+def sit_down(address):
+    c = client(address)
+    c.register("alice", "pw")
+    c.login("alice", "pw")
+    c.create_room("duel")
+    c.join_room("duel", "alice")
+    c.join_room("duel", "bob")
+    return c
+
+
+def play(c, deadline, latencies):
+    seats, turn, number = ["alice", "bob"], 0, 7
+    while time.time() < deadline:
+        start = time.perf_counter()
+        if number > 30:
+            resp = c.reveal_result("duel", seats[turn])
+            turn, number = 0, 7
+        else:
+            number += 1
+            resp = c.call_number("duel", seats[turn], number)
+            turn = 1 - turn
+        if resp is None or resp.error:  # game actions are never shed
+            raise RuntimeError(f"game action failed: {resp.error if resp else 'no response'}")
+        latencies.append(time.perf_counter() - start)
+    c.close()
+
+
+def flood(address, deadline, method, args, counts):
+    c = client(address, counts)
+    while time.time() < deadline:
+        c.send_request(method, *args)
+    c.close()
+
+
+def run(concurrency, options):
+    port = free_port()
+    address = ("127.0.0.1", port)
+    with tempfile.TemporaryDirectory() as history_dir:
+        server = start_server(port, concurrency, history_dir)
+        try:
+            setup = client(address)
+            setup.register("flood", "pw")
+            setup.close()
+            table = sit_down(address)
+            deadline = time.time() + options.duration
+            latencies, counts = [], Counts()
+            threads = [threading.Thread(target=play, args=(table, deadline, latencies))]
+            threads += [threading.Thread(target=flood, args=(address, deadline, "get_game_state", ["duel"], counts))
+                        for _ in range(options.pollers)]
+            threads += [threading.Thread(target=flood, args=(address, deadline, "list_rooms", [], counts))
+                        for _ in range(options.lobby)]
+            threads += [threading.Thread(target=flood, args=(address, deadline, "login", ["flood", "pw"], counts))
+                        for _ in range(options.logins)]
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            for thread in threads:
+                thread.join(options.duration + 30)
+        finally:
+            server.terminate()
+            server.wait(10)
+    latencies.sort()
+    return latencies, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--pollers", type=int, default=40)
+    parser.add_argument("--lobby", type=int, default=10)
+    parser.add_argument("--logins", type=int, default=4)
+    parser.add_argument("--max-concurrency", type=int, default=16, help="admission slots")
+    options = parser.parse_args()
+    log.set_level("ERROR")
+
+    print(f"{options.pollers} pollers, {options.lobby} lobby readers, {options.logins} login loops, "
+          f"{options.duration:.0f}s per run")
+    for label, concurrency in (("no admission (--max-concurrency 0)", 0),
+                           (f"admission (--max-concurrency {options.max_concurrency})", options.max_concurrency)):
+        latencies, counts = run(concurrency, options)
+        print(f"\n{label}")
+        print(f"  game actions  {len(latencies) / options.duration:7.1f}/s   p50 {percentile(latencies, 50) * 1e3:7.1f} ms"
+              f"   p99 {percentile(latencies, 99) * 1e3:7.1f} ms")
+        for method in ("get_game_state", "list_rooms", "login"):
+            print(f"  {method:<16}{counts.ok.get(method, 0) / options.duration:7.1f}/s served"
+                  f"{counts.shed.get(method, 0) / options.duration:9.1f}/s shed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_pipeline.py
+"""
+Throughput of lock-step vs pipelined get_game_state calls over one socket.
+
+    python -m benchmarks.bench_pipeline --port 8080 --requests 20000 --window 64
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.client.pipelined_client import PipelinedMindRollClient
+from src.client.rpc_client import MindRollClient
+from src.common import log
+
+
+def bench_lockstep(address, room_id, requests):
+    client = MindRollClient(address)
+    client.get_game_state(room_id)  # warm up the connection
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get_game_state(room_id)
+    elapsed = time.perf_counter() - start
+    client.close()
+    return requests / elapsed
+
+
+def bench_pipelined(address, room_id, requests, window):
+    client = PipelinedMindRollClient(address)
+    client.get_game_state(room_id)
+    slots = threading.Semaphore(window)
+    futures = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        slots.acquire()
+        future = client.submit("get_game_state", room_id)
+        future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    client.close()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lock-step vs pipelined RPC throughput")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--window", type=int, nargs="+", default=[1, 8, 64, 256],
+                        help="max requests in flight for the pipelined runs")
+    parser.add_argument("--spawn-server", action="store_true", help="start a MindRollServer in this process")
+    args = parser.parse_args()
+    log.set_level("WARNING")
+
+    if args.spawn_server:
+        from benchmarks.loadgen import spawn_server
+        spawn_server(args.port)
+    address = (args.host, args.port)
+    room_id = f"bench{uuid.uuid4().hex[:6]}"
+    MindRollClient(address).create_room(room_id)
+
+    lockstep = bench_lockstep(address, room_id, args.requests)
+    print(f"{'mode':<16} {'req/s':>10} {'speedup':>8}")
+    print(f"{'lock-step':<16} {lockstep:>10,.0f} {1.0:>7.2f}x")
+    for window in args.window:
+        rate = bench_pipelined(address, room_id, args.requests, window)
+        print(f"{f'pipelined w={window}':<16} {rate:>10,.0f} {rate / lockstep:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_replica.py
+"""
+Game actions while get_game_state pollers read from the primary or from the replica.
+
+    python -m benchmarks.bench_replica [--duration 8] [--pollers 40]
+
+Starts a real server process with a replica (--backup-port) and, next to one
+table playing call_number / reveal_result back to back, runs get_game_state
+pollers. In the first run the pollers ask the primary, in the second they
+are MindRollClients with replica_address set. The replica lives in the
+primary's process, so this measures the work taken off the primary's
+request path (no housekeeping, auth, admission or rate limiting per poll),
+not a second machine's CPU.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.bench_overload import free_port, start_server, sit_down, play
+from benchmarks.loadgen import percentile
+from src.client.rpc_client import MindRollClient
+from src.common import log
+
+
+def poll(address, replica_address, deadline, counts):
+    c = MindRollClient(address, auto_reconnect=False, replica_address=replica_address)
+    c.connect()
+    served = 0
+    while time.time() < deadline:
+        resp = c.get_game_state("duel")
+        if resp is not None and resp.error is None:
+            served += 1
+    c.close()
+    counts.append(served)
+
+
+def run(use_replica, options):
+    port, backup_port = free_port(), free_port()
+    address, replica_address = ("127.0.0.1", port), ("127.0.0.1", backup_port)
+    with tempfile.TemporaryDirectory() as history_dir:
+        server = start_server(port, 0, history_dir, ["--backup-port", str(backup_port)])
+        try:
+            table = sit_down(address)
+            deadline = time.time() + options.duration
+            latencies, counts = [], []
+            threads = [threading.Thread(target=play, args=(table, deadline, latencies))]
+            threads += [threading.Thread(target=poll, args=(address, replica_address if use_replica else None,
+                                                            deadline, counts))
+                        for _ in range(options.pollers)]
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            for thread in threads:
+                thread.join(options.duration + 30)
+        finally:
+            server.terminate()
+            server.wait(10)
+    latencies.sort()
+    return latencies, sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=8.0)
+    parser.add_argument("--pollers", type=int, default=40)
+    options = parser.parse_args()
+    log.set_level("ERROR")
+
+    print(f"{options.pollers} pollers, {options.duration:.0f}s per run")
+    for label, use_replica in (("polls on the primary", False), ("polls on the replica", True)):
+        latencies, polls = run(use_replica, options)
+        print(f"\n{label}")
+        print(f"  game actions    {len(latencies) / options.duration:7.1f}/s   p50 {percentile(latencies, 50) * 1e3:7.1f} ms"
+              f"   p99 {percentile(latencies, 99) * 1e3:7.1f} ms")
+        print(f"  get_game_state  {polls / options.duration:7.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_spectators.py
+"""
+Cost of pushing one room change to its spectators, as the number of spectators grows.
+
+    python -m benchmarks.bench_spectators [--spectators 1 10 100 500] [--changes 300]
+
+Every spectator is a real socket pair served by SpectatorHub.watch on its own
+thread, with a reader on the other end. For each room change the script times
+the broadcasting thread: SpectatorHub.publish (one encoding, one offer per
+watcher) against the obvious alternative of encoding and sending the state once
+per spectator. One extra spectator never reads, to show it only ever holds the
+latest frame.
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.common import log
+from src.common.utils import Response, encode_message
+from src.server.game_logic import GameRoom
+from src.server.spectators import SpectatorHub
+
+
+def make_room():
+    game = GameRoom("featured")
+    for name in ["alice", "bob", "carol", "dave"]:
+        game.add_player(name)
+    return game
+
+
+def change(game):
+    if game.called_number and game.called_number > 40:
+        game.reveal_result(game.current_turn)
+    else:
+        game.call_number(game.current_turn, (game.called_number or 13) + 1)
+
+
+def drain(sock, counts, index):
+    while True:
+        try:
+            chunk = sock.recv(65536)
+        except OSError:
+            return
+        if not chunk:
+            return
+        counts[index] += chunk.count(b"\n")
+
+
+def bench_hub(spectators, changes):
+    game = make_room()
+    hub = SpectatorHub({"featured": game}.get)
+    pairs = [socket.socketpair() for _ in range(spectators + 1)]
+    for sock in pairs[-1]:  # small buffers, so the stalled one backs up quickly
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    counts = [0] * spectators
+    for server_side, _ in pairs:
+        threading.Thread(target=hub.watch, args=("featured", server_side), daemon=True).start()
+    for i, (_, client_side) in enumerate(pairs[:-1]):
+        threading.Thread(target=drain, args=(client_side, counts, i), daemon=True).start()
+    while hub.count("featured") < spectators + 1:
+        time.sleep(0.01)
+    stalled = next(w for w in hub.rooms["featured"] if w.sock is pairs[-1][0])
+
+    spent = 0.0
+    for _ in range(changes):
+        change(game)
+        start = time.perf_counter()
+        hub.publish("featured")
+        spent += time.perf_counter() - start
+        time.sleep(0.002)
+    time.sleep(0.5)
+    delivered = sum(counts) / spectators
+    hub.close_room("featured")
+    while hub.count("featured"):
+        time.sleep(0.01)
+    for a, b in pairs:
+        a.close()
+        b.close()
+    return spent / changes, delivered, stalled
+
+
+def bench_per_spectator(spectators, changes):
+    game = make_room()
+    pairs = [socket.socketpair() for _ in range(spectators)]
+    counts = [0] * spectators
+    for i, (_, client_side) in enumerate(pairs):
+        threading.Thread(target=drain, args=(client_side, counts, i), daemon=True).start()
+    spent = 0.0
+    for _ in range(changes):
+        change(game)
+        start = time.perf_counter()
+        for server_side, _ in pairs:
+            server_side.sendall(encode_message(Response({"room": "featured", "version": game.version,
+                                                         "state": game.state()}, None)))
+        spent += time.perf_counter() - start
+        time.sleep(0.002)
+    for a, b in pairs:
+        a.close()
+        b.close()
+    return spent / changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spectators", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--changes", type=int, default=300)
+    args = parser.parse_args()
+    log.set_level("WARNING")
+
+    print(f"{args.changes} changes per run; broadcasting-thread time per change")
+    print(f"{'spectators':>10}{'encode once':>14}{'per spectator':>16}{'frames seen':>14}{'stalled: pending/skipped':>26}")
+    for spectators in args.spectators:
+        hub_cost, delivered, stalled = bench_hub(spectators, args.changes)
+        naive_cost = bench_per_spectator(spectators, args.changes)
+        pending = 1 if stalled.frame is not None else 0
+        print(f"{spectators:>10}{hub_cost * 1e6:>12.0f}us{naive_cost * 1e6:>14.0f}us"
+              f"{delivered:>14.0f}{pending:>14}/{stalled.skipped}")
+
+
+if __name__ == "__main__":
+    main()
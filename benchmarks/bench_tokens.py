@@ -0,0 +1,76 @@
+# benchmarks/bench_tokens.py
+"""
+Token validations per second: stored tokens (a Mongo lookup per validation)
+vs. stateless HMAC tokens checked against the in-memory revocation set.
+
+    python -m benchmarks.bench_tokens [--users 100] [--seconds 1.0] [--latency-us 200]
+
+Runs against the in-process stand-in from benchmarks/fake_mongo.py;
+--latency-us adds a simulated round trip to every database operation.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import bcrypt
+
+from benchmarks.fake_mongo import FakeMongoClient
+from src.common import log
+from src.common.users import Credentials, User
+from src.common.users.mongo_auth_service import MongoAuthenticationService
+from src.common.users.mongo_user_service import MongoUserService
+
+
+def setup(stateless, users, latency, revoked):
+    client = FakeMongoClient()
+    user_db = MongoUserService(client=client)
+    for i in range(users):
+        user_db.add_user(User(f"user{i}", None, None, "pw"))
+    auth = MongoAuthenticationService(user_db, secret="bench-secret", stateless=stateless, debug=False)
+    tokens = [auth.authenticate(Credentials(f"user{i}", "pw")).signature for i in range(users)]
+    if stateless:
+        for _ in range(revoked):
+            auth.revoke(auth.authenticate(Credentials("user0", "pw")).signature)
+    client.latency = latency
+    client.reset_ops()
+    return client, auth, tokens
+
+
+def bench(stateless, users, seconds, latency, revoked):
+    client, auth, tokens = setup(stateless, users, latency, revoked)
+    validate = auth.validate_token_by_str
+    validations = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for token in tokens:
+            assert validate(token) is not None
+        validations += len(tokens)
+    elapsed = time.perf_counter() - start
+    auth.stop()
+    return validations / elapsed, sum(client.ops.values()) / validations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--latency-us", type=int, nargs="+", default=[0, 200])
+    parser.add_argument("--revoked", type=int, default=1000, help="revoked tokens in the stateless run")
+    options = parser.parse_args()
+    log.set_level("WARNING")
+    # hashing cost is not what is measured here
+    bcrypt_gensalt = bcrypt.gensalt
+    bcrypt.gensalt = lambda rounds=4, prefix=b"2b": bcrypt_gensalt(4, prefix)
+
+    print(f"{'mode':<12}{'latency':>10}{'validations/s':>16}{'db ops/validation':>20}")
+    for latency_us in options.latency_us:
+        for name, stateless in (("stored", False), ("stateless", True)):
+            rate, ops = bench(stateless, options.users, options.seconds, latency_us / 1e6, options.revoked)
+            print(f"{name:<12}{latency_us:>8}us{rate:>16.0f}{ops:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
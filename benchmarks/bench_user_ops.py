@@ -0,0 +1,87 @@
+# benchmarks/bench_user_ops.py
+"""
+MongoDB operations issued per RPC, counted against the in-process stand-in in
+benchmarks/fake_mongo.py (no mongod needed).
+
+    python -m benchmarks.bench_user_ops [--users 20]
+
+Starts a MindRollServer in this process whose MongoClient is the stand-in,
+drives it with MindRollClient and prints the average number of operations and
+the wall time per call, by collection and operation.
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from benchmarks.fake_mongo import FakeMongoClient
+from src.client.rpc_client import MindRollClient
+from src.common import log
+import src.common.users.mongo_user_service as mongo_user_service
+
+STAND_IN = FakeMongoClient()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(port):
+    from src.server.rpc_server import MindRollServer
+    mongo_user_service.MongoClient = lambda *args, **kwargs: STAND_IN
+    server = MindRollServer(host="127.0.0.1", port=port)
+    threading.Thread(target=server.start, daemon=True).start()
+    time.sleep(0.3)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    options = parser.parse_args()
+    log.set_level("WARNING")
+
+    port = free_port()
+    server = spawn_server(port)
+    totals = {}  # { label: Counter }
+    calls = Counter()
+    seconds = Counter()  # the ops count alone hides CPU work such as bcrypt
+
+    def measure(label, fn, *args):
+        STAND_IN.reset_ops()
+        started = time.perf_counter()
+        fn(*args)
+        seconds[label] += time.perf_counter() - started
+        totals.setdefault(label, Counter()).update(STAND_IN.ops)
+        calls[label] += 1
+
+    for i in range(options.users):
+        client = MindRollClient(("127.0.0.1", port), auto_reconnect=False)
+        username, room = f"user{i}", f"room{i}"
+        measure("register", client.register, username, "pw")
+        measure("register (taken)", client.register, username, "pw")
+        measure("login (wrong password)", client.login, username, "nope")
+        measure("login", client.login, username, "pw")
+        measure("create_room", client.create_room, room)
+        measure("join_room", client.join_room, room, username)
+        measure("get_game_state", client.get_game_state, room)
+        measure("leave_room", client.leave_room, room, username)
+        client.close()
+        time.sleep(0.05)  # let the server's disconnect handling finish outside measure()
+    server.stop()
+
+    print(f"{'rpc':<24}{'ops/call':>10}{'ms/call':>10}  breakdown")
+    for label, ops in totals.items():
+        n = calls[label]
+        breakdown = ", ".join(f"{collection}.{op} {count / n:g}" for (collection, op), count in sorted(ops.items()))
+        print(f"{label:<24}{sum(ops.values()) / n:>10.2f}{seconds[label] / n * 1000:>10.2f}  {breakdown}")
+
+
+if __name__ == "__main__":
+    main()
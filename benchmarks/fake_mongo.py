@@ -0,0 +1,200 @@
+# benchmarks/fake_mongo.py
+"""
+A small in-process stand-in for pymongo's MongoClient, for benchmarks that
+count database operations without a running mongod:
+
+    client = FakeMongoClient()
+    users = MongoUserService(client=client)
+    ...
+    client.ops  # Counter({("users", "find_one"): 3, ...})
+
+Only the calls MindRoll makes are implemented: equality filters (plus $lt,
+$lte, $gt, $gte, $in), simple projections, unique indexes and a few
+write helpers. TTL indexes are accepted but never expire anything. It is not thread-safe beyond what the GIL gives for free.
+FakeMongoClient(latency=0.0002) sleeps that many seconds per operation, as a
+rough stand-in for a network round trip.
+"""
+import copy
+import itertools
+import time
+from collections import Counter
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+_OPERATORS = {
+    "$lt": lambda value, arg: value is not None and value < arg,
+    "$lte": lambda value, arg: value is not None and value <= arg,
+    "$gt": lambda value, arg: value is not None and value > arg,
+    "$gte": lambda value, arg: value is not None and value >= arg,
+    "$in": lambda value, arg: value in arg,
+}
+
+
+def _matches(doc, query):
+    for field, expected in query.items():
+        value = doc.get(field)
+        if isinstance(expected, dict) and expected and all(k in _OPERATORS for k in expected):
+            if not all(_OPERATORS[op](value, arg) for op, arg in expected.items()):
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return copy.deepcopy(doc)
+    if not any(keep for field, keep in projection.items() if field != "_id"):
+        # exclusion projection, e.g. {"_id": 0}
+        return {field: copy.deepcopy(value) for field, value in doc.items() if projection.get(field, 1)}
+    included = [field for field, keep in projection.items() if keep and field != "_id"]
+    result = {field: copy.deepcopy(doc[field]) for field in included if field in doc}
+    if projection.get("_id", 1) and "_id" in doc:
+        result["_id"] = doc["_id"]
+    return result
+
+
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class FakeCollection:
+    def __init__(self, name, client):
+        self.name = name
+        self._client = client
+        self._docs = []
+        self._unique = []  # [ tuple(field, ...) ]
+        self._ids = itertools.count(1)
+
+    def _count(self, op, n=1):
+        self._client.ops[(self.name, op)] += n
+        if self._client.latency:
+            time.sleep(self._client.latency)
+
+    def create_index(self, keys, unique=False, **kwargs):
+        self._count("create_index")
+        fields = (keys,) if isinstance(keys, str) else tuple(field for field, _ in keys)
+        if unique and fields not in self._unique:
+            self._unique.append(fields)
+        return "_".join(fields)
+
+    def _check_unique(self, doc):
+        for fields in self._unique:
+            key = tuple(doc.get(field) for field in fields)
+            if any(tuple(other.get(field) for field in fields) == key for other in self._docs):
+                raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {fields}")
+
+    def _insert(self, doc):
+        self._check_unique(doc)
+        doc.setdefault("_id", next(self._ids))
+        self._docs.append(copy.deepcopy(doc))
+        return doc["_id"]
+
+    def insert_one(self, doc):
+        self._count("insert_one")
+        return InsertOneResult(self._insert(doc))
+
+    def insert_many(self, docs, ordered=True):
+        self._count("insert_many")
+        inserted, errors = [], []
+        for index, doc in enumerate(docs):
+            try:
+                inserted.append(self._insert(doc))
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted)})
+        return InsertManyResult(inserted)
+
+    def bulk_write(self, requests, ordered=True):
+        """ UpdateOne requests only. """
+        self._count("bulk_write")
+        for request in requests:
+            self._update(request._filter, request._doc, request._upsert)
+
+    def find_one(self, query=None, projection=None):
+        self._count("find_one")
+        for doc in self._docs:
+            if _matches(doc, query or {}):
+                return _project(doc, projection)
+        return None
+
+    def find(self, query=None, projection=None):
+        self._count("find")
+        return [_project(doc, projection) for doc in self._docs if _matches(doc, query or {})]
+
+    def update_one(self, query, update, upsert=False):
+        self._count("update_one")
+        self._update(query, update, upsert)
+
+    def _update(self, query, update, upsert):
+        for doc in self._docs:
+            if _matches(doc, query):
+                doc.update(update.get("$set", {}))
+                return
+        if upsert:
+            self._insert({**query, **update.get("$set", {})})
+
+    def delete_one(self, query):
+        self._count("delete_one")
+        for index, doc in enumerate(self._docs):
+            if _matches(doc, query):
+                del self._docs[index]
+                return DeleteResult(1)
+        return DeleteResult(0)
+
+    def delete_many(self, query):
+        self._count("delete_many")
+        before = len(self._docs)
+        self._docs = [doc for doc in self._docs if not _matches(doc, query)]
+        return DeleteResult(before - len(self._docs))
+
+    def count_documents(self, query):
+        self._count("count_documents")
+        return sum(1 for doc in self._docs if _matches(doc, query))
+
+    def estimated_document_count(self):
+        self._count("estimated_document_count")
+        return len(self._docs)
+
+
+class FakeDatabase:
+    def __init__(self, client):
+        self._client = client
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(name, self._client)
+        return self._collections[name]
+
+
+class FakeMongoClient:
+    def __init__(self, *args, latency=0.0, **kwargs):
+        self.ops = Counter()  # { (collection, operation): count }
+        self.latency = latency  # seconds slept per operation; may be changed at any time
+        self._databases = {}
+
+    def __getitem__(self, name):
+        if name not in self._databases:
+            self._databases[name] = FakeDatabase(self)
+        return self._databases[name]
+
+    def reset_ops(self):
+        self.ops.clear()
+
+    def close(self):
+        pass
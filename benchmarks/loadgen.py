@@ -0,0 +1,279 @@
+# benchmarks/loadgen.py
+"""
+Headless load generator for MindRollServer.
+
+Simulated players talk to the server through MindRollClient, one connection
+each, following a scripted scenario:
+
+    login_storm  register once, then log in over and over
+    room_churn   create a room, join, poll once, leave, repeat
+    play         tables of --table-size players polling get_game_state and
+                 calling / revealing on their turn
+    reconnect    sit in a room with a bot, drop the socket and reconnect
+
+Example:
+
+    python -m benchmarks.loadgen --players 500 --duration 30 --ramp-up 10 \\
+        --scenario login_storm,play
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.client.rpc_client import MindRollClient
+from src.common import log
+
+SCENARIOS = ("login_storm", "room_churn", "play", "reconnect")
+
+
+def percentile(sorted_values, pct):
+    """ Nearest-rank percentile of an already sorted list. """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class LatencyRecorder:
+    """ Collects per-method latencies and error counts from every simulated player. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}   # { method: [seconds, ...] }
+        self.errors = {}      # { method: count }
+        self.steady = {}      # { method: count } of requests finished inside the steady-state window
+        self.window = None    # (start, end) in perf_counter() time, after ramp-up
+
+    def record(self, method, seconds, ok):
+        now = time.perf_counter()
+        with self.lock:
+            self.latencies.setdefault(method, []).append(seconds)
+            if not ok:
+                self.errors[method] = self.errors.get(method, 0) + 1
+            if self.window and self.window[0] <= now <= self.window[1]:
+                self.steady[method] = self.steady.get(method, 0) + 1
+
+    def report(self, elapsed, out, steady_seconds=None):
+        """ req/s is measured over the steady-state window (after ramp-up); "all req/s" over the whole run. """
+        steady_seconds = steady_seconds or elapsed
+        total = steady_total = 0
+        header = (f"{'method':<16} {'count':>9} {'errors':>7} {'req/s':>9} {'all req/s':>10} "
+                  f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        print(header, file=out)
+        print("-" * len(header), file=out)
+        with self.lock:
+            for method in sorted(self.latencies):
+                values = sorted(self.latencies[method])
+                steady = self.steady.get(method, 0) if self.window else len(values)
+                total += len(values)
+                steady_total += steady
+                print(f"{method:<16} {len(values):>9} {self.errors.get(method, 0):>7} "
+                      f"{steady / steady_seconds:>9.1f} {len(values) / elapsed:>10.1f} "
+                      f"{percentile(values, 50) * 1e3:>8.2f} {percentile(values, 95) * 1e3:>8.2f} "
+                      f"{percentile(values, 99) * 1e3:>8.2f} {values[-1] * 1e3:>8.2f}", file=out)
+        print("-" * len(header), file=out)
+        print(f"{'total':<16} {total:>9} {'':>7} {steady_total / steady_seconds:>9.1f} {total / elapsed:>10.1f}",
+              file=out)
+
+
+class TimedClient(MindRollClient):
+    """ MindRollClient that reports the latency of every RPC to a LatencyRecorder. """
+
+    def __init__(self, server_address, recorder):
+        super().__init__(server_address)
+        self.recorder = recorder
+
+    def send_request(self, method, *args):
+        start = time.perf_counter()
+        response = super().send_request(method, *args)
+        ok = response is not None and not response.error
+        self.recorder.record(method, time.perf_counter() - start, ok)
+        return response
+
+
+class SimulatedPlayer(threading.Thread):
+    def __init__(self, index, scenario, options, recorder, deadline, tables):
+        super().__init__(daemon=True)
+        self.index = index
+        self.scenario = scenario
+        self.options = options
+        self.recorder = recorder
+        self.deadline = deadline
+        self.tables = tables
+        self.username = f"{options.run_id}p{index}"
+        self.password = "loadgen123"
+        self.client = TimedClient((options.host, options.port), recorder)
+
+    def running(self):
+        return time.time() < self.deadline
+
+    def think(self):
+        if self.options.think_time > 0:
+            time.sleep(random.uniform(0, 2 * self.options.think_time))
+
+    def run(self):
+        try:
+            self.client.register(self.username, self.password)
+            self.client.login(self.username, self.password)
+            getattr(self, f"scenario_{self.scenario}")()
+        except Exception as e:
+            self.recorder.record("player_crash", 0.0, False)
+            print(f"player {self.username} crashed: {e}", file=sys.stderr)
+        finally:
+            self.client.close()
+
+    # ---------------------- Scenarios ----------------------
+    def scenario_login_storm(self):
+        while self.running():
+            self.client.login(self.username, self.password)
+            self.think()
+
+    def scenario_room_churn(self):
+        round_no = 0
+        while self.running():
+            room_id = f"{self.username}r{round_no}"
+            round_no += 1
+            self.client.create_room(room_id)
+            self.client.join_room(room_id, self.username)
+            self.client.get_game_state(room_id)
+            self.client.leave_room(room_id, self.username)
+            self.think()
+
+    def scenario_play(self):
+        table_size = self.options.table_size
+        room_id, seat = self.tables.seat(self.index, table_size)
+        if seat == 0:
+            self.client.create_room(room_id)
+            self.tables.opened(room_id)
+        else:
+            self.tables.wait_opened(room_id, self.deadline)
+        self.client.join_room(room_id, self.username)
+
+        while self.running():
+            resp = self.client.get_game_state(room_id)
+            state = resp.result if resp is not None and not resp.error else None
+            if state and state.get("current_turn") == self.username and not state.get("last_result_str"):
+                called = state.get("called_number")
+                if called is not None and random.random() < self.options.reveal_chance:
+                    self.client.reveal_result(room_id, self.username)
+                else:
+                    floor = called if called is not None else max(3 * len(state["players"]) + 1, 7)
+                    self.client.call_number(room_id, self.username, floor + 1)
+            time.sleep(self.options.poll_interval)
+        self.client.leave_room(room_id, self.username)
+
+    def scenario_reconnect(self):
+        room_id = f"{self.username}rc"
+        self.client.create_room(room_id)
+        self.client.join_room(room_id, self.username)
+        self.client.add_bot(room_id)
+        while self.running():
+            self.client.close()
+            # give the server a moment to notice the dropped socket
+            time.sleep(self.options.disconnect_time)
+            self.client.connect()
+            self.client.reconnect(room_id, self.username)
+            self.client.get_game_state(room_id)
+            self.think()
+        self.client.leave_room(room_id, self.username)
+
+
+class TableRegistry:
+    """ Groups 'play' players into rooms and lets joiners wait for the room creator. """
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.cond = threading.Condition()
+        self.open_rooms = set()
+        self.next_seat = 0
+
+    def seat(self, index, table_size):
+        with self.cond:
+            seat_no = self.next_seat
+            self.next_seat += 1
+        return f"{self.run_id}t{seat_no // table_size}", seat_no % table_size
+
+    def opened(self, room_id):
+        with self.cond:
+            self.open_rooms.add(room_id)
+            self.cond.notify_all()
+
+    def wait_opened(self, room_id, deadline):
+        with self.cond:
+            while room_id not in self.open_rooms and time.time() < deadline:
+                self.cond.wait(timeout=0.1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MindRoll headless load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--players", type=int, default=100, help="number of simulated players")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of steady load after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds over which players are started")
+    parser.add_argument("--scenario", default="play",
+                        help=f"comma separated list from {', '.join(SCENARIOS)}; players are spread round-robin")
+    parser.add_argument("--table-size", type=int, default=4, help="players per room in the play scenario")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="get_game_state poll interval (play)")
+    parser.add_argument("--reveal-chance", type=float, default=0.2, help="chance to reveal on a turn (play)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between iterations")
+    parser.add_argument("--disconnect-time", type=float, default=0.2, help="time offline per reconnect cycle")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="start a MindRollServer in this process (shares the GIL with the players)")
+    parser.add_argument("--verbose", action="store_true", help="log every client request at DEBUG level")
+    options = parser.parse_args(argv)
+    options.run_id = uuid.uuid4().hex[:6]
+    scenarios = [name.strip() for name in options.scenario.split(",") if name.strip()]
+    for name in scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+    options.scenarios = scenarios
+    return options
+
+
+def spawn_server(port):
+    from src.server.rpc_server import MindRollServer
+    server = MindRollServer(host="127.0.0.1", port=port)
+    threading.Thread(target=server.start, daemon=True).start()
+    time.sleep(0.5)
+    return server
+
+
+def run(options, out=sys.stdout):
+    server = spawn_server(options.port) if options.spawn_server else None
+    recorder = LatencyRecorder()
+    tables = TableRegistry(options.run_id)
+    deadline = time.time() + options.ramp_up + options.duration
+    stagger = options.ramp_up / options.players if options.players else 0
+
+    log.set_level("DEBUG" if options.verbose else "WARNING")
+    players = []
+    start = time.perf_counter()
+    recorder.window = (start + options.ramp_up, start + options.ramp_up + options.duration)
+    for i in range(options.players):
+        scenario = options.scenarios[i % len(options.scenarios)]
+        player = SimulatedPlayer(i, scenario, options, recorder, deadline, tables)
+        players.append(player)
+        player.start()
+        if stagger:
+            time.sleep(stagger)
+    for player in players:
+        player.join(timeout=max(0.0, deadline - time.time()) + 10)
+    elapsed = time.perf_counter() - start
+    log.flush()
+
+    print(f"run {options.run_id}: {options.players} players, scenarios={','.join(options.scenarios)}, "
+          f"ramp-up={options.ramp_up}s, duration={options.duration}s, elapsed={elapsed:.1f}s", file=out)
+    recorder.report(elapsed, out, steady_seconds=options.duration)
+    if server:
+        server.stop()
+    return recorder
+
+
+if __name__ == "__main__":
+    run(parse_args())
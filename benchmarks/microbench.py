@@ -0,0 +1,269 @@
+# benchmarks/microbench.py
+"""
+Microbenchmarks for hot functions, with stored baselines.
+
+    python -m benchmarks.microbench                     # run and print
+    python -m benchmarks.microbench --save              # run and write the baseline
+    python -m benchmarks.microbench --compare           # run and flag regressions
+    python -m benchmarks.microbench --compare --threshold 0.10 -k game
+
+--compare exits with status 1 when any benchmark is slower than its baseline
+by more than --threshold (a fraction, default 0.20).
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.common.utils import Request, serialize, deserialize
+from src.common.users import User, Credentials
+from src.common.users.impl import InMemoryUserDatabase, InMemoryAuthenticationService, _compute_sha256_hash
+from src.server.game_logic import GameRoom
+from src.server.ratelimit import RateLimiter
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """ Register a setup function that returns the callable to time. """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _room(player_count):
+    room = GameRoom("bench")
+    for i in range(player_count):
+        room.add_player(f"player{i}")
+    return room
+
+
+# ---------------------- Serialization ----------------------
+@benchmark("utils.serialize")
+def _():
+    request = Request("call_number", ["room1", "player1", 12], {"token": {"token": "a" * 64}})
+    return lambda: serialize(request)
+
+
+@benchmark("utils.deserialize")
+def _():
+    raw = serialize(Request("call_number", ["room1", "player1", 12], {"token": {"token": "a" * 64}}))
+    return lambda: deserialize(raw)
+
+
+@benchmark("utils.Request.from_dict")
+def _():
+    data = Request("call_number", ["room1", "player1", 12], {"token": {"token": "a" * 64}}).to_dict()
+    return lambda: Request.from_dict(data)
+
+
+# ---------------------- GameRoom ----------------------
+@benchmark("game.add_player")
+def _():
+    names = [f"player{i}" for i in range(4)]
+
+    def run():
+        room = GameRoom("bench")
+        for name in names:
+            room.add_player(name)
+    return run
+
+
+@benchmark("game.call_number")
+def _():
+    room = _room(4)
+    first = room.players_order[0]
+
+    def run():
+        room.called_number = None
+        room.current_turn = first
+        room.call_number(first, 20)
+    return run
+
+
+@benchmark("game.reveal_result")
+def _():
+    room = _room(4)
+    first = room.players_order[0]
+
+    def run():
+        room.current_turn = first
+        room.called_number = 14
+        room.reveal_result(first)
+    return run
+
+
+@benchmark("game.reset_game")
+def _():
+    room = _room(4)
+    return room.reset_game
+
+
+@benchmark("game.check_reconnection_timeout")
+def _():
+    room = _room(8)
+    room.players["player7"]["connected"] = False
+    room.players["player7"]["disconnected_time"] = time.time()
+    return room.check_reconnection_timeout
+
+
+# ---------------------- Rate limiting ----------------------
+@benchmark("ratelimit.check")
+def _():
+    limiter = RateLimiter({}, default=(1e9, 1e9))
+    buckets = limiter.connection_buckets()
+    return lambda: limiter.check(buckets, "a" * 64, "get_game_state")
+
+
+@benchmark("ratelimit.check_throttled")
+def _():
+    limiter = RateLimiter({"get_game_state": (1e-9, 1)})
+    buckets = limiter.connection_buckets()
+    return lambda: limiter.check(buckets, "a" * 64, "get_game_state")
+
+
+# ---------------------- Hashing & tokens ----------------------
+@benchmark("auth._compute_sha256_hash")
+def _():
+    return lambda: _compute_sha256_hash("player1" + "2030-01-01 00:00:00" + "mindroll-secret")
+
+
+def _auth_service():
+    database = InMemoryUserDatabase(debug=False)
+    database.add_user(User("player1", "player1", password="password123"))
+    return database, InMemoryAuthenticationService(database, secret="bench", debug=False)
+
+
+@benchmark("auth.validate_token")
+def _():
+    _, auth = _auth_service()
+    token = auth.authenticate(Credentials("player1", "password123"))
+    return lambda: auth.validate_token(token)
+
+
+@benchmark("auth.validate_token_by_str")
+def _():
+    _, auth = _auth_service()
+    signature = auth.authenticate(Credentials("player1", "password123")).signature
+    return lambda: auth.validate_token_by_str(signature)
+
+
+@benchmark("auth.authenticate")
+def _():
+    _, auth = _auth_service()
+    credentials = Credentials("player1", "password123")
+    return lambda: auth.authenticate(credentials)
+
+
+# ---------------------- In-memory user database ----------------------
+@benchmark("users.add_user")
+def _():
+    database = InMemoryUserDatabase(debug=False)
+    counter = itertools.count()
+    return lambda: database.add_user(User(f"user{next(counter)}", password="password123"))
+
+
+@benchmark("users.get_user")
+def _():
+    database, _ = _auth_service()
+    return lambda: database.get_user("player1")
+
+
+@benchmark("users.check_password")
+def _():
+    database, _ = _auth_service()
+    credentials = Credentials("player1", "password123")
+    return lambda: database.check_password(credentials)
+
+
+# ---------------------- Runner ----------------------
+def measure(func, repeat, min_time):
+    """ Best-of-`repeat` time per call in nanoseconds. """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def run(selected, repeat, min_time):
+    results = {}
+    for name in selected:
+        results[name] = measure(BENCHMARKS[name](), repeat, min_time)
+        print(f"{name:<32} {results[name]:>12.1f} ns/op")
+    return results
+
+
+def save(results, path, merge=False):
+    """ Write results as the baseline; merge=True keeps stored benchmarks that were not run. """
+    if merge and os.path.exists(path):
+        with open(path) as f:
+            results = {**json.load(f)["results"], **results}
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    print(f"Baseline saved to {path}")
+
+
+def compare(results, path, threshold):
+    """ Print current vs baseline and return the names that regressed. """
+    with open(path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\n{'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"{name:<32} {'-':>12} {current:>12.1f} {'new':>8}")
+            continue
+        change = current / baseline[name] - 1.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {baseline[name]:>12.1f} {current:>12.1f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MindRoll microbenchmarks")
+    parser.add_argument("-k", dest="keyword", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare results against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    selected = [name for name in BENCHMARKS if not args.keyword or args.keyword in name]
+    results = run(selected, args.repeat, args.min_time)
+
+    if args.save:
+        save(results, args.baseline, merge=bool(args.keyword))
+    if args.compare:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
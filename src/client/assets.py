@@ -0,0 +1,116 @@
+# src/client/assets.py
+import hashlib
+import os
+
+import pygame
+
+from src.common.log import get_logger
+
+log = get_logger("assets")
+
+DICE_COLORS = ["red", "yellow", "green", "blue", "black"]
+DICE_NUMBERS = range(1, 7)
+
+
+def default_cache_dir():
+    """ $MINDROLL_CACHE_DIR, else $XDG_CACHE_HOME/mindroll (~/.cache/mindroll). """
+    if os.environ.get("MINDROLL_CACHE_DIR"):
+        return os.environ["MINDROLL_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "mindroll")
+
+
+class DiceAtlas:
+    """
+    All 30 dice faces, pre-scaled into one surface (a row per colour, a column
+    per number) and handed out as subsurfaces.
+
+    Nothing is loaded until the first get(). The scaled atlas is then written to
+    the cache directory as raw RGB bytes keyed by face size and by the names,
+    sizes and mtimes of the source PNGs, so later starts skip PNG decoding and
+    scaling entirely; a changed image or size simply produces a new cache file.
+    Once a display mode is set the atlas is convert()ed to the display format so
+    blits don't convert pixels every frame.
+    """
+
+    def __init__(self, asset_dir="assets/dice", size=(300, 300), cache_dir=None):
+        self.asset_dir = asset_dir
+        self.size = tuple(size)
+        self.cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+        self.surface = None
+        self._faces = {}  # { (color, number): Surface }
+        self.loaded_from_cache = False
+
+    def source_path(self, color, number):
+        return os.path.join(self.asset_dir, f"{color}{number}.png")
+
+    def cache_path(self):
+        digest = hashlib.sha1()
+        for color in DICE_COLORS:
+            for number in DICE_NUMBERS:
+                path = self.source_path(color, number)
+                stat = os.stat(path)
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        width, height = self.size
+        return os.path.join(self.cache_dir, f"dice_{width}x{height}_{digest.hexdigest()[:16]}.rgb")
+
+    def atlas_size(self):
+        return self.size[0] * len(DICE_NUMBERS), self.size[1] * len(DICE_COLORS)
+
+    # ---------------------- Loading ----------------------
+    def load(self):
+        """ Build or read the atlas now instead of on the first get(). """
+        if self.surface is not None:
+            return self
+        path = self.cache_path()
+        surface = self._read_cache(path)
+        self.loaded_from_cache = surface is not None
+        if surface is None:
+            surface = self._build()
+            self._write_cache(path, surface)
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        self.surface = surface
+
+        width, height = self.size
+        for row, color in enumerate(DICE_COLORS):
+            for column, number in enumerate(DICE_NUMBERS):
+                area = pygame.Rect(column * width, row * height, width, height)
+                self._faces[(color, number)] = surface.subsurface(area)
+        return self
+
+    def _build(self):
+        atlas = pygame.Surface(self.atlas_size())
+        width, height = self.size
+        for row, color in enumerate(DICE_COLORS):
+            for column, number in enumerate(DICE_NUMBERS):
+                image = pygame.image.load(self.source_path(color, number))
+                atlas.blit(pygame.transform.scale(image, self.size), (column * width, row * height))
+        return atlas
+
+    def _read_cache(self, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            return pygame.image.frombuffer(data, self.atlas_size(), "RGB")
+        except (OSError, ValueError, pygame.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                log.warning("Ignoring unreadable dice cache", path=path, error=e)
+            return None
+
+    def _write_cache(self, path, surface):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pygame.image.tobytes(surface, "RGB"))
+            os.replace(tmp_path, path)  # readers never see a half-written file
+        except OSError as e:
+            log.warning("Could not write dice cache", path=path, error=e)
+
+    # ---------------------- Access ----------------------
+    def get(self, color, number):
+        if self.surface is None:
+            self.load()
+        return self._faces[(color, number)]
@@ -1,63 +1,86 @@
+import random
 import socket
 import threading
-import json
-from src.common.utils import serialize, deserialize, Request, Response
+import time
+from src.common.log import get_logger
+from src.common.utils import deserialize_dict, encode_message, MessageReader, Request, Response
+
+log = get_logger("client")
 
 
 class CustomClient:
     """A custom client class for MindRoll that properly manages network connections."""
 
-    def __init__(self, server_address):
+    def __init__(self, server_address, max_retries=5, backoff_base=0.1, backoff_max=5.0):
         self.server_address = server_address  # (IP, Port)
         self.sock = None
+        self.reader = None
         self.connected = False
         self.lock = threading.Lock()  # Ensure thread safety
+        # reconnect policy: attempt n waits backoff_base * 2**n (capped, with jitter)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
 
     def connect(self):
         """Establish a connection to the server."""
         if not self.connected:
             try:
                 self.sock = socket.create_connection(self.server_address)  # Creates a TCP connection
+                self.reader = MessageReader(self.sock)
                 self.connected = True
-                print(f"✅ Connected to server at {self.server_address}")
+                log.info("✅ Connected to server", address=self.server_address)
             except Exception as e:
-                print(f"❌ Connection failed: {e}")
+                log.warning("❌ Connection failed", address=self.server_address, error=e)
+
+    def reconnect_with_backoff(self):
+        """
+        Drop the current socket and try to connect again, waiting exponentially
+        longer between attempts. Calls on_reconnected() once connected.
+        Returns True on success.
+        """
+        self.close()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+            self.connect()
+            if self.connected:
+                self.on_reconnected()
+                return True
+        log.warning("❌ Giving up reconnecting", address=self.server_address, attempts=self.max_retries + 1)
+        return False
+
+    def on_reconnected(self):
+        """Hook for subclasses to restore session state on a new connection."""
+        pass
 
     def send_request(self, method, *args):
         """Send an RPC request to the server."""
         if not self.connected:
             self.connect()
 
-        # Ensure valid JSON structure
         request = Request(method, args, {})
-        serialized_request = json.dumps(request.__dict__, ensure_ascii=False) + "\n"  # Ensure message is properly terminated
-
-        print(f"📤 Sending JSON request: {serialized_request.strip()}")  # 🔥 Debug JSON before sending
+        log.debug("📤 Sending JSON request", method=method)
 
         try:
             with self.lock:
-                self.sock.sendall(serialized_request.encode('utf-8'))  # Send request
-                response_data = self.sock.recv(4096).decode('utf-8')  # Receive response
-                
-                print(f"📥 Received response: {response_data.strip()}")  # 🔥 Debug server response
-                
-                # Ensure response is a proper JSON object
-                response_data = response_data.strip()
-                if not response_data.startswith("{"):
-                    print("❌ Received malformed JSON response. Attempting to fix...")
-                    response_data = response_data[1:]  # Remove the first incorrect character
+                self.sock.sendall(encode_message(request))  # newline-terminated frame
+                response_data = self.reader.read_message()  # Receive one full response
 
-                if not response_data.strip():
-                    print("❌ Server sent an empty response.")
+                if response_data is None:
+                    log.warning("❌ Server closed the connection.")
+                    self.close()
                     return None
 
-                response = deserialize(response_data)  # Deserialize response
-                
+                log.debug("📥 Received response", method=method)
+                response = deserialize_dict(response_data)  # Deserialize response
+
                 if isinstance(response, Response) and response.error:
-                    print(f"❌ Server Error: {response.error}")
+                    log.debug("❌ Server Error", method=method, error=response.error)
                 return response
         except Exception as e:
-            print(f"❌ Error during RPC request: {e}")
+            log.warning("❌ Error during RPC request", method=method, error=e)
             return None
 
 
@@ -66,4 +89,4 @@ class CustomClient:
         if self.sock:
             self.sock.close()
             self.connected = False
-            print("❌ Connection closed")
+            log.info("❌ Connection closed")
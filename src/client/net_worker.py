@@ -0,0 +1,87 @@
+# src/client/net_worker.py
+import queue
+import threading
+import time
+from collections import deque
+
+
+class RollingStats:
+    """ Mean / p95 / max over the last `size` samples (milliseconds). """
+
+    def __init__(self, size=120):
+        self.samples = deque(maxlen=size)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def mean(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def p95(self):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def max(self):
+        return max(self.samples) if self.samples else 0.0
+
+
+class NetworkWorker:
+    """
+    Runs MindRollClient calls on a background thread so the render loop never
+    waits on the network.
+
+    The render loop submits a call with a tag and a callback, and once per frame
+    calls process_results(), which runs the callbacks of finished calls on the
+    render thread. UI state is therefore only ever touched from one thread.
+    Round-trip latency is recorded here, separately from frame time.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.latency = RollingStats()
+        self.in_flight = {}  # { tag: count }
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="net-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, tag, method, *args, callback=None):
+        """ Queue client.<method>(*args); callback(response) runs later in process_results(). """
+        self.in_flight[tag] = self.in_flight.get(tag, 0) + 1
+        self.requests.put((tag, method, args, callback))
+
+    def busy(self, tag):
+        """ True while a call submitted under `tag` has not been processed yet. """
+        return self.in_flight.get(tag, 0) > 0
+
+    def process_results(self, limit=16):
+        """ Run callbacks of finished calls; call once per frame from the render loop. """
+        for _ in range(limit):
+            try:
+                tag, response, callback = self.results.get_nowait()
+            except queue.Empty:
+                return
+            self.in_flight[tag] -= 1
+            if callback is not None:
+                callback(response)
+
+    def _run(self):
+        while self.running:
+            item = self.requests.get()
+            if item is None:
+                return
+            tag, method, args, callback = item
+            start = time.perf_counter()
+            try:
+                response = getattr(self.client, method)(*args)
+            except Exception:
+                response = None
+            self.latency.add((time.perf_counter() - start) * 1000)
+            self.results.put((tag, response, callback))
+
+    def stop(self):
+        self.running = False
+        self.requests.put(None)
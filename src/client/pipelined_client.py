@@ -0,0 +1,117 @@
+import itertools
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from src.client.rpc_client import MindRollClient, RequestTimeout
+from src.common.log import get_logger
+from src.common.utils import deserialize_dict, encode_message, Request
+
+log = get_logger("client")
+
+
+class PipelinedMindRollClient(MindRollClient):
+    """
+    MindRollClient that allows many requests in flight on one connection.
+
+    Every request carries an "id" that the server echoes back; a reader thread
+    matches responses to their Future by id, in whatever order they arrive.
+    submit() returns a concurrent.futures.Future (wrap it with
+    asyncio.wrap_future() from asyncio code); the regular blocking methods
+    (login, call_number, ...) still work and simply wait on that future.
+    """
+
+    def __init__(self, server_address, timeout=10.0, **kwargs):
+        super().__init__(server_address, **kwargs)
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending = {}  # { request_id: Future }
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._reader_thread = None
+
+    def connect(self):
+        """Connect and start the response reader thread."""
+        if not self.connected:
+            super().connect()
+            if self.connected:
+                self._reader_thread = threading.Thread(target=self._read_loop, args=(self.reader,), daemon=True)
+                self._reader_thread.start()
+
+    def submit(self, method, *args):
+        """
+        Send a request without waiting for its response.
+        Returns a Future that resolves to the Response.
+        """
+        if not self.connected:
+            self.connect()
+        future = Future()
+        if not self.connected:
+            future.set_exception(ConnectionError(f"Not connected to {self.server_address}"))
+            return future
+
+        request_id = next(self._ids)
+        request_obj = Request(method, args, self._metadata(method), id=request_id)
+        with self._pending_lock:
+            self._pending[request_id] = future
+        try:
+            with self._send_lock:
+                self.sock.sendall(encode_message(request_obj))
+        except OSError as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            future.set_exception(e)
+        return future
+
+    def _round_trip(self, method, args):
+        """
+        Blocking calls share the pipelined connection; reconnect handling comes from MindRollClient.
+        A slow response raises RequestTimeout and leaves the connection and other requests alone.
+        """
+        future = self.submit(method, *args)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            # on 3.11+ this is the builtin TimeoutError, an OSError: keep it from looking like a lost connection
+            with self._pending_lock:
+                for request_id, pending in list(self._pending.items()):
+                    if pending is future:
+                        del self._pending[request_id]
+            raise RequestTimeout(f"No response to {method} within {self.timeout}s") from None
+
+    def in_flight(self):
+        """Number of requests sent but not answered yet."""
+        with self._pending_lock:
+            return len(self._pending)
+
+    def _read_loop(self, reader):
+        error = ConnectionError("Server closed the connection")
+        try:
+            while True:
+                data = reader.read_message()
+                if data is None:
+                    break
+                response = deserialize_dict(data)
+                with self._pending_lock:
+                    future = self._pending.pop(response.id, None)
+                if future is None:
+                    log.warning("Response for unknown request id", id=response.id)
+                    continue
+                future.set_result(response)
+        except Exception as e:
+            error = e
+        # only fail what belongs to this connection's reader
+        if reader is self.reader:
+            self.connected = False
+            self._fail_pending(error)
+
+    def _fail_pending(self, error):
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def close(self):
+        """Close the connection and fail anything still in flight."""
+        super().close()
+        self._fail_pending(ConnectionError("Connection closed"))
@@ -0,0 +1,158 @@
+# src/client/render.py
+from collections import OrderedDict
+from functools import lru_cache
+
+import pygame
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """ One pygame Font per size, built on first use. """
+    return pygame.font.Font(None, size)
+
+
+class TextCache:
+    """ Rendered text surfaces keyed on (text, size, color), least recently used evicted. """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color):
+        key = (text, size, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = get_font(size).render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+class RetainedScreen:
+    """
+    Retained-mode drawing on top of the display surface.
+
+    Each frame a screen function declares its elements between begin() and end(),
+    every element under a stable key with a signature of its content. end()
+    compares against the previous frame and only repaints the rectangles whose
+    elements appeared, disappeared, moved or changed, then pushes just those
+    rectangles with pygame.display.update(). An unchanged frame costs no drawing.
+    Switching to a different scene (or invalidate()) repaints the whole screen.
+    Callables in `overlays` are run at the end of every frame to declare elements
+    drawn on top of whatever the scene declared (toasts, for instance).
+    """
+
+    def __init__(self, surface, background=(0, 0, 0), fps=30):
+        self.surface = surface
+        self.background = background
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.text_cache = TextCache()
+        self._scene = None
+        self._full_redraw = True
+        self._elements = OrderedDict()  # { key: (signature, rect, draw) } of the last frame
+        self._frame = None
+        self.overlays = []  # [ callable(view) ]
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+
+    # ---------------------- Frame ----------------------
+    def begin(self, scene):
+        if scene != self._scene:
+            self._scene = scene
+            self._full_redraw = True
+        self._frame = OrderedDict()
+
+    def end(self):
+        for overlay in self.overlays:
+            overlay(self)
+        frame, previous = self._frame, self._elements
+        self._elements, self._frame = frame, None
+
+        if self._full_redraw:
+            self._full_redraw = False
+            self.surface.fill(self.background)
+            for _, rect, draw in frame.values():
+                draw(self.surface)
+            pygame.display.flip()
+            self.frames_drawn += 1
+            return
+
+        dirty = []
+        for key, (signature, rect, _) in frame.items():
+            old = previous.get(key)
+            if old is None or old[0] != signature or old[1] != rect:
+                dirty.append(rect)
+                if old is not None and old[1] != rect:
+                    dirty.append(old[1])
+        for key, (_, rect, _) in previous.items():
+            if key not in frame:
+                dirty.append(rect)
+
+        if not dirty:
+            self.frames_skipped += 1
+            return
+
+        for area in dirty:
+            self.surface.set_clip(area)
+            self.surface.fill(self.background, area)
+            for _, rect, draw in frame.values():
+                if rect.colliderect(area):
+                    draw(self.surface)
+        self.surface.set_clip(None)
+        pygame.display.update(dirty)
+        self.frames_drawn += 1
+
+    def invalidate(self):
+        """ Repaint everything on the next end(), e.g. after drawing outside this layer. """
+        self._full_redraw = True
+
+    def tick(self):
+        """ Sleep to cap the frame rate; returns milliseconds since the last tick. """
+        return self.clock.tick(self.fps)
+
+    # ---------------------- Elements ----------------------
+    def _add(self, key, signature, rect, draw):
+        self._frame[key] = (signature, pygame.Rect(rect), draw)
+
+    def text(self, key, text, pos, size=30, color=(255, 255, 255), center=False):
+        surface = self.text_cache.render(text, size, color)
+        rect = surface.get_rect(center=pos) if center else surface.get_rect(topleft=pos)
+        self._add(key, ("text", text, size, color), rect, lambda target: target.blit(surface, rect))
+
+    def rect(self, key, color, rect, width=0):
+        rect = pygame.Rect(rect)
+        self._add(key, ("rect", color, width), rect, lambda target: pygame.draw.rect(target, color, rect, width))
+
+    def button(self, key, text, rect, color, font_size=36, text_color=(255, 255, 255)):
+        rect = pygame.Rect(rect)
+        surface = self.text_cache.render(text, font_size, text_color)
+        text_rect = surface.get_rect(center=rect.center)
+
+        def draw(target):
+            pygame.draw.rect(target, color, rect)
+            target.blit(surface, text_rect)
+        self._add(key, ("button", text, color, font_size, text_color), rect, draw)
+
+    def input_box(self, key, rect, text, fill=(200, 200, 200), border=(255, 255, 255),
+                  size=30, color=(0, 0, 0)):
+        rect = pygame.Rect(rect)
+        surface = self.text_cache.render(text, size, color)
+
+        def draw(target):
+            pygame.draw.rect(target, fill, rect)
+            pygame.draw.rect(target, border, rect, 2)
+            target.blit(surface, (rect.x + 10, rect.y + 10))
+        self._add(key, ("input", text, fill, border, size, color), rect, draw)
+
+    def image(self, key, surface, pos, signature=None):
+        rect = surface.get_rect(topleft=pos)
+        sig = ("image", signature if signature is not None else id(surface))
+        self._add(key, sig, rect, lambda target: target.blit(surface, rect))
@@ -1,54 +1,189 @@
-import json
-import sys
-import traceback
-import threading
+import re
+import time
 
 from src.client.customer_client import CustomClient
-from src.common.users import Token
-from src.common.utils import serialize, deserialize, Request, Response
+from src.common.compression import ALGORITHMS, FrameDecompressor
+from src.common.log import get_logger
+from src.common.utils import deserialize_dict, encode_message, Request, Response
+
+log = get_logger("client")
+
+
+class RequestTimeout(Exception):
+    """ No response in time; unlike an OSError the connection is still usable. """
+
+
+# rate limited, shed under overload or cut off by a restart: not applied, safe to send again after the wait
+RETRY_AFTER = re.compile(r"(?:Rate limited|Server overloaded|Server restarting), retry after (\d+) ms")
+# the replica cannot answer this read (yet); the primary can
+REPLICA_UNAVAILABLE = re.compile(r"Replica (?:stale|behind)|Read-only replica")
 
 
 class MindRollClient(CustomClient):
     """A custom client class for MindRoll that properly manages network connections.
+
+    If the connection drops, it reconnects with exponential backoff and resumes
+    the session with the saved token (one resume_session round trip, no login).
+
+    With a `replica_address`, read-only requests (get_game_state, list_rooms,
+    leaderboard) go to that replica. Each asks for at least the version the
+    primary reported for our last write, so a get_game_state right after our
+    own call_number never shows the state from before it; a replica that has
+    not caught up, is stale or is down is skipped and the primary answers.
+
+    With compression=True, every new connection asks the server to compress
+    its larger responses (history, leaderboard and lobby pages).
     """
 
-    def __init__(self, server_address):
-        super().__init__(server_address)
-        self.token = None  # save token
+    # requests that can be sent again after a reconnect without side effects
+    IDEMPOTENT_METHODS = {"get_game_state", "login", "resume_session", "server_stats", "leaderboard_top", "player_rank",
+                         "get_room_history", "list_rooms"}
 
-    def send_request(self, method, *args):
-        """
-        Send an RPC request to the server.
-        """
-        if not self.connected:
-            self.connect()
+    def __init__(self, server_address, auto_reconnect=True, throttle_retries=3, replica_address=None,
+                 compression=False, **kwargs):
+        super().__init__(server_address, **kwargs)
+        self.compression = compression
+        self.token = None  # save token
+        self.auto_reconnect = auto_reconnect
+        self.throttle_retries = throttle_retries  # waits for "..., retry after X ms" before giving up
+        self.resumed_rooms = []  # rooms restored by the last resume_session
+        self.replica = MindRollClient(replica_address, auto_reconnect=False, throttle_retries=0,
+                                      compression=compression) if replica_address else None
+        self.written_version = 0  # replication version of our last write, as the primary reported it
+        self.min_version = 0      # sent to a replica: the version it must have applied to answer
 
+    def _metadata(self, method):
         # If not register/login, with token
-        metadata = {}
         if method not in ["register", "login"] and self.token:
-            metadata = {"token": {"token": self.token}}
+            return {"token": {"token": self.token}}
+        if self.min_version:
+            return {"min_version": self.min_version}
+        return {}
 
-        request_obj = Request(method, args, metadata)
-        serialized_req = serialize(request_obj)
-        print(f"📤 Sending request: {serialized_req}")
+    def connect(self):
+        """Connect, and negotiate compression on the new connection if we want it."""
+        if self.connected:
+            return
+        super().connect()
+        if self.connected and self.compression:
+            self._negotiate()
 
+    def _negotiate(self):
+        # straight over the socket: a pipelined client's reader thread does not run yet
+        request_obj = Request("negotiate", [{"compression": list(ALGORITHMS)}])
         try:
             with self.lock:
-                self.sock.sendall(serialized_req.encode('utf-8'))
-                response_data = self.sock.recv(4096).decode('utf-8')
-                print(f"📥 Received response: {response_data}")
+                self.sock.sendall(encode_message(request_obj))
+                response = deserialize_dict(self.reader.read_message())
+        except Exception as e:
+            log.warning("❌ Compression negotiation failed", error=e)
+            return
+        if response.error or not (response.result or {}).get("compression"):
+            # an older server, or one with compression off
+            log.info("📦 Responses stay uncompressed", error=response.error)
+            return
+        self.reader.decompressor = FrameDecompressor()
+        log.debug("📦 Compression on", **response.result)
 
-                response = deserialize(response_data)
-                if isinstance(response, Response) and response.error:
-                    print(f"❌ Server Error: {response.error}")
-                else:
-                    print(f"✅ Response: {response.result}")
+    def _round_trip(self, method, args):
+        """Send one request and wait for its response; raises on connection errors."""
+        request_obj = Request(method, args, self._metadata(method))
+        log.debug("📤 Sending request", method=method)
+        with self.lock:
+            self.sock.sendall(encode_message(request_obj))
+            response_data = self.reader.read_message()
+        if response_data is None:
+            raise ConnectionError("Server closed the connection")
+        log.debug("📥 Received response", method=method)
+        return deserialize_dict(response_data)
 
+    def send_request(self, method, *args):
+        """
+        Send an RPC request to the server. A rate-limited or shed request was
+        not applied, so it is sent again after the wait the server asked for.
+        """
+        response = self._send_request(method, args)
+        for _ in range(self.throttle_retries):
+            throttled = RETRY_AFTER.match(response.error or "") if isinstance(response, Response) else None
+            if not throttled:
+                break
+            delay = int(throttled.group(1)) / 1000
+            log.debug("⏳ Retrying later", method=method, retry_after_ms=throttled.group(1))
+            time.sleep(delay)
+            if response.error.startswith("Server restarting"):
+                # this connection is closing; the new server listens on the same address
+                self.reconnect_with_backoff()
+            response = self._send_request(method, args)
+        if isinstance(response, Response) and response.version and method not in self.IDEMPOTENT_METHODS:
+            self.written_version = max(self.written_version, response.version)
+        return response
+
+    def _read(self, method, *args):
+        """A read-only request: from the replica if there is one and it can answer, else from the primary."""
+        if self.replica is not None:
+            self.replica.min_version = self.written_version
+            response = self.replica.send_request(method, *args)
+            if isinstance(response, Response) and not REPLICA_UNAVAILABLE.match(response.error or ""):
                 return response
+            log.debug("↩️ Reading from the primary", method=method, error=response.error if response else None)
+        return self.send_request(method, *args)
+
+    def close(self):
+        super().close()
+        if self.replica is not None:
+            self.replica.close()
+
+    def _send_request(self, method, args):
+        if not self.connected:
+            if self.auto_reconnect and self.token:
+                self.reconnect_with_backoff()
+            else:
+                self.connect()
+        if not self.connected:
+            return None
+
+        try:
+            response = self._round_trip(method, args)
+        except RequestTimeout as e:
+            log.warning("⌛ RPC request timed out", method=method, error=e)
+            return None
+        except OSError as e:
+            log.warning("❌ Connection lost during RPC request", method=method, error=e)
+            if not (self.auto_reconnect and self.reconnect_with_backoff()):
+                return None
+            if method not in self.IDEMPOTENT_METHODS:
+                # the server may or may not have applied it; let the caller decide
+                return None
+            try:
+                response = self._round_trip(method, args)
+            except Exception as e:
+                log.warning("❌ Error during RPC request", method=method, error=e)
+                return None
         except Exception as e:
-            print(f"❌ Error during RPC request: {e}")
+            log.warning("❌ Error during RPC request", method=method, error=e)
             return None
 
+        if isinstance(response, Response) and response.error:
+            log.debug("❌ Server Error", method=method, error=response.error)
+        return response
+
+    def on_reconnected(self):
+        """Resume the session on the new connection instead of logging in again."""
+        self.resumed_rooms = []
+        if not self.token:
+            return
+        try:
+            response = self._round_trip("resume_session", ())
+        except Exception as e:
+            log.warning("❌ Session resume failed", error=e)
+            return
+        if response.error:
+            log.info("❌ Session expired, please log in again", error=response.error)
+            self.token = None
+            return
+        self.resumed_rooms = response.result.get("rooms", [])
+        log.info("🔄 Session resumed", rooms=self.resumed_rooms)
+
     # ---------------------- Register & Login ----------------------
     def register(self, username, password):
         """
@@ -64,9 +199,19 @@ class MindRollClient(CustomClient):
         resp = self.send_request("login", username, password)
         if resp and resp.result and "token" in resp.result:
             self.token = resp.result["token"]
-            print(f"✅ Logged in! token={self.token}")
+            log.info("✅ Logged in", username=username)
         else:
-            print("❌ Login failed or server error")
+            log.info("❌ Login failed or server error", username=username)
+        return resp
+
+    def logout(self):
+        """
+        logout (uses the saved token, which is then forgotten).
+        """
+        resp = self.send_request("logout")
+        if resp and not resp.error:
+            log.info("👋 Logged out")
+        self.token = None
         return resp
 
     # ---------------------- Game Commands ----------------------
@@ -74,43 +219,49 @@ class MindRollClient(CustomClient):
         """
         create_room <room_id>.
         """
-        print(f"🏠 Creating room: {room_id}")
+        log.debug("🏠 Creating room", room=room_id)
         return self.send_request("create_room", room_id)
 
     def join_room(self, room_id, player_name):
         """
         join_room <room_id> <player_name>.
         """
-        print(f"👤 {player_name} is joining room: {room_id}")
+        log.debug("👤 Joining room", player=player_name, room=room_id)
         return self.send_request("join_room", room_id, player_name)
 
     def call_number(self, room_id, player_name, number):
         """
         call_number <room_id> <player_name> <number>.
         """
-        print(f"🎲 {player_name} calls number {number} in room {room_id}")
+        log.debug("🎲 Calling number", player=player_name, number=number, room=room_id)
         return self.send_request("call_number", room_id, player_name, number)
 
     def reveal_result(self, room_id, player_name):
         """
         reveal_result <room_id> <player_name>.
         """
-        print(f"📢 {player_name} is revealing the result in room {room_id}")
+        log.debug("📢 Revealing result", player=player_name, room=room_id)
         return self.send_request("reveal_result", room_id, player_name)
 
     def get_game_state(self, room_id):
         """
         get_game_state <room_id>.
         """
-        print(f"📊 Fetching game state for room {room_id}")
-        return self.send_request("get_game_state", room_id)
+        log.debug("📊 Fetching game state", room=room_id)
+        return self._read("get_game_state", room_id)
+
+    def list_rooms(self, offset=0, limit=50):
+        """
+        list_rooms [offset] [limit] => {"rooms": [{"room_id", "players", "started", "spectators"}], "total"}.
+        """
+        return self._read("list_rooms", offset, limit)
 
     # ---------------------- 1) leave room ----------------------
     def leave_room(self, room_id, player_name):
         """
         leave_room <room_id> <player_name>.
         """
-        print(f"🚪 {player_name} is leaving room {room_id}")
+        log.debug("🚪 Leaving room", player=player_name, room=room_id)
         return self.send_request("leave_room", room_id, player_name)
 
     # ---------------------- 2) Reconnect ----------------------
@@ -118,5 +269,102 @@ class MindRollClient(CustomClient):
         """
         reconnect <room_id> <player_name>.
         """
-        print(f"🔄 {player_name} is trying to reconnect to room {room_id}")
+        log.debug("🔄 Reconnecting to room", player=player_name, room=room_id)
         return self.send_request("reconnect", room_id, player_name)
+
+    def resume_session(self):
+        """
+        resume_session (uses the saved token).
+        Return { 'username': ..., 'rooms': [...] }.
+        """
+        resp = self.send_request("resume_session")
+        if resp and not resp.error:
+            self.resumed_rooms = resp.result.get("rooms", [])
+        return resp
+
+    # ---------------------- 3) Bots ----------------------
+    def add_bot(self, room_id, bot_name=None):
+        """
+        add_bot <room_id> [bot_name].
+        """
+        log.debug("🤖 Adding a bot", room=room_id)
+        if bot_name:
+            return self.send_request("add_bot", room_id, bot_name)
+        return self.send_request("add_bot", room_id)
+
+    # ---------------------- 4) Leaderboard ----------------------
+    def leaderboard_top(self, k=10, offset=0):
+        """
+        leaderboard_top [k] [offset] => best players first.
+        """
+        return self._read("leaderboard_top", k, offset)
+
+    def player_rank(self, username):
+        """
+        player_rank <username> => {"rank", "username", "score", "players"}.
+        """
+        return self._read("player_rank", username)
+
+    # ---------------------- 5) Spectating ----------------------
+    def spectate(self, room_id):
+        """
+        spectate_room <room_id>, then yield {"room", "version", "state"} on every change
+        until the room closes. The connection is used for nothing else meanwhile;
+        spectate from a client of its own.
+        """
+        resp = self.send_request("spectate_room", room_id)
+        if not resp or resp.error:
+            log.info("❌ Cannot spectate", room=room_id, error=resp.error if resp else None)
+            return
+        log.debug("👀 Spectating", room=room_id)
+        while True:
+            try:
+                with self.lock:
+                    data = self.reader.read_message()
+            except (OSError, ValueError) as e:
+                log.warning("❌ Spectating stopped", room=room_id, error=e)
+                return
+            if data is None:
+                self.close()
+                return
+            update = deserialize_dict(data)
+            if update.error:
+                log.debug("👀 Spectating ended", room=room_id, reason=update.error)
+                return
+            yield update.result
+
+    # ---------------------- 6) History ----------------------
+    def get_room_history(self, room_id, since=None, cursor=None, limit=200):
+        """
+        get_room_history <room_id> [since] [cursor] [limit] => {"events": [...], "next": cursor or None}.
+        """
+        return self.send_request("get_room_history", room_id, since, cursor, limit)
+
+    def iter_room_history(self, room_id, since=None, page_size=200):
+        """
+        Yield a room's events oldest first, fetching one page at a time.
+        """
+        cursor = None
+        while True:
+            resp = self.get_room_history(room_id, since, cursor, page_size)
+            if not resp or resp.error:
+                return
+            yield from resp.result["events"]
+            cursor = resp.result["next"]
+            if cursor is None:
+                return
+
+    # ---------------------- 7) Admin ----------------------
+    def server_stats(self):
+        """
+        server_stats (admin token required).
+        """
+        return self.send_request("server_stats")
+
+    def bulk_register(self, users, ordered=False):
+        """
+        bulk_register <users> [ordered] (admin token required).
+        users: list of {"username", "password", "name"?, "role"?} dicts; send a few thousand per call.
+        """
+        log.debug("👥 Bulk registering users", count=len(users), ordered=ordered)
+        return self.send_request("bulk_register", users, ordered)
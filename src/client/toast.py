@@ -0,0 +1,79 @@
+# src/client/toast.py
+import itertools
+import time
+from collections import deque
+
+
+class Toast:
+    def __init__(self, toast_id, message, lifetime):
+        self.id = toast_id
+        self.message = message
+        self.lifetime = lifetime
+        self.expires_at = None  # set once the toast becomes visible
+
+
+class ToastManager:
+    """
+    Queued, time-based notifications drawn on top of the current screen.
+
+    push() never blocks: toasts wait in a queue, at most `max_visible` are shown
+    at once and each one disappears `lifetime` seconds after it first appeared.
+    A message that is already on screen is not stacked again, its timer is just
+    refreshed. Messages pushed with a `key` (e.g. the last round result seen by
+    every poll) are shown once per distinct value until forget(key).
+    """
+
+    def __init__(self, lifetime=2.0, max_visible=3, max_queued=20):
+        self.lifetime = lifetime
+        self.max_visible = max_visible
+        self.visible = []
+        self.queued = deque(maxlen=max_queued)  # oldest dropped when flooded
+        self._ids = itertools.count(1)
+        self._last_by_key = {}  # { key: message }
+
+    def push(self, message, lifetime=None, key=None, now=None):
+        """ Queue a message; returns False if it was a duplicate. """
+        if key is not None:
+            if self._last_by_key.get(key) == message:
+                return False
+            self._last_by_key[key] = message
+
+        now = time.time() if now is None else now
+        for toast in self.visible:
+            if toast.message == message:
+                toast.expires_at = now + toast.lifetime
+                return False
+        if any(toast.message == message for toast in self.queued):
+            return False
+
+        self.queued.append(Toast(next(self._ids), message, lifetime or self.lifetime))
+        return True
+
+    def forget(self, key):
+        """ Let the next message under `key` show again even if it repeats the last one. """
+        self._last_by_key.pop(key, None)
+
+    def update(self, now=None):
+        """ Drop expired toasts and promote queued ones; returns the visible toasts. """
+        now = time.time() if now is None else now
+        self.visible = [toast for toast in self.visible if toast.expires_at > now]
+        while self.queued and len(self.visible) < self.max_visible:
+            toast = self.queued.popleft()
+            toast.expires_at = now + toast.lifetime
+            self.visible.append(toast)
+        return self.visible
+
+    def clear(self):
+        self.visible = []
+        self.queued.clear()
+
+    def draw(self, view, screen_size, width=600, height=50, gap=10,
+             background=(255, 255, 255), color=(255, 0, 0), size=30):
+        """ Declare the visible toasts on a RetainedScreen, stacked around the screen centre. """
+        toasts = self.update()
+        total = len(toasts) * height + max(len(toasts) - 1, 0) * gap
+        x = (screen_size[0] - width) // 2
+        y = (screen_size[1] - total) // 2
+        for toast in toasts:
+            view.button(f"toast:{toast.id}", toast.message, (x, y, width, height), background, size, color)
+            y += height + gap
@@ -11,6 +11,13 @@ from src.common.models import GameObject
 from src.client.controller import Controller
 from src.client.view import View
 from src.client.rpc_client import MindRollClient
+from src.client.render import RetainedScreen, get_font
+from src.client.net_worker import NetworkWorker, RollingStats
+from src.client.toast import ToastManager
+from src.client.assets import DiceAtlas
+from src.common.log import get_logger
+
+log = get_logger("ui")
 
 pygame.init()
 pygame.font.init()
@@ -19,11 +26,14 @@ pygame.font.init()
 server_ip = "127.0.0.1"
 server_port = 8080
 client = MindRollClient((server_ip, server_port))
+worker = NetworkWorker(client)  # all RPCs go through this thread
 
 # ------------------- Screen Setup -------------------
 SCREEN_SIZE = (800, 600)
 screen = pygame.display.set_mode(SCREEN_SIZE)
 pygame.display.set_caption("MindRoll")
+FPS = 30
+view = RetainedScreen(screen, fps=FPS)
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -31,9 +41,6 @@ BLUE = (0, 0, 255)
 GRAY = (200, 200, 200)
 RED = (255, 0, 0)
 
-def get_font(size):
-    return pygame.font.Font(None, size)
-
 # ------------------- Game State -------------------
 STATE_MAIN_MENU = "main_menu"
 STATE_REGISTER = "register"
@@ -68,64 +75,155 @@ PULL_INTERVAL = 1.0
 cached_game_state = None
 
 # ------------------- Dice-------------------
-DICE_COLORS = ["red", "yellow", "green", "blue", "black"]
 DICE_SIZE = (300, 300)
+dice_atlas = DiceAtlas("assets/dice", DICE_SIZE)  # loaded on the first game_screen frame
+
+toasts = ToastManager(lifetime=2.0)
+view.overlays.append(lambda v: toasts.draw(v, SCREEN_SIZE, background=WHITE, color=RED))
+
+def show_message(message, key=None):
+    """ Non-blocking: the message is drawn as a toast over the next frames. """
+    toasts.push(message, key=key)
+
+# ------------------- Network callbacks -------------------
+# Requests run on the NetworkWorker thread; these run on the render thread
+# from worker.process_results(), so they can touch UI state freely.
+
+def on_register(resp):
+    global current_state
+    if resp and not resp.error:
+        show_message("Successfully Registered!")
+        current_state = STATE_MAIN_MENU
+    else:
+        show_message("Register Failed: " + (resp.error if resp else "Unknown Error"))
+
+def on_login(resp):
+    global current_state
+    if resp and not resp.error:
+        show_message("Successfully Login!")
+        current_state = STATE_MOD_SCREEN
+    else:
+        show_message("Login Failed: " + (resp.error if resp else "Unknown Error"))
+
+def enter_room(room):
+    global current_state, selected_room, room_name, last_pull_time, cached_game_state
+    selected_room = room
+    room_name = ""
+    last_pull_time = 0.0
+    cached_game_state = None
+    current_state = STATE_GAME
+
+def on_room_created(resp, room):
+    if resp and not resp.error:
+        show_message(f"Created room: {room}")
+        worker.submit("room", "join_room", room, login_account,
+                      callback=lambda resp_join: on_room_entered(
+                          resp_join, room, f"Joined room: {room}", "Join created room failed: "))
+    else:
+        show_message("Fail to Create Room: " + (resp.error if resp else "Unknown Error"))
+
+def on_room_entered(resp, room, success_message, failure_prefix):
+    if resp and not resp.error:
+        show_message(success_message)
+        enter_room(room)
+    elif resp and resp.error == "Cannot join: game already started!":
+        show_message("Cannot join: game already started!")
+    else:
+        show_message(failure_prefix + (resp.error if resp else "Unknown Error"))
+
+def on_session_resumed(resp):
+    if resp and not resp.error and client.resumed_rooms:
+        show_message(f"Reconnected to {client.resumed_rooms[0]}")
+        enter_room(client.resumed_rooms[0])
+    elif resp and not resp.error:
+        show_message("No room to reconnect to.")
+    else:
+        show_message("Reconnect failed: " + (resp.error if resp else "Unknown Error"))
+
+def on_game_state(resp, room):
+    global current_state, cached_game_state, player_dice, player_score
+    if current_state != STATE_GAME or room != selected_room:
+        return  # answer for a room we already left
+    if resp and not resp.error:
+        cached_game_state = resp.result
+
+        # every poll sees the same result until the server clears it; show it once
+        last_result_str = cached_game_state.get("last_result_str", None)
+        if last_result_str:
+            show_message(last_result_str, key="last_result")
+        else:
+            toasts.forget("last_result")
 
-def load_dice_images():
-    images = {}
-    for color in DICE_COLORS:
-        images[color] = {}
-        for number in range(1, 7):
-            path = f"assets/dice/{color}{number}.png"
-            img = pygame.image.load(path)
-            img = pygame.transform.scale(img, DICE_SIZE)
-            images[color][number] = img
-    return images
-
-dice_images = load_dice_images()
-
-def show_message(message):
-    popup_width, popup_height = 600, 100
-    popup_x = (SCREEN_SIZE[0] - popup_width) // 2
-    popup_y = (SCREEN_SIZE[1] - popup_height) // 2
-
-    popup = pygame.Surface((popup_width, popup_height))
-    popup.fill(WHITE)
-
-    text_surface = get_font(30).render(message, True, RED)
-    text_x = (popup_width - text_surface.get_width()) // 2
-    text_y = (popup_height - text_surface.get_height()) // 2
-    popup.blit(text_surface, (text_x, text_y))
-
-    screen.blit(popup, (popup_x, popup_y))
-    pygame.display.flip()
-    pygame.time.delay(2000)
-
-def draw_button(text, rect, color, font_size=36):
-    pygame.draw.rect(screen, color, rect)
-    font = get_font(font_size)
-    text_surface = font.render(text, True, WHITE)
-    text_rect = text_surface.get_rect(center=rect.center)
-    screen.blit(text_surface, text_rect)
+        # update player info
+        if login_account in cached_game_state.get("players", {}):
+            pinfo = cached_game_state["players"][login_account]
+            player_dice = (pinfo["dice_color"], pinfo["dice_number"])
+            player_score = pinfo["score"]
+
+        # check if room is empty
+        if not cached_game_state["players"]:
+            show_message("Room is empty or removed; returning to menu.")
+            current_state = STATE_MAIN_MENU
+    else:
+        show_message("Failed to get game state. Possibly room removed.")
+        current_state = STATE_MAIN_MENU
+
+def submit_call(call_value):
+    if not selected_room:
+        show_message("No room selected!")
+    elif not worker.busy("action"):
+        worker.submit("action", "call_number", selected_room, login_account, call_value,
+                      callback=lambda resp: on_called(resp, call_value))
+
+def on_called(resp, call_value):
+    if resp and not resp.error:
+        show_message(f"Call success: {call_value}")
+    else:
+        show_message(f"Call failed: {(resp.error if resp else 'Unknown error')}")
+
+def on_revealed(resp):
+    global player_score, player_dice, last_pull_time
+    if resp and not resp.error:
+        result_info = resp.result
+        # same text the next polls will see as last_result_str, so share its key
+        show_message(result_info["result_str"], key="last_result")
+
+        # update player info
+        if login_account in result_info["players"]:
+            pinfo = result_info["players"][login_account]
+            player_score = pinfo["score"]
+            player_dice = (pinfo["dice_color"], pinfo["dice_number"])
+
+        # update cached game state
+        last_pull_time = 0
+    else:
+        show_message(f"Reveal failed: {(resp.error if resp else 'Unknown Error')}")
+
+def on_left(resp):
+    global current_state
+    if resp and not resp.error:
+        show_message("Left the room successfully.")
+        current_state = STATE_MAIN_MENU
+    else:
+        show_message(f"Leave room failed: {(resp.error if resp else 'Unknown Error')}")
 
 # ------------------- Main Menu -------------------
 def main_menu():
     global current_state
-    screen.fill(BLACK)
-    title_text = get_font(50).render("MindRoll", True, WHITE)
-    screen.blit(title_text, (SCREEN_SIZE[0] // 2 - 100, 50))
+    view.begin(STATE_MAIN_MENU)
+    view.text("title", "MindRoll", (SCREEN_SIZE[0] // 2 - 100, 50), 50, WHITE)
 
     register_button = pygame.Rect(300, 200, 200, 50)
     login_button = pygame.Rect(300, 300, 200, 50)
     rules_button = pygame.Rect(300, 400, 200, 50)
     exit_button = pygame.Rect(300, 500, 200, 50)
 
-    draw_button("Register", register_button, BLUE)
-    draw_button("Login", login_button, BLUE)
-    draw_button("Game Rules", rules_button, BLUE)
-    draw_button("Exit", exit_button, BLUE)
+    view.button("register", "Register", register_button, BLUE)
+    view.button("login", "Login", login_button, BLUE)
+    view.button("rules", "Game Rules", rules_button, BLUE)
+    view.button("exit", "Exit", exit_button, BLUE)
 
-    pygame.display.flip()
+    view.end()
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -144,31 +242,23 @@ def main_menu():
 def input_screen(title, account_var_name, password_var_name, next_state):
     global current_state, register_account, register_password, login_account, login_password, active_input
 
-    screen.fill(BLACK)
-    title_text = get_font(30).render(title, True, WHITE)
-    screen.blit(title_text, (SCREEN_SIZE[0] // 2 - 100, 50))
+    view.begin(title)
+    view.text("title", title, (SCREEN_SIZE[0] // 2 - 100, 50), 30, WHITE)
 
     account_box = pygame.Rect(250, 150, 300, 50)
     password_box = pygame.Rect(250, 250, 300, 50)
     confirm_button = pygame.Rect(300, 350, 200, 50)
     back_button = pygame.Rect(300, 420, 200, 50)
 
-    pygame.draw.rect(screen, GRAY, account_box)
-    pygame.draw.rect(screen, WHITE, account_box, 2)
-    pygame.draw.rect(screen, GRAY, password_box)
-    pygame.draw.rect(screen, WHITE, password_box, 2)
-    draw_button("Confirm", confirm_button, BLUE)
-    draw_button("Back", back_button, BLUE)
-
     account_var = globals()[account_var_name]
     password_var = globals()[password_var_name]
 
-    acc_text = get_font(30).render(account_var, True, BLACK)
-    pwd_text = get_font(30).render("*" * len(password_var), True, BLACK)
-    screen.blit(acc_text, (account_box.x + 10, account_box.y + 10))
-    screen.blit(pwd_text, (password_box.x + 10, password_box.y + 10))
+    view.input_box("account", account_box, account_var, GRAY, WHITE, 30, BLACK)
+    view.input_box("password", password_box, "*" * len(password_var), GRAY, WHITE, 30, BLACK)
+    view.button("confirm", "Confirm", confirm_button, BLUE)
+    view.button("back", "Back", back_button, BLUE)
 
-    pygame.display.flip()
+    view.end()
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -197,26 +287,16 @@ def input_screen(title, account_var_name, password_var_name, next_state):
                 active_input = "password"
             elif back_button.collidepoint(event.pos):
                 current_state = STATE_MAIN_MENU
-            elif confirm_button.collidepoint(event.pos):
+            elif confirm_button.collidepoint(event.pos) and not worker.busy("auth"):
                 if title == "Register":
-                    resp = client.register(register_account, register_password)
-                    if resp and not resp.error:
-                        show_message("Successfully Registered!")
-                        current_state = STATE_MAIN_MENU
-                    else:
-                        show_message("Register Failed: " + (resp.error if resp else "Unknown Error"))
+                    worker.submit("auth", "register", register_account, register_password, callback=on_register)
                 elif title == "Login":
-                    resp = client.login(login_account, login_password)
-                    if resp and not resp.error:
-                        show_message("Successfully Login!")
-                        current_state = next_state
-                    else:
-                        show_message("Login Failed: " + (resp.error if resp else "Unknown Error"))
+                    worker.submit("auth", "login", login_account, login_password, callback=on_login)
     return True
 
 def rules_screen():
     global current_state
-    screen.fill(BLACK)
+    view.begin(STATE_RULES)
     rules_text = [
         "MindRoll Rules:",
         "1. Each player gets a random dice.",
@@ -229,15 +309,14 @@ def rules_screen():
     ]
 
     y_offset = 50
-    for line in rules_text:
-        text_surface = get_font(30).render(line, True, WHITE)
-        screen.blit(text_surface, (50, y_offset))
+    for i, line in enumerate(rules_text):
+        view.text(f"rule{i}", line, (50, y_offset), 30, WHITE)
         y_offset += 40
 
     back_button = pygame.Rect(300, 500, 200, 50)
-    draw_button("Back", back_button, BLUE)
+    view.button("back", "Back", back_button, BLUE)
 
-    pygame.display.flip()
+    view.end()
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -250,27 +329,23 @@ def rules_screen():
 def mod_screen():
     global current_state, room_name, selected_room
 
-    screen.fill(BLACK)
-    title_text = get_font(50).render("Select Game Mode", True, WHITE)
-    screen.blit(title_text, (SCREEN_SIZE[0] // 2 - 150, 50))
+    view.begin(STATE_MOD_SCREEN)
+    view.text("title", "Select Game Mode", (SCREEN_SIZE[0] // 2 - 150, 50), 50, WHITE)
 
     create_button = pygame.Rect(300, 250, 200, 50)
     join_button = pygame.Rect(300, 350, 200, 50)
     reconnect_button = pygame.Rect(300, 450, 200, 50)
     back_button = pygame.Rect(300, 540, 200, 50)
 
-    draw_button("Create a Room", create_button, BLUE)
-    draw_button("Join a Room", join_button, BLUE)
-    draw_button("Reconnect", reconnect_button, BLUE)
-    draw_button("Back", back_button, BLUE)
+    view.button("create", "Create a Room", create_button, BLUE)
+    view.button("join", "Join a Room", join_button, BLUE)
+    view.button("reconnect", "Reconnect", reconnect_button, BLUE)
+    view.button("back", "Back", back_button, BLUE)
 
     input_box = pygame.Rect(250, 150, 300, 50)
-    pygame.draw.rect(screen, GRAY, input_box)
-    pygame.draw.rect(screen, WHITE, input_box, 2)
-    text_surface = get_font(30).render(room_name, True, BLACK)
-    screen.blit(text_surface, (input_box.x + 10, input_box.y + 10))
+    view.input_box("room", input_box, room_name, GRAY, WHITE, 30, BLACK)
 
-    pygame.display.flip()
+    view.end()
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -285,49 +360,26 @@ def mod_screen():
                 room_name += event.unicode
 
         if event.type == pygame.MOUSEBUTTONDOWN:
+            if worker.busy("room"):
+                continue  # a create/join/reconnect is already on its way
+
             if create_button.collidepoint(event.pos):
-                resp_create = client.create_room(room_name)
-                if resp_create and not resp_create.error:
-                    show_message(f"Created room: {room_name}")
-                    resp_join = client.join_room(room_name, login_account)
-                    if resp_join and not resp_join.error:
-                        show_message(f"Joined room: {room_name}")
-                        selected_room = room_name
-                        room_name = ""
-                        current_state = STATE_GAME
-                    else:
-                        if resp_join and resp_join.error == "Cannot join: game already started!":
-                            show_message("Cannot join: game already started!")
-                        else:
-                            show_message("Join created room failed: " + (resp_join.error if resp_join else "Unknown Error"))
-                else:
-                    show_message("Fail to Create Room: " + (resp_create.error if resp_create else "Unknown Error"))
+                worker.submit("room", "create_room", room_name,
+                              callback=lambda resp, room=room_name: on_room_created(resp, room))
 
             elif join_button.collidepoint(event.pos):
-                resp_join = client.join_room(room_name, login_account)
-                if resp_join and not resp_join.error:
-                    show_message(f"Joined room: {room_name}")
-                    selected_room = room_name
-                    room_name = ""
-                    current_state = STATE_GAME
-                else:
-                    if resp_join and resp_join.error == "Cannot join: game already started!":
-                        show_message("Cannot join: game already started!")
-                    else:
-                        show_message("Fail to Join Room: " + (resp_join.error if resp_join else "Unknown Error"))
+                worker.submit("room", "join_room", room_name, login_account,
+                              callback=lambda resp, room=room_name: on_room_entered(
+                                  resp, room, f"Joined room: {room}", "Fail to Join Room: "))
 
             elif reconnect_button.collidepoint(event.pos):
                 if room_name.strip():
-                    resp_reconn = client.reconnect(room_name, login_account)
-                    if resp_reconn and not resp_reconn.error:
-                        show_message(f"Reconnected to {room_name}")
-                        selected_room = room_name
-                        room_name = ""
-                        current_state = STATE_GAME
-                    else:
-                        show_message("Reconnect failed: " + (resp_reconn.error if resp_reconn else "Unknown Error"))
+                    worker.submit("room", "reconnect", room_name, login_account,
+                                  callback=lambda resp, room=room_name: on_room_entered(
+                                      resp, room, f"Reconnected to {room}", "Reconnect failed: "))
                 else:
-                    show_message("Please input the room name to reconnect.")
+                    # no room typed: let the server tell us where we were seated
+                    worker.submit("room", "resume_session", callback=on_session_resumed)
 
             elif back_button.collidepoint(event.pos):
                 current_state = STATE_MAIN_MENU
@@ -343,34 +395,14 @@ def game_screen():
     global current_state, player_dice, input_text, selected_room, player_score
     global last_pull_time, cached_game_state
 
-    screen.fill(BLACK)
-    font = get_font(30)
+    view.begin(STATE_GAME)
 
-    # -- PULL_INTERVAL --> get_game_state --
+    # -- PULL_INTERVAL --> get_game_state (answered later in on_game_state) --
     now = time.time()
-    if selected_room and (now - last_pull_time > PULL_INTERVAL):
+    if selected_room and (now - last_pull_time > PULL_INTERVAL) and not worker.busy("poll"):
         last_pull_time = now
-        resp = client.get_game_state(selected_room)
-        if resp and not resp.error:
-            cached_game_state = resp.result
-
-            last_result_str = cached_game_state.get("last_result_str", None)
-            if last_result_str:
-                show_message(last_result_str)
-
-            # update player info
-            if login_account in cached_game_state.get("players", {}):
-                pinfo = cached_game_state["players"][login_account]
-                player_dice = (pinfo["dice_color"], pinfo["dice_number"])
-                player_score = pinfo["score"]
-
-            # check if room is empty
-            if not cached_game_state["players"]:
-                show_message("Room is empty or removed; returning to menu.")
-                current_state = STATE_MAIN_MENU
-        else:
-            show_message("Failed to get game state. Possibly room removed.")
-            current_state = STATE_MAIN_MENU
+        worker.submit("poll", "get_game_state", selected_room,
+                      callback=lambda resp, room=selected_room: on_game_state(resp, room))
 
     current_call_number = 0
     current_turn_player = "Unknown"
@@ -381,35 +413,21 @@ def game_screen():
         players_dict = cached_game_state.get("players", {})
         players_in_room = len(players_dict)
 
-    room_info = font.render(f"Current Room: {selected_room if selected_room else 'None'}", True, WHITE)
-    screen.blit(room_info, (20, 20))
-
-    score_info = font.render(f"Your Score: {player_score}", True, WHITE)
-    screen.blit(score_info, (20, 60))
-
-    players_count_info = font.render(f"Players in Room: {players_in_room}", True, WHITE)
-    screen.blit(players_count_info, (20, 100))
-
-    call_info = font.render(f"Current Call: {current_call_number}", True, WHITE)
-    screen.blit(call_info, (20, 140))
-
-    turn_info = font.render(f"Current Turn: {current_turn_player}", True, WHITE)
-    screen.blit(turn_info, (20, 180))
-
-    player_info = font.render(f"User: {login_account}", True, WHITE)
-    screen.blit(player_info, (400, 20))
+    view.text("room", f"Current Room: {selected_room if selected_room else 'None'}", (20, 20), 30, WHITE)
+    view.text("score", f"Your Score: {player_score}", (20, 60), 30, WHITE)
+    view.text("players", f"Players in Room: {players_in_room}", (20, 100), 30, WHITE)
+    view.text("call", f"Current Call: {current_call_number}", (20, 140), 30, WHITE)
+    view.text("turn", f"Current Turn: {current_turn_player}", (20, 180), 30, WHITE)
+    view.text("user", f"User: {login_account}", (400, 20), 30, WHITE)
 
     # current dice
     dice_color, dice_number = player_dice
-    dice_image = dice_images[dice_color][dice_number]
-    screen.blit(dice_image, (50, 230))
+    dice_image = dice_atlas.get(dice_color, dice_number)
+    view.image("dice", dice_image, (50, 230), signature=player_dice)
 
     # input box
     input_box = pygame.Rect(450, 200, 100, 50)
-    pygame.draw.rect(screen, GRAY, input_box)
-    pygame.draw.rect(screen, WHITE, input_box, 2)
-    text_surface = font.render(input_text, True, BLACK)
-    screen.blit(text_surface, (input_box.x + 10, input_box.y + 10))
+    view.input_box("input", input_box, input_text, GRAY, WHITE, 30, BLACK)
 
     # buttons
     call_button = pygame.Rect(600, 200, 150, 50)
@@ -417,12 +435,12 @@ def game_screen():
     #back_button = pygame.Rect(600, 400, 150, 50)
     leave_button = pygame.Rect(600, 400, 150, 50)
 
-    draw_button("Call", call_button, BLUE)
-    draw_button("Reveal", reveal_button, BLUE)
-    #draw_button("Back", back_button, BLUE)
-    draw_button("Leave Room", leave_button, BLUE)
+    view.button("call_button", "Call", call_button, BLUE)
+    view.button("reveal_button", "Reveal", reveal_button, BLUE)
+    #view.button("back_button", "Back", back_button, BLUE)
+    view.button("leave_button", "Leave Room", leave_button, BLUE)
 
-    pygame.display.flip()
+    view.end()
 
     # ------------------- Handle Request -------------------
     for event in pygame.event.get():
@@ -435,15 +453,7 @@ def game_screen():
             elif event.key == pygame.K_RETURN:
                 # Return => call
                 try:
-                    call_value = int(input_text)
-                    if selected_room:
-                        resp_call = client.call_number(selected_room, login_account, call_value)
-                        if resp_call and not resp_call.error:
-                            show_message(f"Call success: {call_value}")
-                        else:
-                            show_message(f"Call failed: {(resp_call.error if resp_call else 'Unknown error')}")
-                    else:
-                        show_message("No room selected!")
+                    submit_call(int(input_text))
                 except ValueError:
                     pass
                 input_text = ""
@@ -457,12 +467,7 @@ def game_screen():
             if call_button.collidepoint(event.pos):
                 if selected_room:
                     try:
-                        call_value = int(input_text)
-                        resp_call = client.call_number(selected_room, login_account, call_value)
-                        if resp_call and not resp_call.error:
-                            show_message(f"Call success: {call_value}")
-                        else:
-                            show_message(f"Call failed: {(resp_call.error if resp_call else 'Unknown error')}")
+                        submit_call(int(input_text))
                     except ValueError:
                         show_message("Please input a valid number.")
                     input_text = ""
@@ -470,52 +475,37 @@ def game_screen():
                     show_message("No room selected!")
 
             elif reveal_button.collidepoint(event.pos):
-                if selected_room:
-                    resp_reveal = client.reveal_result(selected_room, login_account)
-                    if resp_reveal and not resp_reveal.error:
-                        result_info = resp_reveal.result
-                        # show local message
-                        show_message(f"Reveal: {result_info['result_str']}")
-
-                        # update player info
-                        if login_account in result_info["players"]:
-                            pinfo = result_info["players"][login_account]
-                            player_score = pinfo["score"]
-                            player_dice = (pinfo["dice_color"], pinfo["dice_number"])
-
-                        # update cached game state
-                        last_pull_time = 0
-                    else:
-                        show_message(f"Reveal failed: {(resp_reveal.error if resp_reveal else 'Unknown Error')}")
-                else:
+                if not selected_room:
                     show_message("No room selected!")
+                elif not worker.busy("action"):
+                    worker.submit("action", "reveal_result", selected_room, login_account, callback=on_revealed)
 
             elif leave_button.collidepoint(event.pos):
-                if selected_room:
-                    resp_leave = client.leave_room(selected_room, login_account)
-                    if resp_leave and not resp_leave.error:
-                        show_message("Left the room successfully.")
-                        current_state = STATE_MAIN_MENU
-                    else:
-                        show_message(f"Leave room failed: {(resp_leave.error if resp_leave else 'Unknown Error')}")
-                else:
+                if not selected_room:
                     show_message("No room selected!")
+                elif not worker.busy("action"):
+                    worker.submit("action", "leave_room", selected_room, login_account, callback=on_left)
     return True
 
 def login_wait_screen():
     global current_state
-    screen.fill(BLACK)
-    waiting_text = get_font(50).render("Waiting for server...", True, WHITE)
-    screen.blit(waiting_text, (SCREEN_SIZE[0] // 2 - 150, SCREEN_SIZE[1] // 2))
-    pygame.display.flip()
+    view.begin(STATE_LOGIN_WAIT)
+    view.text("waiting", "Waiting for server...", (SCREEN_SIZE[0] // 2 - 150, SCREEN_SIZE[1] // 2), 50, WHITE)
+    view.end()
 
     time.sleep(2)
     current_state = STATE_MOD_SCREEN
     return True
 
 # ------------------- main -------------------
+frame_time = RollingStats()  # render-thread work per frame, without the FPS sleep
+STATS_INTERVAL = 5.0
+last_stats_time = time.time()
+
 running = True
 while running:
+    frame_start = time.perf_counter()
+    worker.process_results()
     if current_state == STATE_MAIN_MENU:
         running = main_menu()
     elif current_state == STATE_REGISTER:
@@ -530,5 +520,13 @@ while running:
         running = game_screen()
     elif current_state == STATE_RULES:
         running = rules_screen()
+    frame_time.add((time.perf_counter() - frame_start) * 1000)
+
+    if time.time() - last_stats_time > STATS_INTERVAL:
+        last_stats_time = time.time()
+        log.debug("Client timings", frame_ms=round(frame_time.mean(), 2), frame_p95_ms=round(frame_time.p95(), 2),
+                  rpc_ms=round(worker.latency.mean(), 2), rpc_p95_ms=round(worker.latency.p95(), 2))
+    view.tick()  # cap the frame rate instead of spinning a core
 
+worker.stop()
 pygame.quit()
@@ -0,0 +1,66 @@
+# src/common/compression.py
+import base64
+import json
+import zlib
+
+ALGORITHMS = ("zlib",)
+# smaller responses fit one TCP segment either way and save the fewest bytes per CPU microsecond
+# (benchmarks/bench_compression.py)
+MIN_SIZE = 1024
+LEVEL = 1  # level 6 saves another ~30% on history pages for twice the CPU
+# a 4 KB window and memLevel 5 keep each compressing connection at ~32 KB of zlib state instead of ~260 KB
+WBITS = 12
+MEM_LEVEL = 5
+
+
+def accept(offer, min_size=MIN_SIZE):
+    """
+    The server's answer to negotiate {"compression": [algorithm, ...]}: the first
+    offered algorithm it supports (None if there is none, or with min_size None:
+    compression is off) and the size from which responses are compressed.
+    """
+    offered = offer.get("compression") if isinstance(offer, dict) else None
+    algorithm = next((a for a in offered or () if a in ALGORITHMS), None) if min_size is not None else None
+    return {"compression": algorithm, "min_size": min_size}
+
+
+class FrameCompressor:
+    """
+    Compresses the outgoing frames of one connection that are at least
+    `min_size` bytes into {"z": "<base64 raw deflate>"} frames; base64 keeps
+    them free of newlines, so MessageReader frames them like any other message.
+
+    The connection has one deflate stream, flushed after every frame
+    (Z_SYNC_FLUSH): each frame decodes as soon as it arrives, and what earlier
+    frames already said (keys, usernames, room ids) costs next to nothing.
+    So frames must reach the peer in the order they were compressed.
+    """
+
+    def __init__(self, min_size=MIN_SIZE, level=LEVEL, metrics=None):
+        self.min_size = min_size
+        self.metrics = metrics
+        self._deflate = zlib.compressobj(level, zlib.DEFLATED, -WBITS, MEM_LEVEL)
+
+    def compress(self, frame):
+        """ The frame to send instead of `frame` (itself when it is small). """
+        if len(frame) < self.min_size:
+            return frame
+        data = self._deflate.compress(frame) + self._deflate.flush(zlib.Z_SYNC_FLUSH)
+        compressed = b'{"z": "' + base64.b64encode(data) + b'"}\n'
+        if self.metrics:
+            self.metrics.inc("compressed_frames")
+            self.metrics.inc("compression_saved_bytes", len(frame) - len(compressed))
+        return compressed
+
+
+class FrameDecompressor:
+    """ The receiving end of one connection's FrameCompressor. """
+
+    def __init__(self):
+        self._inflate = zlib.decompressobj(-WBITS)
+
+    def decompress(self, message):
+        """ The message a {"z": ...} frame holds; any other message is returned as is. """
+        if not isinstance(message, dict) or "z" not in message:
+            return message
+        return json.loads(self._inflate.decompress(base64.b64decode(message["z"])))
@@ -0,0 +1,208 @@
+# src/common/log.py
+"""
+Leveled, structured logging with a background writer.
+
+Callers only pay a level check when a level is disabled; enabled records are
+put on a SimpleQueue as tuples and formatted/written by a daemon thread in batches.
+
+    log = get_logger("server")
+    log.info("Client connected", address=address)
+    log.debug("Request received", method=name, sample=100)   # 1 in 100
+
+The level comes from MINDROLL_LOG_LEVEL (default INFO) or set_level().
+"""
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+_LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_NAME_LEVELS = {name: level for level, name in _LEVEL_NAMES.items()}
+
+
+def _parse_level(level):
+    if isinstance(level, int):
+        return level
+    return _NAME_LEVELS[str(level).upper()]
+
+
+class _Writer:
+    """ Drains queued records on a daemon thread and writes them in batches. """
+
+    MAX_BATCH = 512
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.queue = queue.SimpleQueue()
+        self.thread = None
+        self.start_lock = threading.Lock()
+
+    def put(self, record):
+        if self.thread is None:
+            self._start()
+        self.queue.put(record)
+
+    def _start(self):
+        with self.start_lock:
+            if self.thread is None:
+                thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                thread.start()
+                self.thread = thread
+
+    def _run(self):
+        # queued items are records, a threading.Event (flush marker) or None (stop)
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            if isinstance(record, threading.Event):
+                record.set()
+                continue
+            batch = [record]
+            marker = stop = False
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                if isinstance(record, threading.Event):
+                    marker = record
+                    break
+                batch.append(record)
+            self._write(batch)
+            if marker:
+                marker.set()
+            if stop:
+                return
+
+    def _write(self, batch):
+        stream = self.stream or sys.stderr
+        try:
+            stream.write("".join(_format(record) for record in batch))
+            stream.flush()
+        except (ValueError, OSError):
+            pass  # stream closed during interpreter shutdown
+
+    def flush(self, timeout=1.0) -> bool:
+        """ Wait until the writer has written everything queued before this call. """
+        if self.thread is None:
+            return True
+        written = threading.Event()
+        self.queue.put(written)
+        return written.wait(timeout)
+
+    def close(self, timeout=1.0):
+        """ Stop the writer at interpreter exit, after it drains the queue. """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout)
+
+
+def _format_value(value):
+    text = str(value)
+    if not text or " " in text or "=" in text:
+        return repr(text)
+    return text
+
+
+def _format(record):
+    created, level, name, message, fields, exc_text = record
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created))
+    line = f"{stamp}.{int(created % 1 * 1000):03d} {_LEVEL_NAMES.get(level, level):<7} {name}: {message}"
+    if fields:
+        line += " " + " ".join(f"{key}={_format_value(value)}" for key, value in fields.items())
+    line += "\n"
+    if exc_text:
+        line += exc_text
+    return line
+
+
+class Logger:
+    def __init__(self, name, manager):
+        self.name = name
+        self._manager = manager
+        self._sample_counts = {}
+
+    @property
+    def level(self):
+        return self._manager.level
+
+    def is_enabled_for(self, level):
+        return level >= self._manager.level
+
+    def _log(self, level, message, fields, exc_info=False):
+        sample = fields.pop("sample", None)
+        if sample and sample > 1:
+            # count per message; only every `sample`-th record is kept
+            count = self._sample_counts.get(message, 0)
+            self._sample_counts[message] = count + 1
+            if count % sample:
+                return
+            fields["sampled"] = f"1/{sample}"
+        exc_text = traceback.format_exc() if exc_info else None
+        self._manager.writer.put((time.time(), level, self.name, message, fields, exc_text))
+
+    def debug(self, message, **fields):
+        if DEBUG >= self._manager.level:
+            self._log(DEBUG, message, fields)
+
+    def info(self, message, **fields):
+        if INFO >= self._manager.level:
+            self._log(INFO, message, fields)
+
+    def warning(self, message, **fields):
+        if WARNING >= self._manager.level:
+            self._log(WARNING, message, fields)
+
+    def error(self, message, **fields):
+        if ERROR >= self._manager.level:
+            self._log(ERROR, message, fields)
+
+    def exception(self, message, **fields):
+        """ Log at ERROR with the current exception's traceback. """
+        if ERROR >= self._manager.level:
+            self._log(ERROR, message, fields, exc_info=True)
+
+
+class _Manager:
+    def __init__(self):
+        self.level = _parse_level(os.environ.get("MINDROLL_LOG_LEVEL", "INFO"))
+        self.writer = _Writer()
+        self.loggers = {}
+
+
+_manager = _Manager()
+atexit.register(_manager.writer.close)
+
+
+def get_logger(name):
+    logger = _manager.loggers.get(name)
+    if logger is None:
+        logger = _manager.loggers.setdefault(name, Logger(name, _manager))
+    return logger
+
+
+def set_level(level):
+    """ Set the global level, e.g. set_level("DEBUG") or set_level(WARNING). """
+    _manager.level = _parse_level(level)
+
+
+def set_stream(stream):
+    """ Redirect output (default: sys.stderr at write time). """
+    _manager.writer.stream = stream
+
+
+def flush(timeout=1.0):
+    """ Block (up to timeout seconds) until everything queued so far has been written. """
+    return _manager.writer.flush(timeout)
@@ -76,3 +76,68 @@ class AuthenticationService(Protocol):
 
     def validate_token(self, token: Token) -> bool:
         ...
+
+
+class UserStore(Protocol):
+    """
+    Storage behind the server's users and login tokens; see
+    src/common/users/store.py for the backends. Users come back without their
+    password hash. Token and revocation documents are plain dicts with
+    naive UTC datetime fields ("expiration", "created", "revoked_before").
+    """
+    supports_ttl: bool  # the store deletes expired tokens by itself
+
+    # users
+    def add_user(self, user: User):
+        ...
+
+    def add_users(self, users, batch_size=500, ordered=False, executor=None, progress=None) -> dict:
+        ...
+
+    def get_user_by_username(self, username: str) -> User | None:
+        ...
+
+    def authenticate_user(self, username: str, password: str) -> User | None:
+        ...
+
+    def delete_all_users(self):
+        ...
+
+    # tokens
+    def insert_token(self, doc: dict):
+        ...
+
+    def find_token(self, signature: str) -> dict | None:
+        ...
+
+    def user_tokens(self, username: str) -> list[dict]:
+        ...
+
+    def delete_tokens(self, signatures: list[str]):
+        ...
+
+    def delete_user_tokens(self, username: str):
+        ...
+
+    def delete_expired(self, now: datetime) -> int:
+        ...
+
+    def token_count(self) -> int:
+        ...
+
+    # revocations of stateless tokens
+    def insert_revocation(self, doc: dict):
+        ...
+
+    def revocations_since(self, since: datetime | None) -> list[dict]:
+        ...
+
+    # leaderboard scores
+    def save_scores(self, scores: dict[str, int]):
+        ...
+
+    def load_scores(self) -> dict[str, int]:
+        ...
+
+    def close(self):
+        ...
@@ -0,0 +1,317 @@
+# src/common/users/auth_service.py
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from src.common.log import get_logger
+from src.common.users import User, Credentials, Token, Role, UserStore
+from src.common.users.store import utcnow, utc_timestamp
+
+log = get_logger("auth")
+
+STATELESS_PREFIX = "v1."
+
+
+def _compute_sha256_hash(input: str) -> str:
+    sha256 = hashlib.sha256()
+    sha256.update(input.encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class RevocationSet:
+    """
+    Revoked stateless tokens, kept in memory and replicated from the store's
+    revocations so every server sees logouts and bans.
+
+    Two kinds of entries: a token id (jti) revoked until the token expires, and
+    a username whose tokens issued before a given time are all revoked. refresh()
+    pulls entries created since the last pull; start() does that every
+    `interval` seconds in a daemon thread, so validation itself never waits on
+    the database. Entries for expired tokens are dropped on refresh.
+
+    "created" is stamped by whichever server wrote the entry, so an entry can
+    land behind one already seen (clock skew, or a slow insert). Each pull
+    therefore re-reads the last `window` seconds, and every `full_reload`
+    seconds everything is read again; applying an entry twice is harmless.
+    """
+
+    def __init__(self, store, interval=5.0, window=60.0, full_reload=300.0):
+        self.store = store
+        self.interval = interval
+        self.window = timedelta(seconds=window)
+        self.full_reload = full_reload
+        self.token_ids = {}  # { jti: expiration timestamp }
+        self.users = {}  # { username: revoked-before timestamp }
+        self._since = None
+        self._last_full = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, doc):
+        """ Apply one revocation document locally. """
+        if doc.get("jti"):
+            self.token_ids[doc["jti"]] = utc_timestamp(doc["expiration"])
+        elif doc.get("username"):
+            revoked_before = utc_timestamp(doc["revoked_before"])
+            self.users[doc["username"]] = max(self.users.get(doc["username"], 0), revoked_before)
+
+    def is_revoked(self, jti, username, issued_at) -> bool:
+        return jti in self.token_ids or issued_at <= self.users.get(username, -1)
+
+    def refresh(self, full=False):
+        now = time.time()
+        if full or self._since is None or time.monotonic() - self._last_full >= self.full_reload:
+            since, self._last_full = None, time.monotonic()
+        else:
+            since = self._since - self.window
+        for doc in self.store.revocations_since(since):
+            self.add(doc)
+            if self._since is None or doc["created"] > self._since:
+                self._since = doc["created"]
+        if any(expiration < now for expiration in self.token_ids.values()):
+            self.token_ids = {jti: exp for jti, exp in self.token_ids.items() if exp >= now}
+
+    def start(self):
+        self.refresh()
+        self._thread = threading.Thread(target=self._loop, name="revocations", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                log.warning("Revocation refresh failed", error=e)
+
+    def stop(self):
+        self._stop.set()
+
+
+class AuthService:
+    """
+    Issues and validates login tokens on top of any UserStore.
+
+    By default a token is an opaque signature kept in the store and looked up
+    on every validation. With stateless=True a token is self-contained,
+    "v1.<payload>.<hmac>", where the payload carries the username, role, issue
+    and expiry times and a token id, signed with HMAC-SHA256. Validation is
+    then pure CPU plus a check against the in-memory RevocationSet; nothing is
+    stored at login. All servers must share the secret (argument or
+    MINDROLL_TOKEN_SECRET), and there is no default: the payload carries the
+    role, so a known key would let anyone sign an ADMIN token.
+
+    Stored tokens are bounded: each user keeps at most `max_tokens_per_user`
+    (the oldest are evicted at login), and expired ones are removed either by
+    the store itself (Mongo's TTL index) or by a sweeper thread every
+    `sweep_interval` seconds, which defaults to 60 for stores without TTL.
+    With `metrics`, token lookups are timed as "auth.token_lookup". All token
+    and revocation times are naive UTC (store.utcnow()), which is what Mongo's
+    TTL index expects.
+    """
+
+    def __init__(self, store: UserStore, secret=None, debug: bool = True,
+                 stateless: bool = False, revocation_refresh: float = 5.0,
+                 max_tokens_per_user: int | None = 5, sweep_interval: float | None = None, metrics=None):
+        self._db = store
+        self._debug = debug
+        secret = secret or os.environ.get("MINDROLL_TOKEN_SECRET")
+        if stateless and not secret:
+            raise ValueError("Stateless tokens need a secret: pass secret= or set MINDROLL_TOKEN_SECRET")
+        self._secret = secret or "mindroll-secret"
+        self._hmac_key = self._secret.encode("utf-8")
+        self.stateless = stateless
+        self.max_tokens_per_user = max_tokens_per_user
+        self.metrics = metrics
+
+        self.revocations = None
+        if stateless:
+            self.revocations = RevocationSet(store, interval=revocation_refresh)
+            self.revocations.start()
+
+        self._stop_sweeper = threading.Event()
+        if sweep_interval is None and not getattr(store, "supports_ttl", False):
+            sweep_interval = 60.0
+        if sweep_interval:
+            threading.Thread(target=self._sweep_loop, args=(sweep_interval,), name="token-sweeper",
+                             daemon=True).start()
+
+        if self._debug:
+            log.debug("[AuthService] Initialized", stateless=stateless)
+
+    def authenticate(self, credentials: Credentials, duration: timedelta = None) -> Token:
+        if duration is None:
+            duration = timedelta(hours=1)
+
+        user = self._db.authenticate_user(credentials.id, credentials.password)
+        if user is None:
+            raise ValueError("Invalid credentials")
+
+        now = utcnow()
+        expiration = now + duration
+        # Mongo keeps milliseconds, and the stored signature covers the exact expiration
+        expiration = expiration.replace(microsecond=expiration.microsecond // 1000 * 1000)
+        if self.stateless:
+            token_obj = Token(user=user, expiration=expiration, signature=self._encode_stateless(user, expiration))
+        else:
+            signature = _compute_sha256_hash(f"{user.username}{expiration}{self._secret}")
+            token_obj = Token(user=user, expiration=expiration, signature=signature)
+
+            self._db.insert_token({
+                "signature": token_obj.signature,
+                "username": user.username,
+                "expiration": token_obj.expiration,
+                "created": now,
+            })
+            self._enforce_token_cap(user.username)
+
+        if self._debug:
+            log.debug("[AuthService] Issued token", username=user.username, expiration=expiration)
+
+        return token_obj
+
+    def validate_token(self, token: Token) -> bool:
+        if token.signature.startswith(STATELESS_PREFIX):
+            return self.validate_token_by_str(token.signature) is not None
+        return token.expiration > utcnow() and self.__validate_signature(token)
+
+    def validate_token_by_str(self, token_str: str) -> Token | None:
+        if self.stateless:
+            return self._decode_stateless(token_str)
+
+        start = time.perf_counter()
+        token_doc = self._db.find_token(token_str)
+        if self.metrics is not None:
+            self.metrics.observe_timing("auth.token_lookup", time.perf_counter() - start)
+        if not token_doc:
+            return None
+
+        if token_doc["expiration"] <= utcnow():
+            return None
+
+        user = self._db.get_user_by_username(token_doc["username"])  # usually a cache hit
+        if user is None:
+            return None
+        token_obj = Token(user=user, expiration=token_doc["expiration"], signature=token_doc["signature"])
+
+        if not self.__validate_signature(token_obj):
+            return None
+        return token_obj
+
+    def revoke(self, token_str: str) -> bool:
+        """ Log a token out. Returns False if it was not a valid token. """
+        token_obj = self.validate_token_by_str(token_str)
+        if token_obj is None:
+            return False
+        if self.stateless:
+            payload = self._payload(token_str)
+            doc = {"jti": payload["j"], "username": payload["u"],
+                   "expiration": token_obj.expiration, "created": utcnow()}
+            self._db.insert_revocation(doc)
+            self.revocations.add(doc)  # effective here at once, elsewhere after the next refresh
+        else:
+            self._db.delete_tokens([token_str])
+        if self._debug:
+            log.debug("[AuthService] Revoked token", username=token_obj.user.username)
+        return True
+
+    def revoke_user(self, username: str):
+        """ Ban: every token issued to `username` until now stops validating. """
+        now = utcnow()
+        if self.stateless:
+            doc = {"username": username, "revoked_before": now, "created": now}
+            self._db.insert_revocation(doc)
+            self.revocations.add(doc)
+        else:
+            self._db.delete_user_tokens(username)
+
+    # ---------------------- Token lifecycle ----------------------
+    def _enforce_token_cap(self, username: str):
+        """ Evict the user's oldest tokens beyond max_tokens_per_user. """
+        if not self.max_tokens_per_user:
+            return
+        docs = self._db.user_tokens(username)
+        if len(docs) <= self.max_tokens_per_user:
+            return
+        docs.sort(key=lambda doc: doc.get("created") or datetime.min)
+        evicted = [doc["signature"] for doc in docs[:len(docs) - self.max_tokens_per_user]]
+        self._db.delete_tokens(evicted)
+        if self.metrics is not None:
+            self.metrics.inc("tokens_evicted", len(evicted))
+        if self._debug:
+            log.debug("[AuthService] Evicted old tokens", username=username, count=len(evicted))
+
+    def sweep_expired(self) -> int:
+        """ Delete expired tokens and revocations now; returns how many tokens went. """
+        swept = self._db.delete_expired(utcnow())
+        if self.metrics is not None and swept:
+            self.metrics.inc("tokens_swept", swept)
+        return swept
+
+    def token_count(self) -> int:
+        """ Stored tokens (an estimate on Mongo). """
+        return self._db.token_count()
+
+    def _sweep_loop(self, interval):
+        while not self._stop_sweeper.wait(interval):
+            try:
+                swept = self.sweep_expired()
+                (log.info if swept else log.debug)("Token sweep", swept=swept, tokens=self.token_count())
+            except Exception as e:
+                log.warning("Token sweep failed", error=e)
+
+    def stop(self):
+        self._stop_sweeper.set()
+        if self.revocations:
+            self.revocations.stop()
+
+    # ---------------------- Stateless tokens ----------------------
+    def _sign(self, body: str) -> str:
+        return _b64encode(hmac.new(self._hmac_key, body.encode("ascii"), hashlib.sha256).digest())
+
+    def _encode_stateless(self, user: User, expiration: datetime) -> str:
+        payload = {"u": user.username, "n": user.name, "r": user.role.name,
+                   "i": time.time(), "e": utc_timestamp(expiration), "j": uuid.uuid4().hex}
+        body = STATELESS_PREFIX + _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        return f"{body}.{self._sign(body)}"
+
+    def _payload(self, token_str: str) -> dict | None:
+        """ The verified payload of a stateless token, or None if malformed or forged. """
+        if not isinstance(token_str, str) or not token_str.startswith(STATELESS_PREFIX):
+            return None
+        body, _, signature = token_str.rpartition(".")
+        try:
+            if not hmac.compare_digest(signature.encode("ascii"), self._sign(body).encode("ascii")):
+                return None
+            return json.loads(_b64decode(body[len(STATELESS_PREFIX):]))
+        except ValueError:  # also UnicodeError and binascii.Error
+            return None
+
+    def _decode_stateless(self, token_str: str) -> Token | None:
+        payload = self._payload(token_str)
+        if payload is None:
+            return None
+        if payload["e"] <= time.time():
+            return None
+        if self.revocations.is_revoked(payload["j"], payload["u"], payload["i"]):
+            return None
+        user = User(username=payload["u"], name=payload.get("n"), role=Role[payload["r"]])
+        expiration = datetime.fromtimestamp(payload["e"], timezone.utc).replace(tzinfo=None)
+        return Token(user=user, expiration=expiration, signature=token_str)
+
+    def __validate_signature(self, token: Token) -> bool:
+        expected = _compute_sha256_hash(f"{token.user.username}{token.expiration}{self._secret}")
+        return token.signature == expected
@@ -0,0 +1,104 @@
+# src/common/users/bulk_import.py
+"""
+Import users from a CSV or JSONL file straight into the user store (MongoDB,
+or a SQLite file with --backend sqlite).
+
+    python -m src.common.users.bulk_import users.csv
+    python -m src.common.users.bulk_import users.jsonl --ordered --batch-size 1000
+
+CSV needs a header with at least "username" and "password" ("name" and "role"
+are optional); JSONL has one object per line with the same keys. Passwords are
+bcrypt-hashed on all cores, users are written with insert_many and existing
+usernames are reported as duplicates (--ordered stops at the first one).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from src.common.log import get_logger
+from src.common.users import User, Role
+
+log = get_logger("bulk_import")
+
+
+def user_from_record(record: dict) -> User:
+    role = (record.get("role") or "USER").strip().upper()
+    if role not in Role.__members__:
+        raise ValueError(f"Unknown role: {role}")
+    return User(
+        username=(record.get("username") or "").strip(),
+        name=record.get("name") or record.get("username"),
+        role=Role[role],
+        password=record.get("password") or None,
+    )
+
+
+def read_users(path, fmt=None, errors=None):
+    """
+    Yield Users from a .csv or .jsonl file, one at a time.
+    Bad rows are logged and skipped; their line numbers are appended to `errors` if given.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            rows = ((reader.line_num, row) for row in reader)
+        else:
+            rows = ((line_num, line) for line_num, line in enumerate(f, 1) if line.strip())
+        for line_num, row in rows:
+            try:
+                record = row if fmt == "csv" else json.loads(row)
+                user = user_from_record(record)
+                if not user.password:
+                    raise ValueError("Password is required")
+                yield user
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                log.warning("Skipping bad row", path=path, line=line_num, error=e)
+                if errors is not None:
+                    errors.append(line_num)
+
+
+def print_progress(summary):
+    done = summary["inserted"] + len(summary["duplicates"]) + summary["failed"]
+    print(f"\r{done} processed, {summary['inserted']} inserted, {len(summary['duplicates'])} duplicates, "
+          f"{summary['users_per_sec']:.1f} users/s", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None, help="default: from the file extension")
+    parser.add_argument("--backend", choices=["sqlite", "mongo"], default="mongo")
+    parser.add_argument("--uri", default="mongodb://localhost:27017", help="for --backend mongo")
+    parser.add_argument("--db", default="mindroll", help="Mongo database name")
+    parser.add_argument("--db-path", default="mindroll.db", help="database file for --backend sqlite")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--ordered", action="store_true", help="stop at the first duplicate username")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    from src.common.users.store import create_store
+    if args.backend == "sqlite":
+        user_db = create_store("sqlite", path=args.db_path)
+    else:
+        user_db = create_store("mongo", uri=args.uri, db_name=args.db)
+    bad_rows = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        summary = user_db.add_users(read_users(args.path, args.format, bad_rows), batch_size=args.batch_size,
+                                    ordered=args.ordered, executor=executor, progress=print_progress)
+    print(file=sys.stderr)
+    print(f"Imported {summary['inserted']} users in {summary['elapsed']:.1f}s "
+          f"({summary['users_per_sec']:.1f} users/s); {len(summary['duplicates'])} duplicates, "
+          f"{summary['failed'] + len(bad_rows)} failed" + (", stopped at first duplicate" if summary["stopped"] else ""))
+    if summary["duplicates"]:
+        print("Duplicates: " + ", ".join(summary["duplicates"][:20]) +
+              (" ..." if len(summary["duplicates"]) > 20 else ""))
+    return 0 if not (summary["failed"] or bad_rows or (args.ordered and summary["duplicates"])) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
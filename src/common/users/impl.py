@@ -1,4 +1,5 @@
 from ..users import *
+from ..log import get_logger
 import hashlib
 from datetime import datetime, timedelta
 
@@ -7,13 +8,15 @@ def _compute_sha256_hash(input: str) -> str:
     sha256_hash.update(input.encode('utf-8'))
     return sha256_hash.hexdigest()
 
+log = get_logger("users")
+
 class _Debuggable:
     def __init__(self, debug: bool = True):
         self.__debug = debug
     
-    def _log(self, *args, **kwargs):
+    def _log(self, message, **fields):
         if self.__debug:
-            print(*args, **kwargs)
+            log.debug(message, **fields)
 
 class InMemoryUserDatabase(UserDatabase, _Debuggable):
     def __init__(self, debug: bool = True):
@@ -37,7 +40,7 @@ class InMemoryUserDatabase(UserDatabase, _Debuggable):
         self.__users[user.username] = user
 
         # 5) 记录日志
-        self._log(f"Add: {user}")
+        self._log("Add user", username=user.username)
 
 
     def __get_user(self, id: str) -> User:
@@ -47,7 +50,7 @@ class InMemoryUserDatabase(UserDatabase, _Debuggable):
     
     def get_user(self, id: str) -> User:
         result = self.__get_user(id).copy(password=None)
-        self._log(f"Get user with ID {id}: {result}")
+        self._log("Get user", id=id)
         return result
 
     def check_password(self, credentials: Credentials) -> bool:
@@ -56,7 +59,7 @@ class InMemoryUserDatabase(UserDatabase, _Debuggable):
             result = user.password == _compute_sha256_hash(credentials.password)
         except KeyError:
             result = False
-        self._log(f"Checking {credentials}: {'correct' if result else 'incorrect'}")
+        self._log("Checking credentials", id=credentials.id, result='correct' if result else 'incorrect')
         return result
     
 
@@ -71,7 +74,7 @@ class InMemoryAuthenticationService(AuthenticationService, _Debuggable):
             import uuid
             secret = str(uuid.uuid4())
         self.__secret = secret
-        self._log(f"Authentication service initialized with secret {secret}")
+        self._log("Authentication service initialized")
 
         # ★ 新增一个字典用于存储发放的 Token：key=token.signature, value=Token
         self.__tokens = {}
@@ -85,7 +88,7 @@ class InMemoryAuthenticationService(AuthenticationService, _Debuggable):
             # signature 等于对 (user + expiration + secret) 做 sha256
             signature = _compute_sha256_hash(f"{user}{expiration}{self.__secret}")
             result = Token(user, expiration, signature)
-            self._log(f"Generate token for user {credentials.id}: {result}")
+            self._log("Generate token", username=credentials.id, expiration=expiration)
 
             # ★ 将生成的 Token 存储起来，key=signature
             self.__tokens[result.signature] = result
@@ -101,7 +104,7 @@ class InMemoryAuthenticationService(AuthenticationService, _Debuggable):
         旧方法：如果 token 在过期时间内，且签名校验通过，就认为 valid
         """
         result = token.expiration > datetime.now() and self.__validate_token_signature(token)
-        self._log(f"{token} is " + ('valid' if result else 'invalid'))
+        self._log("Validate token", username=token.user.username, result='valid' if result else 'invalid')
         return result
 
     def validate_token_by_str(self, token_str: str) -> Token | None:
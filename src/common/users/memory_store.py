@@ -0,0 +1,164 @@
+# src/common/users/memory_store.py
+
+import threading
+
+from src.common.users import User
+from src.common.users.store import hash_password, check_password, bulk_add_users, user_doc, user_from_doc
+
+
+class _Shard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = {}
+
+
+class InMemoryUserStore:
+    """
+    The in-memory UserStore: nothing persisted, nothing to connect to.
+
+    Users and tokens live in `shards` dicts each, picked by hashing the key,
+    every shard with its own lock, so concurrent logins and validations only
+    contend when they land on the same shard. Token lookups by user go through
+    a per-user index kept in the user's shard. Expired tokens are removed by
+    AuthService's sweeper (supports_ttl is False).
+    """
+
+    supports_ttl = False
+
+    def __init__(self, shards=16):
+        self._user_shards = [_Shard() for _ in range(shards)]
+        self._token_shards = [_Shard() for _ in range(shards)]
+        self._user_tokens = [_Shard() for _ in range(shards)]  # { username: { signature: created } }
+        self._revocations = []
+        self._revocation_lock = threading.Lock()
+        self._scores = {}
+
+    def _shard(self, shards, key) -> _Shard:
+        return shards[hash(key) % len(shards)]
+
+    # ---------------------- Users ----------------------
+    def add_user(self, user: User):
+        shard = self._shard(self._user_shards, user.username)
+        if user.username in shard.items:  # before hashing; re-checked under the lock
+            raise ValueError("Username already exists")
+        doc = user_doc(user, hash_password(user.password))
+        with shard.lock:
+            if user.username in shard.items:
+                raise ValueError("Username already exists")
+            shard.items[user.username] = doc
+
+    def add_users(self, users, batch_size=500, ordered=False, executor=None, progress=None) -> dict:
+        def existing(usernames):
+            return {name for name in usernames if name in self._shard(self._user_shards, name).items}
+
+        def insert_many(docs, ordered):
+            inserted, duplicates = 0, []
+            for index, doc in enumerate(docs):
+                shard = self._shard(self._user_shards, doc["username"])
+                with shard.lock:
+                    if doc["username"] in shard.items:
+                        duplicates.append(index)
+                        if ordered:
+                            break
+                        continue
+                    shard.items[doc["username"]] = doc
+                inserted += 1
+            return inserted, duplicates, 0
+
+        return bulk_add_users(users, existing, insert_many, batch_size, ordered, executor, progress)
+
+    def get_user_by_username(self, username: str) -> User | None:
+        doc = self._shard(self._user_shards, username).items.get(username)
+        return user_from_doc(doc) if doc else None
+
+    def authenticate_user(self, username: str, password: str) -> User | None:
+        doc = self._shard(self._user_shards, username).items.get(username)
+        if not doc or not check_password(password, doc["password"]):
+            return None
+        return user_from_doc(doc)
+
+    def validate_credentials(self, username: str, password: str) -> bool:
+        return self.authenticate_user(username, password) is not None
+
+    def delete_all_users(self):
+        for shard in self._user_shards:
+            with shard.lock:
+                shard.items.clear()
+
+    # ---------------------- Tokens ----------------------
+    def insert_token(self, doc: dict):
+        shard = self._shard(self._token_shards, doc["signature"])
+        with shard.lock:
+            shard.items[doc["signature"]] = dict(doc)
+        index = self._shard(self._user_tokens, doc["username"])
+        with index.lock:
+            index.items.setdefault(doc["username"], {})[doc["signature"]] = doc.get("created")
+
+    def find_token(self, signature: str) -> dict | None:
+        doc = self._shard(self._token_shards, signature).items.get(signature)
+        return dict(doc) if doc else None
+
+    def user_tokens(self, username: str) -> list[dict]:
+        index = self._shard(self._user_tokens, username)
+        with index.lock:
+            tokens = dict(index.items.get(username, {}))
+        return [{"signature": signature, "created": created} for signature, created in tokens.items()]
+
+    def delete_tokens(self, signatures: list[str]):
+        for signature in signatures:
+            shard = self._shard(self._token_shards, signature)
+            with shard.lock:
+                doc = shard.items.pop(signature, None)
+            if doc is not None:
+                self._unindex(doc["username"], [signature])
+
+    def delete_user_tokens(self, username: str):
+        self.delete_tokens([token["signature"] for token in self.user_tokens(username)])
+
+    def _unindex(self, username, signatures):
+        index = self._shard(self._user_tokens, username)
+        with index.lock:
+            tokens = index.items.get(username)
+            if tokens is None:
+                return
+            for signature in signatures:
+                tokens.pop(signature, None)
+            if not tokens:
+                del index.items[username]
+
+    def delete_expired(self, now) -> int:
+        swept = 0
+        for shard in self._token_shards:
+            with shard.lock:
+                expired = [doc for doc in shard.items.values() if doc["expiration"] < now]
+                for doc in expired:
+                    del shard.items[doc["signature"]]
+            for doc in expired:
+                self._unindex(doc["username"], [doc["signature"]])
+            swept += len(expired)
+        with self._revocation_lock:
+            self._revocations = [doc for doc in self._revocations
+                                 if not doc.get("expiration") or doc["expiration"] >= now]
+        return swept
+
+    def token_count(self) -> int:
+        return sum(len(shard.items) for shard in self._token_shards)
+
+    # ---------------------- Revocations ----------------------
+    def insert_revocation(self, doc: dict):
+        with self._revocation_lock:
+            self._revocations.append(dict(doc))
+
+    def revocations_since(self, since) -> list[dict]:
+        with self._revocation_lock:
+            return [dict(doc) for doc in self._revocations if since is None or doc["created"] >= since]
+
+    # ---------------------- Scores ----------------------
+    def save_scores(self, scores: dict):
+        self._scores.update(scores)
+
+    def load_scores(self) -> dict:
+        return dict(self._scores)
+
+    def close(self):
+        pass
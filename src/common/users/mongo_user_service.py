@@ -1,51 +1,220 @@
 # src/common/users/mongo_user_service.py
 
-from pymongo import MongoClient
+import threading
+import time
+from collections import OrderedDict
+
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from src.common.users import User, Role
-import bcrypt
+from src.common.users.store import (hash_password, check_password, hash_passwords, bulk_add_users,
+                                    user_doc, user_from_doc as _user_from_doc)
 
-def hash_password(plain_password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(plain_password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
 
-def check_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+# only what a User needs; the bcrypt hash is fetched by authenticate_user() alone
+PROFILE_FIELDS = {"_id": 0, "username": 1, "name": 1, "role": 1}
+LOGIN_FIELDS = {**PROFILE_FIELDS, "password": 1}
+TOKEN_FIELDS = {"_id": 0, "signature": 1, "username": 1, "expiration": 1, "created": 1}
 
 
 class MongoUserService:
-    def __init__(self, uri="mongodb://localhost:27017", db_name="mindroll"):
-        self.client = MongoClient(uri)
+    """
+    The MongoDB UserStore: users, tokens and revocations collections, with a
+    bounded read-through cache of user profiles.
+
+    get_user_by_username() is answered from an LRU of at most `cache_size`
+    users; entries expire after `cache_ttl` seconds so changes made by another
+    process show up eventually, and writes through this service drop the entry
+    at once. Queries project only the fields they use, and the password hash is
+    never cached. Pass `client` to use an existing (or stand-in) MongoClient.
+
+    Nothing talks to the server until the first call, which also creates the
+    indexes, including the TTL index that lets Mongo drop expired tokens.
+    """
+
+    supports_ttl = True
+
+    def __init__(self, uri="mongodb://localhost:27017", db_name="mindroll",
+                 cache_size=1024, cache_ttl=60.0, client=None):
+        self.client = client if client is not None else MongoClient(uri)  # connects in the background
         self.db = self.client[db_name]
         self.users = self.db["users"]
-        self.users.create_index("username", unique=True)
+        self.tokens = self.db["tokens"]
+        self.revocations = self.db["revocations"]
+        self.scores = self.db["scores"]
+        self._indexes_ready = False
+        self._index_lock = threading.Lock()
+
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()  # { username: (User, expires_at) }
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _ensure_indexes(self):
+        if self._indexes_ready:
+            return
+        with self._index_lock:
+            if self._indexes_ready:
+                return
+            self.users.create_index("username", unique=True)
+            self.tokens.create_index("signature", unique=True)
+            self.tokens.create_index("expiration", expireAfterSeconds=0)
+            self.tokens.create_index([("username", 1), ("created", 1)])
+            self.revocations.create_index("created")
+            self.revocations.create_index("expiration", expireAfterSeconds=0)  # bans have none, and stay
+            self.scores.create_index("username", unique=True)
+            self._indexes_ready = True
+
+    # ---------------------- Cache ----------------------
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
 
+    def _cached(self, username: str) -> User | None:
+        with self._cache_lock:
+            entry = self._cache.get(username)
+            if entry is not None and entry[1] > time.monotonic():
+                self._cache.move_to_end(username)
+                self.cache_hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._cache[username]
+            self.cache_misses += 1
+            return None
+
+    def _remember(self, user: User):
+        with self._cache_lock:
+            self._cache[user.username] = (user, time.monotonic() + self.cache_ttl)
+            self._cache.move_to_end(user.username)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def invalidate(self, username: str = None):
+        """ Drop one cached user, or all of them. """
+        with self._cache_lock:
+            if username is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(username, None)
+
+    # ---------------------- Users ----------------------
     def add_user(self, user: User):
-        doc = {
-            "username": user.username,
-            "name": user.name,
-            "password": hash_password(user.password),
-            "role": user.role.name,
-        }
-        self.users.insert_one(doc)
+        """ Raises ValueError if the username is taken; that is checked before paying for bcrypt. """
+        self._ensure_indexes()
+        if user.username in self._cache or self.users.find_one({"username": user.username}, {"_id": 1}):
+            raise ValueError("Username already exists")
+        self.invalidate(user.username)
+        try:  # the unique index still catches a concurrent registration
+            self.users.insert_one(user_doc(user, hash_password(user.password)))
+        except DuplicateKeyError:
+            raise ValueError("Username already exists")
+
+    def add_users(self, users, batch_size=500, ordered=False, executor=None, progress=None) -> dict:
+        """
+        Insert many users with insert_many, `batch_size` at a time; `users` may be any iterable.
+        See store.bulk_add_users() for duplicates, ordering and the returned summary.
+        """
+        self._ensure_indexes()
+
+        def existing(usernames):
+            return {doc["username"] for doc in self.users.find(
+                {"username": {"$in": usernames}}, {"_id": 0, "username": 1})}
+
+        def insert_many(docs, ordered):
+            for doc in docs:
+                self.invalidate(doc["username"])
+            try:
+                return len(self.users.insert_many(docs, ordered=ordered).inserted_ids), [], 0
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                duplicates = [error["index"] for error in errors if error.get("code") == 11000]
+                return e.details.get("nInserted", 0), duplicates, len(errors) - len(duplicates)
+
+        return bulk_add_users(users, existing, insert_many, batch_size, ordered, executor, progress)
 
     def get_user_by_username(self, username: str) -> User | None:
-        doc = self.users.find_one({"username": username})
+        """ Profile only (password=None). """
+        user = self._cached(username)
+        if user is not None:
+            return user
+        self._ensure_indexes()
+        doc = self.users.find_one({"username": username}, PROFILE_FIELDS)
         if not doc:
             return None
-        return User(
-            username=doc["username"],
-            name=doc.get("name"),
-            role=Role[doc.get("role", "USER")],
-            password=doc.get("password")
-        )
+        user = _user_from_doc(doc)
+        self._remember(user)
+        return user
+
+    def authenticate_user(self, username: str, password: str) -> User | None:
+        """ Check the password and return the profile, in one query; None if the credentials are wrong. """
+        self._ensure_indexes()
+        doc = self.users.find_one({"username": username}, LOGIN_FIELDS)
+        if not doc or not check_password(password, doc.get("password")):
+            return None
+        user = _user_from_doc(doc)
+        self._remember(user)
+        return user
 
     def validate_credentials(self, username: str, password: str) -> bool:
-        user = self.users.find_one({"username": username})
-        if not user:
-            return False
-        hashed = user.get("password")
-        return check_password(password, hashed)
+        return self.authenticate_user(username, password) is not None
 
     def delete_all_users(self):
         self.users.delete_many({})
+        self.invalidate()
+
+    # ---------------------- Tokens ----------------------
+    def insert_token(self, doc: dict):
+        self._ensure_indexes()
+        self.tokens.insert_one(dict(doc))
+
+    def find_token(self, signature: str) -> dict | None:
+        self._ensure_indexes()
+        return self.tokens.find_one({"signature": signature}, TOKEN_FIELDS)
+
+    def user_tokens(self, username: str) -> list[dict]:
+        self._ensure_indexes()
+        return list(self.tokens.find({"username": username}, {"_id": 0, "signature": 1, "created": 1}))
+
+    def delete_tokens(self, signatures: list[str]):
+        self.tokens.delete_many({"signature": {"$in": list(signatures)}})
+
+    def delete_user_tokens(self, username: str):
+        self.tokens.delete_many({"username": username})
+
+    def delete_expired(self, now) -> int:
+        """ What the TTL monitor does anyway, for an immediate sweep. """
+        swept = self.tokens.delete_many({"expiration": {"$lt": now}}).deleted_count
+        self.revocations.delete_many({"expiration": {"$lt": now}})
+        return swept
+
+    def token_count(self) -> int:
+        """ Mongo's cheap collection-metadata estimate. """
+        return self.tokens.estimated_document_count()
+
+    # ---------------------- Revocations ----------------------
+    def insert_revocation(self, doc: dict):
+        self._ensure_indexes()
+        self.revocations.insert_one(dict(doc))
+
+    def revocations_since(self, since) -> list[dict]:
+        self._ensure_indexes()
+        query = {"created": {"$gte": since}} if since else {}
+        return list(self.revocations.find(query, {"_id": 0}))
+
+    # ---------------------- Scores ----------------------
+    def save_scores(self, scores: dict):
+        """ One unordered bulk_write of upserts for the whole batch. """
+        self._ensure_indexes()
+        if scores:
+            self.scores.bulk_write([UpdateOne({"username": username}, {"$set": {"score": score}}, upsert=True)
+                                    for username, score in scores.items()], ordered=False)
+
+    def load_scores(self) -> dict:
+        self._ensure_indexes()
+        return {doc["username"]: doc["score"] for doc in self.scores.find({}, {"_id": 0, "username": 1, "score": 1})}
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,233 @@
+# src/common/users/sqlite_store.py
+
+import sqlite3
+import threading
+from datetime import datetime
+
+from src.common.users import User
+from src.common.users.store import hash_password, check_password, bulk_add_users, user_doc, user_from_doc, utcnow
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    name     TEXT,
+    password TEXT NOT NULL,
+    role     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    signature  TEXT PRIMARY KEY,
+    username   TEXT NOT NULL,
+    expiration TEXT NOT NULL,
+    created    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tokens_by_user ON tokens (username, created);
+CREATE INDEX IF NOT EXISTS tokens_by_expiration ON tokens (expiration);
+CREATE TABLE IF NOT EXISTS revocations (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    jti            TEXT,
+    username       TEXT,
+    expiration     TEXT,
+    revoked_before TEXT,
+    created        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS revocations_by_created ON revocations (created);
+CREATE TABLE IF NOT EXISTS scores (
+    username TEXT PRIMARY KEY,
+    score    INTEGER NOT NULL
+);
+"""
+
+# fixed statement texts, so each thread's connection reuses its prepared statements
+INSERT_USER = "INSERT INTO users (username, name, password, role) VALUES (?, ?, ?, ?)"
+USER_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+SELECT_USER = "SELECT username, name, role, password FROM users WHERE username = ?"
+INSERT_TOKEN = "INSERT OR REPLACE INTO tokens (signature, username, expiration, created) VALUES (?, ?, ?, ?)"
+SELECT_TOKEN = "SELECT signature, username, expiration, created FROM tokens WHERE signature = ?"
+SELECT_USER_TOKENS = "SELECT signature, created FROM tokens WHERE username = ?"
+DELETE_TOKEN = "DELETE FROM tokens WHERE signature = ?"
+UPSERT_SCORE = "INSERT INTO scores (username, score) VALUES (?, ?) ON CONFLICT(username) DO UPDATE SET score = excluded.score"
+INSERT_REVOCATION = ("INSERT INTO revocations (jti, username, expiration, revoked_before, created) "
+                     "VALUES (?, ?, ?, ?, ?)")
+
+
+def _dt(value):
+    """ datetime -> sortable text with fixed microseconds (token signatures depend on the exact value). """
+    return value.isoformat(timespec="microseconds") if value is not None else None
+
+
+def _parse_dt(value):
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+class SQLiteUserStore:
+    """
+    The SQLite UserStore: one database file, safe to share between threads
+    and processes.
+
+    The database runs in WAL mode with synchronous=NORMAL, so readers never
+    block the writer and a commit costs no fsync of the main file. Every
+    thread gets its own connection; statements are fixed strings, so
+    sqlite3's per-connection statement cache keeps them prepared. Times are
+    stored as ISO text, which sorts chronologically. Expired tokens are
+    removed by AuthService's sweeper (supports_ttl is False).
+    """
+
+    supports_ttl = False
+
+    def __init__(self, path="mindroll.db", timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False,
+                                   isolation_level=None, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    # ---------------------- Users ----------------------
+    def add_user(self, user: User):
+        if self._conn().execute(USER_EXISTS, (user.username,)).fetchone():  # before hashing
+            raise ValueError("Username already exists")
+        doc = user_doc(user, hash_password(user.password))
+        try:
+            self._conn().execute(INSERT_USER, (doc["username"], doc["name"], doc["password"], doc["role"]))
+        except sqlite3.IntegrityError:
+            raise ValueError("Username already exists")
+
+    def add_users(self, users, batch_size=500, ordered=False, executor=None, progress=None) -> dict:
+        def existing(usernames):
+            placeholders = ",".join("?" * len(usernames))
+            rows = self._conn().execute(f"SELECT username FROM users WHERE username IN ({placeholders})",
+                                        usernames)
+            return {row[0] for row in rows}
+
+        def insert_many(docs, ordered):
+            conn = self._conn()
+            inserted, duplicates = 0, []
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for index, doc in enumerate(docs):
+                    try:
+                        conn.execute(INSERT_USER, (doc["username"], doc["name"], doc["password"], doc["role"]))
+                        inserted += 1
+                    except sqlite3.IntegrityError:
+                        duplicates.append(index)
+                        if ordered:
+                            break
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return inserted, duplicates, 0
+
+        return bulk_add_users(users, existing, insert_many, batch_size, ordered, executor, progress)
+
+    def _user_row(self, username):
+        row = self._conn().execute(SELECT_USER, (username,)).fetchone()
+        if row is None:
+            return None
+        return {"username": row[0], "name": row[1], "role": row[2], "password": row[3]}
+
+    def get_user_by_username(self, username: str) -> User | None:
+        doc = self._user_row(username)
+        return user_from_doc(doc) if doc else None
+
+    def authenticate_user(self, username: str, password: str) -> User | None:
+        doc = self._user_row(username)
+        if not doc or not check_password(password, doc["password"]):
+            return None
+        return user_from_doc(doc)
+
+    def validate_credentials(self, username: str, password: str) -> bool:
+        return self.authenticate_user(username, password) is not None
+
+    def delete_all_users(self):
+        self._conn().execute("DELETE FROM users")
+
+    # ---------------------- Tokens ----------------------
+    def insert_token(self, doc: dict):
+        self._conn().execute(INSERT_TOKEN, (doc["signature"], doc["username"],
+                                            _dt(doc["expiration"]), _dt(doc.get("created") or utcnow())))
+
+    def find_token(self, signature: str) -> dict | None:
+        row = self._conn().execute(SELECT_TOKEN, (signature,)).fetchone()
+        if row is None:
+            return None
+        return {"signature": row[0], "username": row[1], "expiration": _parse_dt(row[2]), "created": _parse_dt(row[3])}
+
+    def user_tokens(self, username: str) -> list[dict]:
+        rows = self._conn().execute(SELECT_USER_TOKENS, (username,))
+        return [{"signature": row[0], "created": _parse_dt(row[1])} for row in rows]
+
+    def delete_tokens(self, signatures: list[str]):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(DELETE_TOKEN, [(signature,) for signature in signatures])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete_user_tokens(self, username: str):
+        self._conn().execute("DELETE FROM tokens WHERE username = ?", (username,))
+
+    def delete_expired(self, now) -> int:
+        conn = self._conn()
+        swept = conn.execute("DELETE FROM tokens WHERE expiration < ?", (_dt(now),)).rowcount
+        conn.execute("DELETE FROM revocations WHERE expiration IS NOT NULL AND expiration < ?", (_dt(now),))
+        return swept
+
+    def token_count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    # ---------------------- Revocations ----------------------
+    def insert_revocation(self, doc: dict):
+        self._conn().execute(INSERT_REVOCATION, (doc.get("jti"), doc.get("username"), _dt(doc.get("expiration")),
+                                                 _dt(doc.get("revoked_before")), _dt(doc["created"])))
+
+    def revocations_since(self, since) -> list[dict]:
+        query = "SELECT jti, username, expiration, revoked_before, created FROM revocations"
+        rows = (self._conn().execute(query + " WHERE created >= ?", (_dt(since),)) if since
+                else self._conn().execute(query))
+        docs = []
+        for jti, username, expiration, revoked_before, created in rows:
+            doc = {"username": username, "created": _parse_dt(created)}
+            if jti:
+                doc.update(jti=jti, expiration=_parse_dt(expiration))
+            else:
+                doc["revoked_before"] = _parse_dt(revoked_before)
+            docs.append(doc)
+        return docs
+
+    # ---------------------- Scores ----------------------
+    def save_scores(self, scores: dict):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(UPSERT_SCORE, scores.items())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def load_scores(self) -> dict:
+        return dict(self._conn().execute("SELECT username, score FROM scores"))
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
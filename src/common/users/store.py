@@ -0,0 +1,128 @@
+# src/common/users/store.py
+"""
+Helpers shared by the UserStore backends (see UserStore in src/common/users)
+and create_store(), which picks one by name:
+
+    memory  InMemoryUserStore   sharded dicts, nothing persisted
+    sqlite  SQLiteUserStore     one file, WAL mode
+    mongo   MongoUserService    MongoDB, connects on first use
+"""
+import itertools
+import time
+from datetime import datetime, timezone
+
+import bcrypt
+
+from src.common.users import User, Role
+
+BACKENDS = ("memory", "sqlite", "mongo")
+
+
+def utcnow() -> datetime:
+    """
+    Naive UTC: what pymongo reads back and what Mongo's TTL monitor assumes for
+    naive datetimes. Token and revocation times all use it.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def utc_timestamp(value: datetime) -> float:
+    """ POSIX timestamp of a naive UTC datetime. """
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def hash_password(plain_password: str) -> str:
+    salt = bcrypt.gensalt()
+    hashed = bcrypt.hashpw(plain_password.encode('utf-8'), salt)
+    return hashed.decode('utf-8')
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def hash_passwords(passwords, executor=None) -> list[str]:
+    """ hash_password() over a list, spread over `executor` (a Thread/ProcessPoolExecutor) if given. """
+    if executor is None:
+        return [hash_password(p) for p in passwords]
+    return list(executor.map(hash_password, passwords, chunksize=8))
+
+
+def user_doc(user: User, password_hash: str) -> dict:
+    return {"username": user.username, "name": user.name, "password": password_hash, "role": user.role.name}
+
+
+def user_from_doc(doc) -> User:
+    """ Profile only; the password hash never leaves the store. """
+    return User(
+        username=doc["username"],
+        name=doc.get("name"),
+        role=Role[doc.get("role") or "USER"],
+    )
+
+
+def bulk_add_users(users, existing, insert_many, batch_size=500, ordered=False, executor=None,
+                   progress=None) -> dict:
+    """
+    The batching behind every store's add_users().
+
+    existing(usernames) -> set of those already stored, checked before hashing
+    so no bcrypt time is spent on them. insert_many(docs, ordered) -> (inserted,
+    [indexes of duplicate docs], failed) writes one batch. ordered=False skips
+    duplicates and carries on; ordered=True stops at the first one.
+    progress(summary) is called after every batch.
+    Returns {"inserted", "duplicates", "failed", "stopped", "elapsed", "users_per_sec"}.
+    """
+    summary = {"inserted": 0, "duplicates": [], "failed": 0, "stopped": False,
+               "elapsed": 0.0, "users_per_sec": 0.0}
+    start = time.perf_counter()
+
+    def update_rate():
+        summary["elapsed"] = time.perf_counter() - start
+        summary["users_per_sec"] = summary["inserted"] / summary["elapsed"] if summary["elapsed"] else 0.0
+
+    users = iter(users)
+    while not summary["stopped"]:
+        batch = list(itertools.islice(users, batch_size))
+        if not batch:
+            break
+
+        found = existing([u.username for u in batch])
+        if found:
+            if ordered:
+                first = next(i for i, u in enumerate(batch) if u.username in found)
+                summary["duplicates"].append(batch[first].username)
+                batch = batch[:first]
+                summary["stopped"] = True
+            else:
+                summary["duplicates"].extend(u.username for u in batch if u.username in found)
+                batch = [u for u in batch if u.username not in found]
+
+        if batch:
+            hashes = hash_passwords([u.password for u in batch], executor)
+            docs = [user_doc(u, h) for u, h in zip(batch, hashes)]
+            # duplicates inside the input itself, or inserted concurrently
+            inserted, duplicate_indexes, failed = insert_many(docs, ordered)
+            summary["inserted"] += inserted
+            summary["duplicates"].extend(docs[i]["username"] for i in duplicate_indexes)
+            summary["failed"] += failed
+            if ordered and (duplicate_indexes or failed):
+                summary["stopped"] = True
+
+        update_rate()
+        if progress:
+            progress(summary)
+    update_rate()
+    return summary
+
+
+def create_store(backend="mongo", **options):
+    """ A UserStore by name; options go to the backend's constructor. """
+    if backend == "memory":
+        from src.common.users.memory_store import InMemoryUserStore
+        return InMemoryUserStore(**options)
+    if backend == "sqlite":
+        from src.common.users.sqlite_store import SQLiteUserStore
+        return SQLiteUserStore(**options)
+    if backend == "mongo":
+        from src.common.users.mongo_user_service import MongoUserService
+        return MongoUserService(**options)
+    raise ValueError(f"Unknown user store backend: {backend} (expected one of {', '.join(BACKENDS)})")
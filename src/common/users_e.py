@@ -6,6 +6,10 @@ import sys
 from enum import Enum
 from datetime import datetime, timedelta, timezone
 
+from src.common.log import get_logger
+
+log = get_logger("users")
+
 
 # Enum for user roles
 class Role(Enum):
@@ -35,8 +39,6 @@ class User:
 
     def check_password(self, password):
         input_hash = hashlib.sha256(password.encode()).hexdigest()
-        print(f"DEBUG: Input password hash: {input_hash}")
-        print(f"DEBUG: Stored password hash: {self.password}")
         return self.password == input_hash
 
     def to_dict(self):
@@ -126,16 +128,14 @@ class UserDatabase:
         user = self.get_user(username)
         
         if user:
-            print(f"DEBUG: Found user {username}, checking password...")
-            print(f"DEBUG: Stored hash: {user.password}")
-            print(f"DEBUG: Input hash: {hashlib.sha256(password.encode()).hexdigest()}")
+            log.debug("Found user, checking password", username=username)
 
             if user.check_password(password):
-                print("✅ Password Matched! Authentication Successful")
+                log.debug("✅ Password Matched! Authentication Successful", username=username)
                 return Token(user)
             else:
-                print("❌ Password Mismatch!")
-        print("DEBUG: Authentication failed (wrong credentials)")
+                log.debug("❌ Password Mismatch!", username=username)
+        log.debug("Authentication failed (wrong credentials)", username=username)
         return None
 
     def update_score(self, username, score_change):
@@ -1,21 +1,26 @@
+import codecs
 import json
 
 
 class Request:
     """ Represents an RPC request. """
 
-    def __init__(self, name, args=None, metadata=None):
+    def __init__(self, name, args=None, metadata=None, id=None):
         self.name = name
         self.args = args if args else []
         self.metadata = metadata if metadata else {}
+        self.id = id  # optional, echoed back so pipelined clients can match responses
 
     def to_dict(self):
         """ Converts request data to a dictionary for serialization. """
-        return {
+        data = {
             "name": self.name,
             "args": self.args,
             "metadata": self.metadata
         }
+        if self.id is not None:
+            data["id"] = self.id
+        return data
 
     @staticmethod
     def from_dict(data):
@@ -23,33 +28,77 @@ class Request:
         return Request(
             name=data["name"],
             args=data.get("args", []),
-            metadata=data.get("metadata", {})
+            metadata=data.get("metadata", {}),
+            id=data.get("id")
         )
 
 
 class Response:
     """ Represents an RPC response. """
 
-    def __init__(self, result=None, error=None):
+    def __init__(self, result=None, error=None, id=None, version=None):
         self.result = result
         self.error = error
+        self.id = id  # id of the request this answers, if it had one
+        self.version = version  # replication version the answer reflects, when there is a replica
 
     def to_dict(self):
         """ Converts response data to a dictionary for serialization. """
-        return {
+        data = {
             "result": self.result,
             "error": self.error
         }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.version is not None:
+            data["version"] = self.version
+        return data
 
     @staticmethod
     def from_dict(data):
         """ Creates a Response object from a dictionary. """
         return Response(
             result=data.get("result"),
-            error=data.get("error")
+            error=data.get("error"),
+            id=data.get("id"),
+            version=data.get("version")
         )
 
 
+class EncodedResponse(Response):
+    """
+    A successful Response whose result is already JSON (bytes), such as a
+    room's cached game state; encode_message splices it in without dumping
+    it again.
+    """
+
+    def __init__(self, result_json, id=None, version=None):
+        self.result_json = result_json
+        self.error = None
+        self.id = id
+        self.version = version
+
+    @property
+    def result(self):
+        return json.loads(self.result_json)
+
+    def to_dict(self):
+        data = {"result": self.result, "error": None}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.version is not None:
+            data["version"] = self.version
+        return data
+
+    def encode(self):
+        tail = b', "error": null'
+        if self.id is not None:
+            tail += b', "id": ' + json.dumps(self.id).encode('utf-8')
+        if self.version is not None:
+            tail += b', "version": ' + str(int(self.version)).encode('ascii')
+        return b'{"result": ' + self.result_json + tail + b'}\n'
+
+
 def serialize(obj):
     """ Serializes an object into a JSON string. """
     return json.dumps(obj.to_dict())
@@ -59,14 +108,90 @@ def deserialize(json_string):
     """ Deserializes a JSON string into a Request or Response object. """
     try:
         data = json.loads(json_string)
-        if "name" in data:
-            return Request.from_dict(data)
-        elif "result" in data or "error" in data:
-            return Response.from_dict(data)
-        else:
-            raise ValueError("Invalid JSON format")
     except json.JSONDecodeError:
         raise ValueError("Failed to parse JSON")
+    return deserialize_dict(data)
+
+
+def deserialize_dict(data):
+    """ Turns an already parsed message into a Request or Response object. """
+    if not isinstance(data, dict):
+        raise ValueError("Invalid JSON format")
+    if "name" in data:
+        return Request.from_dict(data)
+    elif "result" in data or "error" in data:
+        return Response.from_dict(data)
+    else:
+        raise ValueError("Invalid JSON format")
+
+
+def encode_message(obj):
+    """ Serializes a Request/Response into one newline-terminated frame. """
+    if isinstance(obj, EncodedResponse):
+        return obj.encode()
+    return (serialize(obj) + "\n").encode('utf-8')
+
+
+class FrameTooLarge(ValueError):
+    """ A peer sent more than MessageReader.max_message_size bytes without completing a message. """
+
+
+class MessageReader:
+    """
+    Reads JSON messages from a stream socket, one at a time.
+    Messages are newline-delimited; several may arrive in one recv and one may
+    span several recvs. A bare JSON object without a trailing newline is also
+    accepted, so older peers keep working.
+    """
+
+    MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, sock, bufsize=65536, max_message_size=MAX_MESSAGE_SIZE):
+        self.sock = sock
+        self.bufsize = bufsize
+        self.max_message_size = max_message_size
+        self.buffer = ""
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.decompressor = None  # a FrameDecompressor once compression was negotiated on this connection
+
+    def has_buffered(self):
+        """ True if bytes of a further message are already buffered. """
+        return bool(self.buffer.strip())
+
+    def read_message(self):
+        """
+        Return the next parsed message (usually a dict), or None once the peer
+        closes the connection. Raises ValueError for a malformed frame; the bad
+        frame is discarded so the next call can carry on. Raises FrameTooLarge
+        (a ValueError) once an incomplete message outgrows max_message_size;
+        the connection should then be dropped.
+        """
+        parse = True
+        while True:
+            text = self.buffer.lstrip()
+            if text and parse:
+                try:
+                    data, end = self._decoder.raw_decode(text)
+                    self.buffer = text[end:]
+                    if self.decompressor is not None:
+                        return self.decompressor.decompress(data)
+                    return data
+                except json.JSONDecodeError:
+                    newline = text.find("\n")
+                    if newline != -1:
+                        self.buffer = text[newline + 1:]
+                        raise ValueError("Failed to parse JSON")
+            if len(text) > self.max_message_size:
+                self.buffer = ""
+                raise FrameTooLarge(f"Message larger than {self.max_message_size} bytes")
+            chunk = self.sock.recv(self.bufsize)
+            if not chunk:
+                return None
+            decoded = self._utf8.decode(chunk)
+            self.buffer = text + decoded
+            # re-parse only when the chunk could have completed a message, not on every recv
+            parse = "\n" in decoded or decoded.rstrip().endswith("}")
 
 
 class MindRollGameState:
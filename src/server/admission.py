@@ -0,0 +1,174 @@
+# src/server/admission.py
+
+import collections
+import threading
+import time
+
+from src.common.log import get_logger
+
+log = get_logger("admission")
+
+# request classes, most important first; overload sheds them from the bottom up
+CRITICAL, POLL, LOBBY, LOGIN = range(4)
+CLASS_NAMES = ("critical", "poll", "lobby", "login")
+METHOD_CLASSES = {
+    "get_game_state": POLL,
+    "list_rooms": LOBBY,
+    "leaderboard_top": LOBBY,
+    "player_rank": LOBBY,
+    "get_room_history": LOBBY,
+    "login": LOGIN,
+    "register": LOGIN,
+    "bulk_register": LOGIN,
+}
+# a class is shed while the overload level is at least this
+SHED_AT_LEVEL = {LOGIN: 1, LOBBY: 2, POLL: 3, CRITICAL: None}
+MAX_LEVEL = 3
+
+OVERLOADED = "Server overloaded, retry after {} ms"
+
+
+class Overloaded(Exception):
+    """ The request was shed and not applied; retry after `retry_after` seconds. """
+
+    def __init__(self, retry_after):
+        super().__init__(OVERLOADED.format(int(retry_after * 1000)))
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("cls", "enqueued", "granted")
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.enqueued = time.monotonic()
+        self.granted = threading.Lock()  # held until the slot is handed over; cheaper than an Event
+        self.granted.acquire()
+
+
+class AdmissionController:
+    """
+    Lets at most `concurrency` requests run at once; the rest wait in one
+    queue per request class, and the least important classes are shed when
+    latency stays above target.
+
+    A request that finds a free slot (and nobody queued ahead of it) runs at
+    once on its own connection thread. Otherwise it waits, and every finished
+    request hands its slot straight to the most important waiter. Slow LOGIN
+    work (bcrypt) may hold at most `login_slots` slots, so it can never starve
+    game actions. Every `interval` the controller takes the worst queueing
+    delay it saw (granted waiters and the oldest one still waiting) and the
+    p90 server-side latency of CRITICAL requests. Above `target_delay` the
+    overload level goes up one step, below half of it down one: level 1 sheds
+    logins, 2 also lobby reads, 3 also polling. CRITICAL requests (calls,
+    reveals, joins, ...) are never shed. Shed requests are rejected at once
+    with Overloaded, or when their turn comes if the level rose while they
+    waited.
+    """
+
+    def __init__(self, concurrency=16, target_delay=0.05, interval=0.5, login_slots=None, metrics=None):
+        self.concurrency = concurrency
+        self.target_delay = target_delay
+        self.interval = interval
+        self.login_slots = login_slots if login_slots is not None else max(1, concurrency // 4)
+        self.metrics = metrics
+        self.level = 0
+        self._queues = [collections.deque() for _ in CLASS_NAMES]
+        self._lock = threading.Lock()
+        self._free = concurrency
+        self._logins_running = 0
+        self._worst_delay = 0.0
+        self._critical = []  # server-side latencies of CRITICAL requests this interval
+        self._interval_end = time.monotonic() + interval
+        if metrics:
+            for cls, name in enumerate(CLASS_NAMES):
+                metrics.gauge_callback(f"queue_depth_{name}", lambda cls=cls: len(self._queues[cls]))
+            metrics.gauge_callback("overload_level", lambda: self.level)
+
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self._queues)
+
+    def _shed(self, cls):
+        at = SHED_AT_LEVEL[cls]
+        return at is not None and self.level >= at
+
+    def _shed_event(self, method, reason):
+        if self.metrics:
+            self.metrics.inc("shed", method=method, reason=reason)
+
+    def _runnable(self, cls):
+        return cls != LOGIN or self._logins_running < self.login_slots
+
+    def run(self, method, fn):
+        """ Run fn() as a request of `method` once admitted and return its result; raises Overloaded if shed. """
+        cls = METHOD_CLASSES.get(method, CRITICAL)
+        waiter = None
+        with self._lock:
+            self._adjust_if_due()
+            shed = self._shed(cls)
+            if not shed and self._free and self._runnable(cls) and not any(self._queues[c] for c in range(cls + 1)):
+                self._free -= 1
+                if cls == LOGIN:
+                    self._logins_running += 1
+            elif not shed:
+                waiter = _Waiter(cls)
+                self._queues[cls].append(waiter)
+        if shed:
+            self._shed_event(method, "admission")
+            raise Overloaded(self.interval)
+        if waiter is not None:
+            waiter.granted.acquire()
+            waited = time.monotonic() - waiter.enqueued
+            if self.metrics:
+                self.metrics.observe_timing(f"queue_wait.{CLASS_NAMES[cls]}", waited)
+            if self._shed(cls):
+                self._release(cls)
+                self._shed_event(method, "queue")
+                raise Overloaded(self.interval)
+        try:
+            return fn()
+        finally:
+            self._release(cls)
+
+    def _release(self, cls):
+        """ Give the slot to the most important runnable waiter, or free it. """
+        with self._lock:
+            if cls == LOGIN:
+                self._logins_running -= 1
+            for waiting_cls, queue in enumerate(self._queues):
+                if queue and self._runnable(waiting_cls):
+                    waiter = queue.popleft()
+                    if waiting_cls == LOGIN:
+                        self._logins_running += 1
+                    self._worst_delay = max(self._worst_delay, time.monotonic() - waiter.enqueued)
+                    waiter.granted.release()
+                    return
+            self._free += 1
+
+    # ---------------------- Overload level ----------------------
+    def record(self, method, seconds):
+        """ Report a finished request's whole server-side latency (read to response sent). """
+        if METHOD_CLASSES.get(method, CRITICAL) == CRITICAL:
+            self._critical.append(seconds)
+
+    def _adjust_if_due(self):
+        """ Once per interval, move the level by the worst delay seen; call with the lock held. """
+        now = time.monotonic()
+        if now < self._interval_end:
+            return
+        self._interval_end = now + self.interval
+        oldest = min((queue[0].enqueued for queue in self._queues if queue), default=now)
+        critical, self._critical = sorted(self._critical), []
+        p90 = critical[int(len(critical) * 0.9)] if critical else 0.0
+        self.adjust(max(self._worst_delay, now - oldest, p90))
+        self._worst_delay = 0.0
+
+    def adjust(self, delay):
+        level = self.level
+        if delay > self.target_delay:
+            level = min(level + 1, MAX_LEVEL)
+        elif delay < self.target_delay / 2:
+            level = max(level - 1, 0)
+        if level != self.level:
+            log.warning("Overload level changed", level=level, previous=self.level, delay_ms=round(delay * 1000, 1))
+            self.level = level
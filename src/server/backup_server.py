@@ -1,19 +1,159 @@
 # backup_server.py
 import threading
 import socket
+import time
+
+from src.common.compression import FrameCompressor, MIN_SIZE, accept
+from src.common.log import get_logger
+from src.common.utils import Request, Response, EncodedResponse, MessageReader, FrameTooLarge, encode_message
+from src.server.leaderboard import Leaderboard
+from src.server.metrics import Metrics
+
+log = get_logger("backup")
+
+READ_ONLY_METHODS = {"get_game_state", "list_rooms", "leaderboard_top", "player_rank"}
+
 
 class BackupServer:
-    def __init__(self, host='0.0.0.0', port=8081):
+    """
+    A replica of the primary's rooms and scores that serves the read-only RPCs.
+
+    The primary pushes each room's encoded state (a copy; nothing here points
+    into its GameRooms) after every change, plus a full sync every
+    REPLICATE_INTERVAL as a heartbeat. Every push carries the primary's
+    replication version, and every answer carries the version applied here.
+    Reads are refused (the client then asks the primary) when the primary has
+    not been heard from for `max_staleness` seconds, or when the request's
+    `min_version` metadata - the version of the client's last write - has not
+    been applied yet.
+    """
+
+    def __init__(self, host='0.0.0.0', port=8081, max_staleness=2.0, compress_min_size=MIN_SIZE):
         self.host = host
         self.port = port
         self.server_socket = None
         self.running = False
-        self.games = {}  # Game room data
+        self.max_staleness = max_staleness
+        self.compress_min_size = compress_min_size  # as on the primary; None: never compress
+        # { room_id: (state JSON bytes, list_rooms entry) }
+        self.rooms = {}
+        self.leaderboard = Leaderboard()
+        self.applied_version = 0
+        self.last_update_time = None
+        self.metrics = Metrics()
+        self._lock = threading.Lock()
+
+    # ---------------------- Replication ----------------------
+    def update_games(self, rooms, version):
+        """ Full sync from the primary: { room_id: (state JSON, list_rooms entry) } as of `version`. """
+        with self._lock:
+            self.rooms = rooms
+            self._applied(version)
+        log.debug("Games data updated", rooms=len(rooms), version=version)
+
+    def update_room(self, room_id, room, version):
+        """ One room changed on the primary; `room` is (state JSON, list_rooms entry), or None once it closed. """
+        with self._lock:
+            if room is None:
+                self.rooms.pop(room_id, None)
+            else:
+                self.rooms[room_id] = room
+            self._applied(version)
+
+    def update_scores(self, scores):
+        """ { username: score } as the primary's leaderboard now has them. """
+        for username, score in scores.items():
+            self.leaderboard.add(username, score - self.leaderboard.scores.get(username, 0))
+        self.leaderboard.flush()  # nothing to persist, only forget the dirty entries
 
-    def update_games(self, games):
-        """get data from primary server"""
-        self.games = games
-        print("Backup Server: Games data updated") 
+    def _applied(self, version):
+        # pushes from concurrent requests may arrive out of order; each one carries the latest data anyway
+        self.applied_version = max(self.applied_version, version)
+        self.last_update_time = time.time()
+
+    def staleness(self):
+        """ Seconds since the primary was last heard from (None before the first update). """
+        return None if self.last_update_time is None else time.time() - self.last_update_time
+
+    # ---------------------- Read-only RPCs ----------------------
+    def handle_request(self, request):
+        if request.name == "negotiate":
+            return Response(accept(request.args[0] if request.args else None, self.compress_min_size), None)
+        if request.name not in READ_ONLY_METHODS:
+            return Response(None, f"Read-only replica, send {request.name} to the primary")
+        staleness = self.staleness()
+        if staleness is None or staleness > self.max_staleness:
+            return Response(None, "Replica stale, read from the primary")
+        min_version = request.metadata.get("min_version") or 0
+        if self.applied_version < min_version:
+            return Response(None, f"Replica behind, version {self.applied_version} < {min_version}")
+
+        if request.name == "get_game_state":
+            room = self.rooms.get(request.args[0]) if request.args else None
+            if room is None:
+                return Response(None, "Room does not exist")
+            return EncodedResponse(room[0])
+        elif request.name == "list_rooms":
+            try:
+                offset = max(int(request.args[0]), 0) if request.args else 0
+                limit = max(1, min(int(request.args[1]), 200)) if len(request.args) > 1 else 50
+            except (TypeError, ValueError):
+                return Response(None, "Usage: list_rooms [offset] [limit]")
+            rooms = self.rooms
+            room_ids = sorted(rooms)
+            return Response({"rooms": [rooms[room_id][1] for room_id in room_ids[offset:offset + limit]],
+                             "total": len(room_ids)}, None)
+        elif request.name == "leaderboard_top":
+            try:
+                k = min(int(request.args[0]), 100) if request.args else 10
+                offset = max(int(request.args[1]), 0) if len(request.args) > 1 else 0
+            except (TypeError, ValueError):
+                return Response(None, "Usage: leaderboard_top [k] [offset]")
+            return Response(self.leaderboard.top(k, offset), None)
+        else:
+            if not request.args:
+                return Response(None, "Usage: player_rank <username>")
+            rank = self.leaderboard.rank(request.args[0])
+            if rank is None:
+                return Response(None, "Player has no score yet")
+            return Response(rank, None)
+
+    def handle_client(self, client_socket):
+        reader = MessageReader(client_socket)
+        compressor = None
+        try:
+            while True:
+                try:
+                    request_dict = reader.read_message()
+                    if request_dict is None:
+                        break
+                    request_obj = Request.from_dict(request_dict)
+                except (OSError, FrameTooLarge):
+                    break
+                except Exception as e:
+                    request_id = request_dict.get("id") if isinstance(request_dict, dict) else None
+                    client_socket.sendall(encode_message(Response(None, f"Parse Error: {e}", request_id)))
+                    continue
+
+                started = time.perf_counter()
+                version = self.applied_version  # read before the data, so it never overstates
+                try:
+                    response_obj = self.handle_request(request_obj)
+                except Exception as e:
+                    log.exception("Request failed", method=request_obj.name)
+                    response_obj = Response(None, str(e))
+                response_obj.id = request_obj.id
+                response_obj.version = version
+                try:
+                    frame = encode_message(response_obj)
+                    client_socket.sendall(compressor.compress(frame) if compressor else frame)
+                except OSError:
+                    break
+                self.metrics.observe(request_obj.name, time.perf_counter() - started, response_obj.error is not None)
+                if request_obj.name == "negotiate" and compressor is None and response_obj.result["compression"]:
+                    compressor = FrameCompressor(self.compress_min_size, metrics=self.metrics)
+        finally:
+            client_socket.close()
 
     def start(self):
         """Start the backup server."""
@@ -21,15 +161,24 @@ class BackupServer:
         self.server_socket.bind((self.host, self.port))
         self.server_socket.listen(5)
         self.running = True
-        print(f"Backup Server listening on {self.host}:{self.port}")
+        log.info("Backup Server listening", host=self.host, port=self.port)
 
         try:
             while self.running:
                 client_socket, address = self.server_socket.accept()
-                print(f"Client connected from {address}")
-                threading.Thread(target=self.handle_client, args=(client_socket,)).start()
+                log.info("Client connected", address=address)
+                threading.Thread(target=self.handle_client, args=(client_socket,), daemon=True).start()
         except (KeyboardInterrupt, OSError):
             pass
 
         self.server_socket.close()
-        print("Backup Server stopped")
\ No newline at end of file
+        log.info("Backup Server stopped")
+
+    def stop(self):
+        self.running = False
+        if self.server_socket:
+            try:
+                self.server_socket.shutdown(socket.SHUT_RDWR)  # wakes up accept(), close() alone does not
+            except OSError:
+                pass
+            self.server_socket.close()
@@ -0,0 +1,90 @@
+# src/server/bot.py
+
+from functools import lru_cache
+
+DICE_FACES = 6
+
+
+@lru_cache(maxsize=None)
+def dice_sum_counts(n):
+    """
+    Exact number of ways to roll each sum with n six-sided dice.
+    Index i holds the count for sum i (0 .. 6n); total is 6**n.
+    Built by convolving the (n-1)-dice table with one more die, cached per n.
+    """
+    if n < 0:
+        raise ValueError("Number of dice must be non-negative")
+    if n == 0:
+        return (1,)
+    prev = dice_sum_counts(n - 1)
+    counts = [0] * (len(prev) + DICE_FACES)
+    for total, ways in enumerate(prev):
+        if ways:
+            for face in range(1, DICE_FACES + 1):
+                counts[total + face] += ways
+    return tuple(counts)
+
+
+@lru_cache(maxsize=None)
+def dice_sum_cdf(n):
+    """
+    P(sum of n dice <= i) for i in 0 .. 6n, as floats for fast lookups.
+    """
+    counts = dice_sum_counts(n)
+    outcomes = DICE_FACES ** n
+    cdf = []
+    running = 0
+    for ways in counts:
+        running += ways
+        cdf.append(running / outcomes)
+    return tuple(cdf)
+
+
+def prob_sum_at_most(n, limit):
+    """ P(sum of n dice <= limit), clamped outside the table range. """
+    if limit < 0:
+        return 0.0
+    cdf = dice_sum_cdf(n)
+    if limit >= len(cdf):
+        return 1.0
+    return cdf[limit]
+
+
+class BotPlayer:
+    """
+    A server-side player that sits in a GameRoom and acts on its own turn.
+    It only looks at its own dice, the number of players and the current call,
+    never at the other players' dice.
+    """
+
+    def __init__(self, name, reveal_threshold=0.5):
+        self.name = name
+        self.reveal_threshold = reveal_threshold
+
+    def decide(self, game):
+        """
+        Return ("reveal", None) or ("call", number) for the current state of `game`.
+        A reveal wins when the called number is >= the total dice sum.
+        """
+        player_count = len(game.players)
+        if game.called_number is None:
+            # first call of the round: the room starts from this floor
+            return "call", max(3 * player_count + 1, 7) + 1
+
+        own_dice = game.players[self.name]["dice_number"]
+        win_chance = prob_sum_at_most(player_count - 1, game.called_number - own_dice)
+        if win_chance >= self.reveal_threshold:
+            return "reveal", None
+        return "call", game.called_number + 1
+
+    def act(self, game):
+        """ Apply the decision to `game`. Returns the decision tuple. """
+        action, number = self.decide(game)
+        if action == "reveal":
+            game.reveal_result(self.name)
+        else:
+            game.call_number(self.name, number)
+        return action, number
+
+    def __repr__(self):
+        return f"<BotPlayer(name={self.name}, reveal_threshold={self.reveal_threshold})>"
@@ -1,5 +1,6 @@
 # src/server/game_logic.py
 
+import json
 import random
 import time
 
@@ -15,6 +16,21 @@ class GameRoom:
         self.last_result_str = None   # save the last result string
         self.last_result_time = None    # save the last result time
 
+        self.listeners = []  # callables (room_id, event) told about every change
+        self.version = 0     # bumped on every change
+        self._state_json = (-1, None)  # (version, state() as JSON bytes)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _emit(self, type, **fields):
+        """ Call once a change is complete. """
+        self.version += 1
+        if self.listeners:
+            event = {"t": time.time(), "type": type, **fields}
+            for listener in self.listeners:
+                listener(self.room_id, event)
+
     def add_player(self, player_name):
         # Deny joining if game has already started
         if self.called_number is not None:
@@ -35,6 +51,7 @@ class GameRoom:
 
         if self.current_turn is None:
             self.current_turn = player_name
+        self._emit("join", player=player_name)
 
     def call_number(self, player_name, number):
         if len(self.players) < 2:
@@ -57,6 +74,7 @@ class GameRoom:
             i = self.players_order.index(player_name)
             next_i = (i + 1) % len(self.players_order)
             self.current_turn = self.players_order[next_i]
+        self._emit("call", player=player_name, number=number)
 
     def reveal_result(self, player_name):
         if len(self.players) < 2:
@@ -79,9 +97,13 @@ class GameRoom:
         # sacve the result string and time
         self.last_result_str = result_str
         self.last_result_time = time.time()
+        reveal = {"player": player_name, "number": self.called_number, "total": total_sum,
+                  "dice": {name: p["dice_number"] for name, p in self.players.items()},
+                  "winner": self.winner, "result": result_str}
 
         # reset the game
         self.reset_game()
+        self._emit("reveal", **reveal)
 
         result_info = {
             "result_str": result_str,
@@ -128,6 +150,7 @@ class GameRoom:
                 self.reset_game()
                 self.last_result_str = None
                 self.last_result_time = None
+                self._emit("reset")
 
     def remove_player(self, player_name):
         if player_name not in self.players:
@@ -135,10 +158,66 @@ class GameRoom:
         del self.players[player_name]
         if player_name in self.players_order:
             self.players_order.remove(player_name)
+        self._emit("leave", player=player_name)
         if not self.players:
             return True
         return False
 
+    def disconnect_player(self, player_name):
+        """ Mark a player as disconnected; the 60s reconnection timeout starts now. """
+        pinfo = self.players[player_name]
+        if pinfo.get("connected", True):
+            pinfo["connected"] = False
+            pinfo["disconnected_time"] = time.time()
+            self._emit("disconnect", player=player_name)
+            return True
+        return False
+
+    def reconnect_player(self, player_name):
+        pinfo = self.players[player_name]
+        pinfo["connected"] = True
+        pinfo["disconnected_time"] = None
+        self._emit("reconnect", player=player_name)
+
+    def state(self) -> dict:
+        """ What get_game_state returns. """
+        return {
+            "players": self.players,
+            "players_order": self.players_order,
+            "current_turn": self.current_turn,
+            "called_number": self.called_number,
+            "winner": self.winner,
+            "last_result_str": self.last_result_str
+        }
+
+    def snapshot(self) -> dict:
+        """ Everything needed to rebuild the room in another process (see restore). """
+        return {**self.state(), "room_id": self.room_id, "last_result_time": self.last_result_time,
+                "version": self.version}
+
+    @classmethod
+    def restore(cls, snapshot):
+        """ A room rebuilt from snapshot(); listeners are not part of it. """
+        game = cls(snapshot["room_id"])
+        game.players = snapshot["players"]
+        game.players_order = snapshot["players_order"]
+        game.current_turn = snapshot["current_turn"]
+        game.called_number = snapshot["called_number"]
+        game.winner = snapshot["winner"]
+        game.last_result_str = snapshot["last_result_str"]
+        game.last_result_time = snapshot["last_result_time"]
+        game.version = snapshot["version"]
+        return game
+
+    def state_json(self) -> bytes:
+        """ state() encoded as JSON, re-encoded only after the room changed. """
+        version, data = self._state_json
+        if version != self.version:
+            version = self.version
+            data = json.dumps(self.state()).encode('utf-8')
+            self._state_json = (version, data)
+        return data
+
     def check_reconnection_timeout(self):
         """
         check if any player has disconnected for more than 60 seconds.
@@ -155,4 +234,6 @@ class GameRoom:
             if not self.last_result_str:
                 self.last_result_str = "Game drawn due to disconnect timeout."
                 self.last_result_time = time.time()
+                self._emit("timeout", players=[name for name, info in self.players.items()
+                                               if not info.get("connected", True)])
 
@@ -0,0 +1,99 @@
+# src/server/handoff.py
+
+import os
+import socket
+import threading
+
+from src.common.log import get_logger
+from src.common.utils import Request, Response, MessageReader, encode_message
+
+log = get_logger("handoff")
+
+# sent to clients of the old process, whose requests were not applied; the client reconnects and retries
+RESTARTING = "Server restarting, retry after {} ms"
+_FD_MARKER = b"FD\n"
+MAX_SNAPSHOT_SIZE = 1 << 30
+
+
+def request_handoff(path, timeout=30.0):
+    """
+    Ask the server waiting at the unix socket `path` to hand over.
+    Returns (its listening socket, its snapshot dict); raises OSError if nobody is there.
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(timeout)
+    with conn:
+        conn.connect(path)
+        conn.sendall(encode_message(Request("handoff")))
+        # the listening socket comes first, so connections keep queueing in its backlog meanwhile
+        marker, fds, _, _ = socket.recv_fds(conn, len(_FD_MARKER), 1)
+        if marker != _FD_MARKER or not fds:
+            raise ConnectionError("Handoff refused")
+        listener = socket.socket(fileno=fds[0])
+        data = MessageReader(conn, max_message_size=MAX_SNAPSHOT_SIZE).read_message()
+    if data is None:
+        listener.close()
+        raise ConnectionError("Server closed the handoff connection")
+    response = Response.from_dict(data)
+    if response.error:
+        listener.close()
+        raise ConnectionError(response.error)
+    return listener, response.result
+
+
+def send_listener(conn, listener):
+    socket.send_fds(conn, [_FD_MARKER], [listener.fileno()])
+
+
+def send_snapshot(conn, snapshot):
+    conn.sendall(encode_message(Response(snapshot, None)))
+
+
+class HandoffListener:
+    """
+    Waits at the unix socket `path` for the process that replaces this one
+    and calls on_handoff(conn) once, on its own thread, when it asks.
+    """
+
+    def __init__(self, path, on_handoff):
+        self.path = path
+        self.on_handoff = on_handoff
+        self._sock = None
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # left by the process we took over from, or by one that crashed
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.path)
+        self._sock.listen(1)
+        threading.Thread(target=self._run, name="handoff", daemon=True).start()
+        log.info("Waiting for a successor", path=self.path)
+
+    def _run(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            try:
+                conn.settimeout(10.0)
+                data = MessageReader(conn).read_message()
+                conn.settimeout(None)
+            except (OSError, ValueError) as e:
+                log.warning("Bad handoff request", error=e)
+                conn.close()
+                continue
+            if not isinstance(data, dict) or data.get("name") != "handoff":
+                conn.close()
+                continue
+            self.close()  # the successor binds the path again once it runs
+            self.on_handoff(conn)
+            return
+
+    def close(self):
+        if self._sock:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
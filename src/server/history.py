@@ -0,0 +1,249 @@
+# src/server/history.py
+
+import bisect
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from src.common.log import get_logger
+
+log = get_logger("history")
+
+MAGIC = b"MRH1"  # segment file header, also the format version
+# per block: payload length, crc32 of the payload, event count, first and last event time, room id length
+BLOCK = struct.Struct("<IIIddH")
+# preset dictionary for the small per-room blocks; changing it breaks existing segments
+ZDICT = (b'"t": "type": "join", "type": "call", "number": "type": "reveal", "total": "dice": '
+         b'"winner": "DRAW", "result": "type": "leave", "type": "disconnect", "type": "timeout", '
+         b'"type": "close", "player": " wins! (Called number  loses! (Called number  <= total dice sum ')
+
+
+def _compress(data):
+    compressor = zlib.compressobj(6, zdict=ZDICT)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _decompress(data):
+    decompressor = zlib.decompressobj(zdict=ZDICT)
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+class RoomHistory:
+    """
+    Append-only event history of every room, kept in compressed segment files.
+
+    append() only puts the event on a queue; a background thread groups what
+    arrived into one block per room, compresses it and appends it to the
+    current segment (segment-NNNNNN.log, rolled over at `segment_size`).
+    Each block header carries the room id and the time range it covers, and
+    a sparse in-memory index maps every room to its blocks, so a replay maps
+    the segment file and decompresses only that room's blocks. Sealed segments
+    get a .idx file next to them; the open segment is re-indexed from its
+    block headers on start.
+    """
+
+    def __init__(self, directory, segment_size=8 * 1024 * 1024, flush_interval=0.2, max_queue=100000):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._index = {}  # { room_id: [(first_t, last_t, segment, offset, length, count), ...] }
+        self._lasts = {}  # { room_id: [last_t, ...] } for bisecting by time
+        self._maps = {}   # { segment: mmap } of sealed segments
+        self._segment = 0
+        self._file = None
+        self._running = False
+        self._thread = None
+        self.dropped = 0
+        self.events_written = 0
+        self.bytes_written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    # ---------------------- Files ----------------------
+    def _path(self, segment, suffix=".log"):
+        return os.path.join(self.directory, f"segment-{segment:06d}{suffix}")
+
+    def _segments(self):
+        names = [name for name in os.listdir(self.directory) if name.startswith("segment-") and name.endswith(".log")]
+        return sorted(int(name[8:-4]) for name in names)
+
+    def _open(self):
+        segments = self._segments()
+        for segment in segments:
+            entries = self._load_index(segment, last=segment == segments[-1])
+            for room_id, entry in entries:
+                self._add_entry(room_id, entry)
+        self._segment = segments[-1] if segments else 1
+        self._file = open(self._path(self._segment), "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+        log.info("History opened", directory=self.directory, segments=len(segments), rooms=len(self._index))
+
+    def _load_index(self, segment, last):
+        """ (room_id, entry) pairs of one segment, from its .idx file or by walking the block headers. """
+        idx_path = self._path(segment, ".idx")
+        if not last and os.path.exists(idx_path):
+            with open(idx_path) as f:
+                return [(room_id, tuple(entry)) for room_id, entry in map(json.loads, f)]
+        entries, offset = [], len(MAGIC)
+        with open(self._path(segment), "r+b") as f:
+            data = f.read()
+            while offset + BLOCK.size <= len(data):
+                length, crc, count, first, last_t, room_len = BLOCK.unpack_from(data, offset)
+                start = offset + BLOCK.size + room_len
+                if start + length > len(data) or zlib.crc32(data[start:start + length]) != crc:
+                    break  # torn write at the end of the segment
+                room_id = data[offset + BLOCK.size:start].decode("utf-8")
+                entries.append((room_id, (first, last_t, segment, start, length, count)))
+                offset = start + length
+            if offset < len(data):
+                log.warning("Truncating torn history block", segment=segment, offset=offset)
+                f.truncate(offset)
+        if not last:
+            self._write_index(segment, entries)
+        return entries
+
+    def _write_index(self, segment, entries):
+        with open(self._path(segment, ".idx"), "w") as f:
+            for room_id, entry in entries:
+                f.write(json.dumps([room_id, entry]) + "\n")
+
+    def _add_entry(self, room_id, entry):
+        self._index.setdefault(room_id, []).append(entry)
+        self._lasts.setdefault(room_id, []).append(entry[1])
+
+    def _roll(self):
+        """ Seal the current segment (write its .idx) and start the next one. """
+        self._file.close()
+        sealed = self._segment
+        with self._lock:
+            entries = [(room_id, entry) for room_id, room_entries in self._index.items()
+                       for entry in room_entries if entry[2] == sealed]
+        self._write_index(sealed, sorted(entries, key=lambda item: item[1][3]))
+        self._segment += 1
+        self._file = open(self._path(self._segment), "ab")
+        self._file.write(MAGIC)
+
+    # ---------------------- Writing ----------------------
+    def append(self, room_id, event):
+        """ Queue one event (a dict with "t" and "type"); never blocks the caller. """
+        try:
+            self._queue.put_nowait((room_id, event))
+        except queue.Full:
+            self.dropped += 1
+
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def _write_blocks(self, batch):
+        rooms = {}
+        for room_id, event in batch:
+            rooms.setdefault(room_id, []).append(event)
+        entries = []
+        for room_id, events in rooms.items():
+            payload = _compress("\n".join(json.dumps(event) for event in events).encode("utf-8"))
+            room = room_id.encode("utf-8")
+            offset = self._file.tell()
+            self._file.write(BLOCK.pack(len(payload), zlib.crc32(payload), len(events),
+                                        events[0]["t"], events[-1]["t"], len(room)) + room + payload)
+            start = offset + BLOCK.size + len(room)
+            entries.append((room_id, (events[0]["t"], events[-1]["t"], self._segment, start, len(payload), len(events))))
+            self.bytes_written += BLOCK.size + len(room) + len(payload)
+        self._file.flush()
+        # readers only see a block once all of it is in the file
+        with self._lock:
+            for room_id, entry in entries:
+                self._add_entry(room_id, entry)
+        self.events_written += len(batch)
+        if self._file.tell() >= self.segment_size:
+            self._roll()
+
+    def flush(self):
+        """ Write everything queued so far (the background thread does this every flush_interval). """
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_blocks(batch)
+        return len(batch)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop, name="history", daemon=True)
+        self._thread.start()
+
+    def _write_loop(self):
+        while self._running:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                log.warning("History write failed", error=e, backlog=self.backlog())
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(5.0)
+        try:
+            self.flush()
+        except Exception as e:
+            log.warning("Final history write failed", error=e, backlog=self.backlog())
+        self._file.close()
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+    # ---------------------- Reading ----------------------
+    def _block(self, segment, offset, length):
+        """ The compressed bytes of one block, through an mmap of its segment. """
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < offset + length:
+            with open(self._path(segment), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if segment != self._segment:
+                self._maps[segment] = mapped  # sealed segments no longer grow
+        return mapped[offset:offset + length]
+
+    def rooms(self) -> list[str]:
+        with self._lock:
+            return list(self._index)
+
+    def read(self, room_id, since=None, cursor=None, limit=200):
+        """
+        Up to `limit` events of a room, oldest first, and the cursor to pass
+        for the next page (None at the end). `since` skips events before that
+        time; a cursor from a previous page takes precedence over it.
+        """
+        with self._lock:
+            entries = list(self._index.get(room_id, ()))
+            lasts = self._lasts.get(room_id, [])
+            if cursor:
+                block, skip = cursor
+            else:
+                block = bisect.bisect_left(lasts, since) if since is not None else 0
+                skip = 0
+        events = []
+        while block < len(entries) and len(events) < limit:
+            first, last, segment, offset, length, count = entries[block]
+            lines = _decompress(self._block(segment, offset, length)).split(b"\n")
+            for index in range(skip, count):
+                event = json.loads(lines[index])
+                if cursor is None and since is not None and event["t"] < since:
+                    continue
+                events.append(event)
+                if len(events) == limit:
+                    next_cursor = [block, index + 1] if index + 1 < count else [block + 1, 0]
+                    return events, (next_cursor if next_cursor != [len(entries), 0] else None)
+            block, skip = block + 1, 0
+        return events, None
@@ -0,0 +1,258 @@
+# src/server/leaderboard.py
+
+import random
+import threading
+
+from src.common.log import get_logger
+
+log = get_logger("leaderboard")
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level  # index distance to next[i]
+
+
+class SkipList:
+    """
+    Indexable skip list: an ordered set with O(log n) insert, remove, rank
+    (index of a key) and select (key at an index).
+
+    Every link also stores how many positions it skips, so walking down the
+    levels and adding up widths gives a key's index. Keys must be unique and
+    comparable.
+    """
+
+    MAX_LEVEL = 16  # plenty for 4**16 keys with p = 1/4
+
+    def __init__(self, seed=None):
+        self.head = _Node(None, self.MAX_LEVEL)
+        self.level = 1  # levels in use; searches never look above it
+        self.size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < 0.25:
+            level += 1
+        return level
+
+    def _search(self, key):
+        """ The last node before `key` on each level in use, and its position (the head is 0). """
+        update = [None] * self.level
+        steps = [0] * self.level
+        node, position = self.head, 0
+        for i in range(self.level - 1, -1, -1):
+            nxt = node.next[i]
+            while nxt is not None and nxt.key < key:
+                position += node.width[i]
+                node = nxt
+                nxt = node.next[i]
+            update[i] = node
+            steps[i] = position
+        return update, steps
+
+    def insert(self, key):
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                self.head.width[i] = self.size + 1  # up to the end
+            self.level = level
+        update, steps = self._search(key)
+        new_position = steps[0] + 1
+        new = _Node(key, level)
+        for i in range(self.level):
+            prev = update[i]
+            if i < level:
+                new.next[i] = prev.next[i]
+                new.width[i] = steps[i] + prev.width[i] + 1 - new_position
+                prev.next[i] = new
+                prev.width[i] = new_position - steps[i]
+            else:
+                prev.width[i] += 1
+        self.size += 1
+
+    def remove(self, key):
+        update, _ = self._search(key)
+        target = update[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        levels = len(target.next)
+        for i in range(self.level):
+            prev = update[i]
+            if i < levels and prev.next[i] is target:
+                prev.width[i] += target.width[i] - 1
+                prev.next[i] = target.next[i]
+            else:
+                prev.width[i] -= 1
+        self.size -= 1
+
+    def index(self, key) -> int:
+        """ 0-based index of `key`; KeyError if absent. """
+        node, position = self.head, 0
+        for i in range(self.level - 1, -1, -1):
+            nxt = node.next[i]
+            while nxt is not None and nxt.key < key:
+                position += node.width[i]
+                node = nxt
+                nxt = node.next[i]
+        if node.next[0] is None or node.next[0].key != key:
+            raise KeyError(key)
+        return position
+
+    def _node_at(self, index):
+        """ The node at 0-based `index` (the head for -1). """
+        node, position = self.head, 0
+        target = index + 1
+        for i in range(self.level - 1, -1, -1):
+            while node.next[i] is not None and position + node.width[i] <= target:
+                position += node.width[i]
+                node = node.next[i]
+        return node
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self._node_at(index).key
+
+    def slice(self, start, count) -> list:
+        """ Up to `count` keys from index `start`: one O(log n) seek, then a walk. """
+        if start >= self.size or count <= 0:
+            return []
+        node = self._node_at(start - 1).next[0] if start > 0 else self.head.next[0]
+        keys = []
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class Leaderboard:
+    """
+    Global scores, ranked in memory and written to the user store behind the
+    requests.
+
+    add() updates a player's score in a SkipList ordered by (-score, username),
+    so top() and rank() cost O(log n) no matter how many players there are.
+    Changed scores collect in a dirty map (repeated changes to one player
+    coalesce) that a background thread writes every `flush_interval` seconds,
+    or sooner once `batch_size` players are waiting, with store.save_scores().
+    """
+
+    def __init__(self, store=None, flush_interval=2.0, batch_size=500):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.scores = {}  # { username: score }
+        self._ranking = SkipList()
+        self._dirty = {}  # { username: score } not persisted yet
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def load(self):
+        """ Read the stored scores; call before start(). """
+        if self.store is None:
+            return
+        scores = self.store.load_scores()
+        with self._lock:
+            for username, score in scores.items():
+                if username not in self.scores:
+                    self.scores[username] = score
+                    self._ranking.insert((-score, username))
+        log.info("Leaderboard loaded", players=len(scores))
+
+    def add(self, username, delta) -> int:
+        """ Change a player's score by `delta`; returns the new score. """
+        with self._lock:
+            old = self.scores.get(username)
+            if old is not None:
+                self._ranking.remove((-old, username))
+            score = (old or 0) + delta
+            self.scores[username] = score
+            self._ranking.insert((-score, username))
+            self._dirty[username] = score
+            pending = len(self._dirty)
+        if pending >= self.batch_size:
+            self._wake.set()
+        return score
+
+    def top(self, k=10, offset=0) -> list[dict]:
+        with self._lock:
+            keys = self._ranking.slice(offset, k)
+        return [{"rank": offset + i + 1, "username": username, "score": -negative}
+                for i, (negative, username) in enumerate(keys)]
+
+    def rank(self, username) -> dict | None:
+        """ {"rank": 1-based, "username", "score", "players"}, or None for an unranked player. """
+        with self._lock:
+            score = self.scores.get(username)
+            if score is None:
+                return None
+            index = self._ranking.index((-score, username))
+            players = len(self._ranking)
+        return {"rank": index + 1, "username": username, "score": score, "players": players}
+
+    # ---------------------- Write-behind ----------------------
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def flush(self) -> int:
+        """ Write every dirty score now; returns how many were written. """
+        if self.store is None:
+            with self._lock:
+                self._dirty.clear()
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+            if not dirty:
+                return 0
+            items = list(dirty.items())
+            for start in range(0, len(items), self.batch_size):
+                batch = dict(items[start:start + self.batch_size])
+                try:
+                    self.store.save_scores(batch)
+                except Exception:
+                    with self._lock:
+                        # keep what failed, unless the score changed again meanwhile
+                        for username, score in items[start:]:
+                            self._dirty.setdefault(username, score)
+                    raise
+            return len(items)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._flush_loop, name="leaderboard", daemon=True)
+        self._thread.start()
+
+    def _flush_loop(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                written = self.flush()
+                if written:
+                    log.debug("Scores persisted", players=written)
+            except Exception as e:
+                log.warning("Score flush failed", error=e, pending=self.pending())
+
+    def stop(self):
+        """ Stop the writer and persist what is left. """
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(5.0)
+        try:
+            self.flush()
+        except Exception as e:
+            log.warning("Final score flush failed", error=e, pending=self.pending())
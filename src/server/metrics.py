@@ -0,0 +1,271 @@
+# src/server/metrics.py
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Histogram:
+    """
+    HDR-style latency histogram in microseconds with bounded memory.
+    Values are grouped in log-linear buckets: each power of two is split into
+    2**sub_bucket_bits linear sub-buckets (~6% precision with the default 4 bits).
+    """
+
+    def __init__(self, sub_bucket_bits=4, max_bits=36):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.max_value = (1 << max_bits) - 1
+        self.counts = [0] * ((max_bits - sub_bucket_bits + 1) * self.sub_bucket_count)
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def _index(self, value):
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        if shift <= 0:
+            return value
+        return shift * self.sub_bucket_count + (value >> shift)
+
+    def _bucket_bounds(self, index):
+        """ [low, high) of the values that land in bucket `index`. """
+        if index < 2 * self.sub_bucket_count:
+            return index, index + 1
+        shift, mantissa = divmod(index, self.sub_bucket_count)
+        shift -= 1
+        mantissa += self.sub_bucket_count
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, value):
+        value = min(max(int(value), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct):
+        if not self.total:
+            return 0
+        target = max(1, pct / 100.0 * self.total)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    low, high = self._bucket_bounds(index)
+                    return min((low + high - 1) // 2, self.max)
+        return self.max
+
+
+class MethodStats:
+    """ Request count, error count and latency histogram of one RPC method. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+    def observe(self, micros, error):
+        with self.lock:
+            self.requests += 1
+            if error:
+                self.errors += 1
+            self.latency.record(micros)
+
+    def latency_us(self):
+        with self.lock:
+            return {
+                "p50": self.latency.percentile(50),
+                "p95": self.latency.percentile(95),
+                "p99": self.latency.percentile(99),
+                "max": self.latency.max,
+                "mean": self.latency.sum / self.latency.total if self.latency.total else 0,
+            }
+
+    def snapshot(self):
+        with self.lock:
+            requests, errors = self.requests, self.errors
+        return {"requests": requests, "errors": errors, "latency_us": self.latency_us()}
+
+
+class Metrics:
+    """
+    Per-method RPC stats plus named counters, gauges and internal timings.
+    Gauges are either set directly or read from a callback when a snapshot is taken.
+    Timings (observe_timing) are latencies of work inside a request, such as a
+    token lookup; they are kept apart from the RPC methods.
+    """
+
+    MAX_METHODS = 64
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.methods = {}     # { method: MethodStats }
+        self.counters = {}    # { (name, (("label", "value"), ...)): int }
+        self.gauges = {}      # { name: value }
+        self.gauge_callbacks = {}  # { name: callable }
+        self.timings = {}     # { name: MethodStats }
+
+    def observe(self, method, seconds, error=False):
+        stats = self.methods.get(method)
+        if stats is None:
+            with self.lock:
+                if method not in self.methods and len(self.methods) >= self.MAX_METHODS:
+                    method = "other"
+                stats = self.methods.setdefault(method, MethodStats())
+        stats.observe(seconds * 1e6, error)
+
+    def observe_timing(self, name, seconds):
+        stats = self.timings.get(name)
+        if stats is None:
+            with self.lock:
+                stats = self.timings.setdefault(name, MethodStats())
+        stats.observe(seconds * 1e6, False)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def counter(self, name, **labels):
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def add_gauge(self, name, amount):
+        with self.lock:
+            self.gauges[name] = self.gauges.get(name, 0) + amount
+
+    def gauge_callback(self, name, func):
+        self.gauge_callbacks[name] = func
+
+    def read_gauges(self):
+        gauges = dict(self.gauges)
+        for name, func in list(self.gauge_callbacks.items()):
+            try:
+                gauges[name] = func()
+            except Exception:
+                gauges[name] = None
+        return gauges
+
+    def snapshot(self):
+        with self.lock:
+            methods = dict(self.methods)
+            counters = dict(self.counters)
+            timings = dict(self.timings)
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "methods": {name: stats.snapshot() for name, stats in sorted(methods.items())},
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            "gauges": self.read_gauges(),
+            "timings": {name: {"count": stats.requests, **stats.latency_us()} for name, stats in sorted(timings.items())},
+        }
+
+    def prometheus_text(self, prefix="mindroll"):
+        """ Render everything in the Prometheus text exposition format. """
+        snap = self.snapshot()
+        lines = [
+            f"# TYPE {prefix}_rpc_requests_total counter",
+            f"# TYPE {prefix}_rpc_errors_total counter",
+            f"# TYPE {prefix}_rpc_latency_microseconds summary",
+        ]
+        for method, stats in snap["methods"].items():
+            label = f'method="{method}"'
+            latency = stats["latency_us"]
+            lines.append(f"{prefix}_rpc_requests_total{{{label}}} {stats['requests']}")
+            lines.append(f"{prefix}_rpc_errors_total{{{label}}} {stats['errors']}")
+            for quantile in ("p50", "p95", "p99"):
+                q = int(quantile[1:]) / 100
+                lines.append(f'{prefix}_rpc_latency_microseconds{{{label},quantile="{q}"}} {latency[quantile]}')
+            lines.append(f"{prefix}_rpc_latency_microseconds_count{{{label}}} {stats['requests']}")
+            lines.append(f"{prefix}_rpc_latency_microseconds_sum{{{label}}} {latency['mean'] * stats['requests']:.0f}")
+
+        seen = set()
+        for counter in snap["counters"]:
+            name = f"{prefix}_{counter['name']}_total"
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            labels = ",".join(f'{k}="{v}"' for k, v in counter["labels"].items())
+            lines.append(f"{name}{{{labels}}} {counter['value']}" if labels else f"{name} {counter['value']}")
+
+        if snap["timings"]:
+            lines.append(f"# TYPE {prefix}_timing_microseconds summary")
+        for name, latency in snap["timings"].items():
+            label = f'name="{name}"'
+            for quantile in ("p50", "p95", "p99"):
+                q = int(quantile[1:]) / 100
+                lines.append(f'{prefix}_timing_microseconds{{{label},quantile="{q}"}} {latency[quantile]}')
+            lines.append(f"{prefix}_timing_microseconds_count{{{label}}} {latency['count']}")
+            lines.append(f"{prefix}_timing_microseconds_sum{{{label}}} {latency['mean'] * latency['count']:.0f}")
+
+        for name, value in sorted(snap["gauges"].items()):
+            if value is None:
+                continue
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+        lines.append(f"{prefix}_uptime_seconds {snap['uptime_s']}")
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """
+    Publishes Metrics.prometheus_text() either to a file rewritten every
+    `interval` seconds, or over HTTP on a local port (GET /metrics).
+    """
+
+    def __init__(self, metrics, path=None, port=None, host="127.0.0.1", interval=5.0):
+        self.metrics = metrics
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self.running = False
+        self.httpd = None
+
+    def start(self):
+        self.running = True
+        if self.path:
+            threading.Thread(target=self._file_loop, daemon=True).start()
+        if self.port is not None:
+            metrics = self.metrics
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = metrics.prometheus_text().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+            threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def write_file(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.metrics.prometheus_text())
+        # atomic replace so scrapers never read a half-written file
+        os.replace(tmp, self.path)
+
+    def _file_loop(self):
+        while self.running:
+            self.write_file()
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.running = False
+        if self.httpd:
+            self.httpd.shutdown()
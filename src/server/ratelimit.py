@@ -0,0 +1,102 @@
+# src/server/ratelimit.py
+
+import threading
+import time
+
+# { method: (requests per second, burst) or None for unlimited }; other methods get DEFAULT_LIMIT
+DEFAULT_LIMITS = {
+    "login": (2.0, 5),
+    "register": (1.0, 5),
+    "get_game_state": (10.0, 20),
+    "get_room_history": (5.0, 10),
+}
+DEFAULT_LIMIT = (20.0, 40)
+
+RATE_LIMITED = "Rate limited, retry after {} ms"
+
+
+class TokenBucket:
+    """ `rate` tokens per second, holding at most `burst`; a request takes one. """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now) -> float:
+        """ 0.0 if a token was taken, else the seconds until one is available. """
+        tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if tokens >= 1.0:
+            self.tokens = tokens - 1.0
+            return 0.0
+        self.tokens = tokens
+        return (1.0 - tokens) / self.rate
+
+    def idle(self, now) -> bool:
+        """ Full again, so forgetting it changes nothing. """
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+class RateLimiter:
+    """
+    Token-bucket limits per RPC method, applied per connection and per session token.
+
+    Per-connection buckets live in a dict owned by the connection's thread
+    (see connection_buckets), so they need no lock and go away with the
+    connection. Per-token buckets are shared by every connection using the
+    token, so reconnecting does not reset them; buckets that have refilled
+    are swept out every `sweep_every` checks. A check is a dict lookup and a
+    little arithmetic on each side.
+    """
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT, sweep_every=10000):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.default = default
+        self.sweep_every = sweep_every
+        self._token_buckets = {}  # { (token, method): TokenBucket }
+        self._lock = threading.Lock()
+        self._checks = 0
+
+    def connection_buckets(self) -> dict:
+        return {}
+
+    def check(self, connection_buckets, token, method, now=None) -> tuple[float, str | None]:
+        """
+        Take one request of `method` from the connection's and the token's
+        buckets. Returns (0.0, None) if allowed, else (seconds to wait, "connection" or "token").
+        """
+        limit = self.limits.get(method, self.default)
+        if limit is None:
+            return 0.0, None
+        now = time.monotonic() if now is None else now
+        bucket = connection_buckets.get(method)
+        if bucket is None:
+            bucket = connection_buckets[method] = TokenBucket(limit[0], limit[1], now)
+        wait = bucket.take(now)
+        if wait:
+            return wait, "connection"
+        if token:
+            key = (token, method)
+            with self._lock:
+                bucket = self._token_buckets.get(key)
+                if bucket is None:
+                    bucket = self._token_buckets[key] = TokenBucket(limit[0], limit[1], now)
+                wait = bucket.take(now)
+                self._checks += 1
+                if self._checks >= self.sweep_every:
+                    self._checks = 0
+                    self._sweep(now)
+            if wait:
+                return wait, "token"
+        return 0.0, None
+
+    def _sweep(self, now):
+        for key in [key for key, bucket in self._token_buckets.items() if bucket.idle(now)]:
+            del self._token_buckets[key]
+
+    def token_buckets(self) -> int:
+        return len(self._token_buckets)
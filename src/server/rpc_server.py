@@ -1,21 +1,40 @@
 # src/server/rpc_server.py
 
+import itertools
+import math
+import os
 import socket
 import threading
-import json
-import traceback
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-from src.common.utils import Request, Response, serialize, deserialize
-from src.common.users.mongo_user_service import MongoUserService
-from src.common.users.mongo_auth_service import MongoAuthenticationService
+from src.common.log import get_logger
+from src.common.compression import FrameCompressor, MIN_SIZE, accept
+from src.common.utils import Request, Response, EncodedResponse, MessageReader, FrameTooLarge, encode_message
+from src.common.users.store import create_store
+from src.common.users.auth_service import AuthService
+from src.common.users.bulk_import import user_from_record
 from src.common.users import Role, Token, Credentials, User
 from src.server.game_logic import GameRoom
+from src.server.admission import AdmissionController, Overloaded
+from src.server.bot import BotPlayer
+from src.server.history import RoomHistory
+from src.server.spectators import SpectatorHub
+from src.server.leaderboard import Leaderboard
+from src.server.metrics import Metrics, PrometheusExporter
+from src.server.ratelimit import RateLimiter, RATE_LIMITED
 from src.server.backup_server import BackupServer
+from src.server.handoff import HandoffListener, RESTARTING, request_handoff, send_listener, send_snapshot
+
+log = get_logger("server")
+
+REPLICATE_INTERVAL = 0.5  # seconds between full syncs (the heartbeat) to the backup server
 
 class MindRollServer:
-    def __init__(self, host='0.0.0.0', port=8080):
+    def __init__(self, host='0.0.0.0', port=8080, metrics_port=None, metrics_file=None, stateless_tokens=False,
+                 backend="mongo", store_options=None, history_dir=None, rate_limits=None, max_concurrency=16,
+                 handoff_path=None, compress_min_size=MIN_SIZE):
         self.host = host
         self.port = port
         self.server_socket = None
@@ -23,89 +42,292 @@ class MindRollServer:
 
         self.games = {}
         self.backup_server = None
+        # bumped by every push to the backup server; responses carry it so clients can ask replicas for it
+        self.replication_version = 0
+        self._replication_lock = threading.Lock()
+        self._replicator = None
 
-        self.__user_db = MongoUserService()
-        self.__auth_service = MongoAuthenticationService(self.__user_db)
+        self.metrics = Metrics()
+        # users and tokens: "memory", "sqlite" or "mongo" (which only connects on first use)
+        self.__user_db = create_store(backend, **(store_options or {}))
+        self.__auth_service = AuthService(self.__user_db, stateless=stateless_tokens, metrics=self.metrics)
 
         # { room_id: GameRoom(...) }
         self.games = {}
+        # { room_id: { bot_name: BotPlayer(...) } }
+        self.bots = {}
+        # global scores, persisted to the user store in batches
+        self.leaderboard = Leaderboard(self.__user_db)
+        # every room's events, appended off the request path (None: not recorded)
+        self.history = RoomHistory(history_dir) if history_dir else None
+        # state pushes to spectators, encoded once per change
+        self.spectators = SpectatorHub(lambda room_id: self.games.get(room_id), metrics=self.metrics)
+        # { token: connection_id } - the latest connection that used each token
+        self.session_owners = {}
+        self._connection_ids = itertools.count(1)
+        # token buckets per connection and per session token ({ method: (rate, burst) }; False: off)
+        self.rate_limiter = RateLimiter(rate_limits) if rate_limits is not False else None
+        # at most max_concurrency requests run at once; the rest queue by class, logins/lobby/polls shed first
+        self.admission = AdmissionController(max_concurrency, metrics=self.metrics) if max_concurrency else None
+        # clients that negotiate it get responses of at least this many bytes zlib-compressed (None: never)
+        self.compress_min_size = compress_min_size
+        # zero-downtime restarts: the next process asks for our socket and rooms at handoff_path
+        self.handoff_path = handoff_path
+        self.handoff_pause = None  # seconds requests waited during the handoff that started this server
+        self._handoff_paused_at = None
+        self._handoff_listener = None
+        self._draining = False
+        self._handed_off = threading.Event()
+        self._inflight = 0
+        self._requests = threading.Condition()
+        self._client_sockets = set()
+
+        self.metrics.set_gauge("open_connections", 0)
+        self.metrics.gauge_callback("active_rooms", lambda: len(self.games))
+        self.metrics.gauge_callback("players", lambda: sum(len(g.players) for g in list(self.games.values())))
+        self.metrics.gauge_callback("replication_lag_seconds", self.replication_lag)
+        self.metrics.gauge_callback("auth_cache_hit_rate", lambda: getattr(self.__user_db, "cache_hit_rate", 0.0))
+        self.metrics.gauge_callback("tokens", self.__auth_service.token_count)
+        self.metrics.gauge_callback("scores_pending", self.leaderboard.pending)
+        self.metrics.gauge_callback("spectators", self.spectators.count)
+        if self.history:
+            self.metrics.gauge_callback("history_backlog", self.history.backlog)
+        self.exporter = None
+        self.hash_pool = None  # bcrypt releases the GIL, so threads hash on all cores
+        if metrics_port is not None or metrics_file:
+            self.exporter = PrometheusExporter(self.metrics, path=metrics_file, port=metrics_port)
 
     def set_backup_server(self, backup_server):
-         """Set the backup server for this server."""
-         self.backup_server = backup_server
+        """Set the backup server for this server."""
+        self.backup_server = backup_server
+        self.sync_scores(self.leaderboard.scores)
+        self.sync_data()
+        if self.running:
+            self._start_replicator()
 
-    def sync_data(self):
-         """Sync game data with the backup server."""
-         if self.backup_server:
-            self.backup_server.update_games(self.games)
+    def sync_data(self, room_id=None):
+        """Push one room's state (gone: None) to the backup server, or with no room_id every room."""
+        if not self.backup_server:
+            return
+        with self._replication_lock:
+            self.replication_version += 1
+            if room_id is None:
+                rooms = {room_id: (game.state_json(), self.room_entry(room_id, game))
+                         for room_id, game in list(self.games.items())}
+                self.backup_server.update_games(rooms, self.replication_version)
+            else:
+                game = self.games.get(room_id)
+                room = (game.state_json(), self.room_entry(room_id, game)) if game is not None else None
+                self.backup_server.update_room(room_id, room, self.replication_version)
+
+    def sync_scores(self, scores):
+        if self.backup_server and scores:
+            self.backup_server.update_scores(dict(scores))
+
+    def _on_room_change(self, room_id, event):
+        """ GameRoom listener: every change reaches the backup server before the request is answered. """
+        if self.backup_server and room_id in self.games:
+            self.sync_data(room_id)
+
+    def _start_replicator(self):
+        if self._replicator is None:
+            self._replicator = threading.Thread(target=self._replicate_loop, name="replicator", daemon=True)
+            self._replicator.start()
+
+    def _replicate_loop(self):
+        """
+        Run the room timers that get_game_state polls used to drive (polls may
+        go to replicas now), then send a full sync as the backup's heartbeat.
+        """
+        while self.running:
+            time.sleep(REPLICATE_INTERVAL)
+            for room_id, game in list(self.games.items()):
+                try:
+                    game.check_reconnection_timeout()
+                    game.maybe_clear_result()
+                    self.run_bots(room_id)
+                except Exception as e:
+                    log.warning("Room housekeeping failed", room=room_id, error=e)
+            self.sync_data()
 
     def update_games(self, games):
         """Update the game data from the backup server."""
         self.games = games
 
+    def replication_lag(self):
+        """Seconds since the backup server last applied an update (0 without a backup)."""
+        if not self.backup_server or not self.backup_server.last_update_time:
+            return 0.0
+        return round(time.time() - self.backup_server.last_update_time, 3)
+
     def start(self):
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(5)
+        if self.server_socket is None:  # take_over() brings the predecessor's
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.bind((self.host, self.port))
+            self.server_socket.listen(128)  # every client reconnects at once after a handoff
         self.running = True
-        print(f"MindRoll Server listening on {self.host}:{self.port}")
+        if self.exporter:
+            self.exporter.start()
+        try:
+            self.leaderboard.load()
+        except Exception as e:
+            log.warning("Could not load leaderboard", error=e)
+        self.leaderboard.start()
+        if self.backup_server:
+            self.sync_scores(self.leaderboard.scores)
+            self._start_replicator()
+        self.spectators.start()
+        if self.history:
+            self.history.start()
+        if self._handoff_paused_at is not None:
+            self.handoff_pause = time.time() - self._handoff_paused_at
+            self.metrics.set_gauge("handoff_pause_seconds", round(self.handoff_pause, 4))
+            log.info("Handoff complete", rooms=len(self.games), pause_ms=round(self.handoff_pause * 1000, 1))
+        if self.handoff_path:
+            self._handoff_listener = HandoffListener(self.handoff_path, self._hand_off)
+            self._handoff_listener.start()
+        log.info("MindRoll Server listening", host=self.host, port=self.port)
 
         try:
             while self.running:
                 client_socket, address = self.server_socket.accept()
-                print(f"Client connected from {address}")
+                log.info("Client connected", address=address)
                 threading.Thread(target=self.handle_client, args=(client_socket,)).start()
         except (KeyboardInterrupt, OSError):
             pass
 
+        if self._draining:
+            self._handed_off.wait(30.0)  # the process must not exit before the successor has the rooms
         self.server_socket.close()
-        print("MindRoll Server stopped")
+        log.info("MindRoll Server stopped")
 
     def handle_client(self, client_socket):
         user_token_str = None
+        connection_id = next(self._connection_ids)
+        self.metrics.add_gauge("open_connections", 1)
+        reader = MessageReader(client_socket)
+        pending_out = []  # responses held back while more pipelined requests are buffered
+        compressor = None  # set once the client negotiated compression
+        buckets = self.rate_limiter.connection_buckets() if self.rate_limiter else None
+        self._client_sockets.add(client_socket)
         try:
             while True:
-                data = client_socket.recv(4096)
-                if not data:
-                    print("Client disconnected")
-                    break
-
-                raw_str = data.decode('utf-8').strip()
-                print("Received raw data:", raw_str)
+                request_dict = None
                 try:
-                    request_dict = json.loads(raw_str)
-                    request_obj = Request(
-                        name=request_dict["name"],
-                        args=request_dict.get("args", []),
-                        metadata=request_dict.get("metadata", {})
-                    )
+                    request_dict = reader.read_message()
+                    if request_dict is None:
+                        if self._draining:
+                            # shut down by a handoff: whatever the client sends next is answered with this
+                            self._send_restarting(client_socket, pending_out)
+                        log.info("Client disconnected")
+                        break
+                    log.debug("Received request", sample=100)
+                    request_obj = Request.from_dict(request_dict)
+                except OSError:
+                    log.info("Client connection lost")
+                    break
+                except FrameTooLarge as e:
+                    log.warning("Dropping client", error=e)
+                    self.metrics.inc("parse_errors")
+                    break
                 except Exception as e:
-                    print("Failed to parse request:", e)
-                    error_resp = Response(None, f"Parse Error: {e}")
-                    self.send_response(client_socket, error_resp)
+                    log.warning("Failed to parse request", error=e)
+                    request_id = request_dict.get("id") if isinstance(request_dict, dict) else None
+                    pending_out.append(encode_message(Response(None, f"Parse Error: {e}", request_id)))
+                    self.metrics.inc("parse_errors")
+                    if not reader.has_buffered():
+                        client_socket.sendall(b"".join(pending_out))
+                        pending_out.clear()
                     continue
 
                 # Check if token is present in metadata
+                request_token = None
                 if 'token' in request_obj.metadata:
                     token_dict = request_obj.metadata['token']
                     if 'token' in token_dict:
-                        user_token_str = token_dict['token']
+                        user_token_str = request_token = token_dict['token']
+                        self.session_owners[user_token_str] = connection_id
+
+                with self._requests:
+                    draining = self._draining
+                    if not draining:
+                        self._inflight += 1
+                if draining:
+                    # a successor is taking over; this was not applied, the client retries there
+                    self._send_restarting(client_socket, pending_out, request_obj.id)
+                    break
 
-                try:
-                    response_obj = self.__handle_request(request_obj)
-                except Exception as e:
-                    traceback.print_exc()
-                    response_obj = Response(None, str(e))
+                started = time.perf_counter()
+                wait = 0.0
+                if self.rate_limiter:
+                    wait, scope = self.rate_limiter.check(buckets, request_token, request_obj.name)
+                if wait:
+                    self.metrics.inc("throttled", method=request_obj.name, scope=scope)
+                    response_obj = Response(None, RATE_LIMITED.format(math.ceil(wait * 1000)))
+                else:
+                    try:
+                        if self.admission:
+                            response_obj = self.admission.run(request_obj.name,
+                                                              lambda: self.__handle_request(request_obj))
+                        else:
+                            response_obj = self.__handle_request(request_obj)
+                    except Overloaded as e:
+                        response_obj = Response(None, str(e))
+                    except Exception as e:
+                        log.exception("Request failed", method=request_obj.name)
+                        response_obj = Response(None, str(e))
+                with self._requests:
+                    self._inflight -= 1
+                    if self._draining:
+                        self._requests.notify_all()
+                response_obj.id = request_obj.id
+                if self.backup_server:
+                    response_obj.version = self.replication_version
 
-                self.send_response(client_socket, response_obj)
+                try:
+                    frame = encode_message(response_obj)
+                    pending_out.append(compressor.compress(frame) if compressor else frame)
+                    if not reader.has_buffered():
+                        client_socket.sendall(b"".join(pending_out))
+                        pending_out.clear()
+                except OSError:
+                    log.info("Client connection lost")
+                    break
+                elapsed = time.perf_counter() - started
+                self.metrics.observe(request_obj.name, elapsed, response_obj.error is not None)
+                if self.admission:
+                    self.admission.record(request_obj.name, elapsed)
+
+                if request_obj.name == "negotiate" and compressor is None and (response_obj.result or {}).get("compression"):
+                    # the answer went out uncompressed; everything after it may not
+                    compressor = FrameCompressor(self.compress_min_size, metrics=self.metrics)
+                if request_obj.name == "spectate_room" and response_obj.error is None:
+                    # this connection now only receives state pushes, until the room closes
+                    if pending_out:
+                        client_socket.sendall(b"".join(pending_out))
+                        pending_out.clear()
+                    if not self.spectators.watch(request_obj.args[0], client_socket):
+                        log.info("Spectator disconnected")
+                        break
         finally:
-            if user_token_str:
+            self.metrics.add_gauge("open_connections", -1)
+            self._client_sockets.discard(client_socket)
+            # a resumed session on a newer connection keeps the player connected
+            # (after a handoff the rooms belong to the successor)
+            if user_token_str and self.session_owners.get(user_token_str) == connection_id and not self._draining:
+                del self.session_owners[user_token_str]
                 self.mark_player_disconnected(user_token_str)
             client_socket.close()
 
+    def _send_restarting(self, client_socket, pending_out, request_id=None):
+        """ Answers still held back go first: those requests were applied. """
+        try:
+            client_socket.sendall(b"".join(pending_out) + encode_message(Response(None, RESTARTING.format(100), request_id)))
+        except OSError:
+            pass
+
     def send_response(self, client_socket, response_obj):
-        serialized = serialize(response_obj)
-        client_socket.sendall(serialized.encode('utf-8'))
+        client_socket.sendall(encode_message(response_obj))
 
     def mark_player_disconnected(self, token_str):
         token_obj = self.__auth_service.validate_token_by_str(token_str)
@@ -115,15 +337,13 @@ class MindRollServer:
 
         for room_id, game in list(self.games.items()):
             if username in game.players:
-                if len(game.players) == 1:
-                    del self.games[room_id]
-                    print(f"Room {room_id} removed (only player {username} disconnected).")
-                else:
-                    pinfo = game.players[username]
-                    if pinfo.get("connected", True):
-                        pinfo["connected"] = False
-                        pinfo["disconnected_time"] = time.time()
-                        print(f"⚠️ Player {username} in room {room_id} is now disconnected.")
+                room_bots = self.bots.get(room_id, {})
+                if all(name == username or name in room_bots for name in game.players):
+                    # nobody but bots would be left waiting for this player
+                    self.close_room(room_id)
+                    log.info("Room removed, only player disconnected", room=room_id, player=username)
+                elif game.disconnect_player(username):
+                    log.info("Player disconnected", room=room_id, player=username)
                 break
 
     # ============= Register & Login ============
@@ -133,11 +353,12 @@ class MindRollServer:
 
         username, password = request.args[:2]
         new_user = User(username, username, Role.USER, password)
-        if self.__user_db.get_user_by_username(username):
-                return Response(None, "Username already exists")
         try:
+            # the unique index on username rejects duplicates, no lookup first
             self.__user_db.add_user(new_user)
             return Response(f"Register success for {username}", None)
+        except ValueError as e:
+            return Response(None, str(e))
         except Exception as e:
             return Response(None, f"Registration failed: {e}")
 
@@ -154,6 +375,17 @@ class MindRollServer:
             return Response(None, str(e))
 
 
+    def logout(self, request: Request) -> Response:
+        """
+        logout => the token in metadata stops working, on every server.
+        """
+        token_obj = self.__check_authorization(request)
+        token_str = request.metadata['token']['token']
+        self.__auth_service.revoke(token_str)
+        self.session_owners.pop(token_str, None)
+        log.info("Logged out", player=token_obj.user.username)
+        return Response("Logged out", None)
+
     def __check_authorization(self, request, required_role: Role = Role.USER):
         if 'token' not in request.metadata:
             raise ValueError("Authentication required (no token)")
@@ -175,6 +407,8 @@ class MindRollServer:
             return self.register(request)
         elif request.name == "login":
             return self.login(request)
+        elif request.name == "logout":
+            return self.logout(request)
         elif request.name == "create_room":
             return self.create_room(request)
         elif request.name == "join_room":
@@ -189,18 +423,76 @@ class MindRollServer:
             return self.leave_room(request)
         elif request.name == "reconnect":
             return self.reconnect(request)
+        elif request.name == "resume_session":
+            return self.resume_session(request)
+        elif request.name == "add_bot":
+            return self.add_bot(request)
+        elif request.name == "server_stats":
+            return self.server_stats(request)
+        elif request.name == "bulk_register":
+            return self.bulk_register(request)
+        elif request.name == "leaderboard_top":
+            return self.leaderboard_top(request)
+        elif request.name == "player_rank":
+            return self.player_rank(request)
+        elif request.name == "list_rooms":
+            return self.list_rooms(request)
+        elif request.name == "spectate_room":
+            return self.spectate_room(request)
+        elif request.name == "get_room_history":
+            return self.get_room_history(request)
+        elif request.name == "negotiate":
+            return self.negotiate(request)
         else:
             raise ValueError(f"Unknown method: {request.name}")
 
+    def negotiate(self, request):
+        """
+        negotiate {"compression": ["zlib"]} => {"compression": "zlib" or None, "min_size": bytes}.
+        From then on, responses on this connection of at least min_size bytes arrive as
+        {"z": "<base64 raw deflate>"} frames (see src/common/compression.py).
+        """
+        return Response(accept(request.args[0] if request.args else None, self.compress_min_size), None)
+
     # ============== Game Logic Calls ============
     def create_room(self, request):
         room_id = request.args[0]
         if room_id in self.games:
             return Response(None, "Room already exists")
-        self.games[room_id] = GameRoom(room_id)
-        self.sync_data()
+        self._add_room(GameRoom(room_id))
         return Response(f"Room {room_id} created successfully", None)
 
+    def _add_room(self, game):
+        game.add_listener(self.spectators.on_event)
+        if self.history:
+            game.add_listener(self.history.append)
+        game.add_listener(self._on_room_change)
+        self.games[game.room_id] = game
+        self.sync_data(game.room_id)
+
+    def list_rooms(self, request):
+        """
+        list_rooms [offset] [limit] => {"rooms": [{"room_id", "players", "started", "spectators"}, ...], "total"},
+        sorted by room id (limit <= 200).
+        """
+        try:
+            offset = max(int(request.args[0]), 0) if request.args else 0
+            limit = max(1, min(int(request.args[1]), 200)) if len(request.args) > 1 else 50
+        except (TypeError, ValueError):
+            return Response(None, "Usage: list_rooms [offset] [limit]")
+        room_ids = sorted(self.games)
+        rooms = []
+        for room_id in room_ids[offset:offset + limit]:
+            game = self.games.get(room_id)
+            if game is not None:
+                rooms.append(self.room_entry(room_id, game))
+        return Response({"rooms": rooms, "total": len(room_ids)}, None)
+
+    def room_entry(self, room_id, game):
+        """ One room as list_rooms shows it. """
+        return {"room_id": room_id, "players": len(game.players), "started": game.called_number is not None,
+                "spectators": self.spectators.count(room_id)}
+
     def join_room(self, request):
         token_obj = self.__check_authorization(request)
         real_username = token_obj.user.username
@@ -213,7 +505,7 @@ class MindRollServer:
             return Response(None, "Game Started, can't join")
         try:
             game.add_player(req_player_name)
-            self.sync_data()
+            self.run_bots(room_id)
             return Response(f"{req_player_name} joined room {room_id}", None)
         except ValueError as e:
             return Response(None, str(e))
@@ -226,7 +518,7 @@ class MindRollServer:
         game = self.games[room_id]
         try:
             game.call_number(req_player_name, number)
-            self.sync_data()
+            self.run_bots(room_id)
             return Response(f"{req_player_name} called {number}, next turn: {game.current_turn}", None)
         except ValueError as e:
             return Response(None, str(e))
@@ -242,8 +534,11 @@ class MindRollServer:
 
         game = self.games[room_id]
         try:
+            score_before = game.players.get(req_player_name, {}).get("score", 0)
             result_info = game.reveal_result(req_player_name)
-            self.sync_data()
+            if req_player_name in game.players and req_player_name not in self.bots.get(room_id, {}):
+                score = self.leaderboard.add(req_player_name, game.players[req_player_name]["score"] - score_before)
+                self.sync_scores({req_player_name: score})
             return Response(result_info, None)
         except ValueError as e:
             return Response(None, str(e))
@@ -255,16 +550,10 @@ class MindRollServer:
         game = self.games[room_id]
         game.check_reconnection_timeout()  # check if any player reconnected after 60s
         game.maybe_clear_result()          # check game result after 3s or 5s
+        self.run_bots(room_id)
 
-        game_state = {
-            "players": game.players,
-            "players_order": game.players_order,
-            "current_turn": game.current_turn,
-            "called_number": game.called_number,
-            "winner": game.winner,
-            "last_result_str": game.last_result_str
-        }
-        return Response(game_state, None)
+        # pollers of an unchanged room share one encoding
+        return EncodedResponse(game.state_json())
 
 
     def leave_room(self, request):
@@ -275,9 +564,11 @@ class MindRollServer:
         game = self.games[room_id]
         try:
             emptied = game.remove_player(req_player_name)
-            if emptied:
-                del self.games[room_id]
+            room_bots = self.bots.get(room_id, {})
+            if emptied or all(name in room_bots for name in game.players):
+                self.close_room(room_id)
                 return Response(f"Player {req_player_name} left room {room_id}; room closed (no players).", None)
+            self.run_bots(room_id)
             return Response(f"Player {req_player_name} left room {room_id} successfully.", None)
         except ValueError as e:
             return Response(None, str(e))
@@ -302,15 +593,291 @@ class MindRollServer:
         if time.time() - disconnected_time > 120:
             return Response(None, "Reconnection time (120s) has expired.")
 
-        player_state["connected"] = True
-        player_state["disconnected_time"] = None
+        game.reconnect_player(req_player_name)
         return Response(f"Reconnection successful for {req_player_name}.", None)
 
+    def resume_session(self, request):
+        """
+        resume_session => re-attach a new connection to an existing token.
+        No password check: the token in metadata is validated, then every room
+        the user sits in is marked connected again (same 120s window as reconnect).
+        Returns { "username": ..., "rooms": [room_id, ...] }.
+        """
+        token_obj = self.__check_authorization(request)
+        username = token_obj.user.username
+
+        rooms = []
+        now = time.time()
+        for room_id, game in list(self.games.items()):
+            player_state = game.players.get(username)
+            if player_state is None:
+                continue
+            if not player_state.get("connected", True):
+                disconnected_time = player_state.get("disconnected_time")
+                if disconnected_time is None or now - disconnected_time > 120:
+                    continue
+                game.reconnect_player(username)
+            rooms.append(room_id)
+        log.info("Session resumed", player=username, rooms=len(rooms))
+        return Response({"username": username, "rooms": rooms}, None)
+
+    def close_room(self, room_id):
+        self.games.pop(room_id, None)
+        self.bots.pop(room_id, None)
+        self.spectators.close_room(room_id)
+        self.sync_data(room_id)
+        if self.history:
+            self.history.append(room_id, {"t": time.time(), "type": "close"})
+
+    def spectate_room(self, request):
+        """
+        spectate_room <room_id> => {"room", "spectators"}; the connection then only receives
+        {"room", "version", "state"} pushes (same shape of state as get_game_state), and the
+        error "Room closed" once the room is gone. Spectators are not players.
+        """
+        if not request.args:
+            return Response(None, "Usage: spectate_room <room_id>")
+        room_id = request.args[0]
+        if room_id not in self.games:
+            return Response(None, "Room does not exist")
+        return Response({"room": room_id, "spectators": self.spectators.count(room_id) + 1}, None)
+
+    # ============== History ============
+    def get_room_history(self, request):
+        """
+        get_room_history <room_id> [since] [cursor] [limit] => {"events": [...], "next": cursor or None}.
+        Events are oldest first; pass "next" back as cursor for the following page (limit <= 500).
+        """
+        if self.history is None:
+            return Response(None, "Room history is not recorded on this server")
+        if not request.args:
+            return Response(None, "Usage: get_room_history <room_id> [since] [cursor] [limit]")
+        room_id = request.args[0]
+        try:
+            since = float(request.args[1]) if len(request.args) > 1 and request.args[1] is not None else None
+            cursor = request.args[2] if len(request.args) > 2 else None
+            if cursor is not None:
+                cursor = [int(cursor[0]), int(cursor[1])]
+            limit = max(1, min(int(request.args[3]), 500)) if len(request.args) > 3 else 200
+        except (TypeError, ValueError, IndexError, KeyError):
+            return Response(None, "Usage: get_room_history <room_id> [since] [cursor] [limit]")
+        events, next_cursor = self.history.read(room_id, since=since, cursor=cursor, limit=limit)
+        return Response({"events": events, "next": next_cursor}, None)
+
+    # ============== Bots ============
+    def add_bot(self, request):
+        """
+        add_bot <room_id> [bot_name] => a server-side BotPlayer joins the room.
+        Bots have no socket; they act inline whenever the turn reaches them.
+        """
+        self.__check_authorization(request)
+        room_id = request.args[0]
+        if room_id not in self.games:
+            return Response(None, "Room does not exist")
+        game = self.games[room_id]
+        room_bots = self.bots.setdefault(room_id, {})
+        bot_name = request.args[1] if len(request.args) > 1 else f"bot{len(room_bots) + 1}"
+        try:
+            game.add_player(bot_name)
+        except ValueError as e:
+            return Response(None, str(e))
+        room_bots[bot_name] = BotPlayer(bot_name)
+        self.run_bots(room_id)
+        return Response(f"Bot {bot_name} joined room {room_id}", None)
+
+    def run_bots(self, room_id):
+        """
+        Let bots play while it is their turn. Stops when a human is up,
+        when a round result is still on display, or after a full lap of the table.
+        """
+        room_bots = self.bots.get(room_id)
+        game = self.games.get(room_id)
+        if not room_bots or game is None:
+            return
+        for _ in range(len(game.players) + 1):
+            bot = room_bots.get(game.current_turn)
+            if bot is None or game.last_result_str or len(game.players) < 2:
+                return
+            bot.act(game)
+
+    # ============== Leaderboard ============
+    def leaderboard_top(self, request):
+        """
+        leaderboard_top [k] [offset] => [{"rank", "username", "score"}, ...], best first (k <= 100).
+        """
+        try:
+            k = min(int(request.args[0]), 100) if request.args else 10
+            offset = max(int(request.args[1]), 0) if len(request.args) > 1 else 0
+        except (TypeError, ValueError):
+            return Response(None, "Usage: leaderboard_top [k] [offset]")
+        return Response(self.leaderboard.top(k, offset), None)
+
+    def player_rank(self, request):
+        """
+        player_rank <username> => {"rank", "username", "score", "players"}.
+        """
+        if not request.args:
+            return Response(None, "Usage: player_rank <username>")
+        rank = self.leaderboard.rank(request.args[0])
+        if rank is None:
+            return Response(None, "Player has no score yet")
+        return Response(rank, None)
+
+    # ============== Admin ============
+    def server_stats(self, request):
+        """
+        server_stats => per-method counters/latencies and gauges (admin only).
+        """
+        self.__check_authorization(request, Role.ADMIN)
+        return Response(self.metrics.snapshot(), None)
+
+    def bulk_register(self, request):
+        """
+        bulk_register <users> [ordered] => import summary (admin only).
+        users: [{"username": ..., "password": ..., "name": ..., "role": ...}, ...]
+        """
+        self.__check_authorization(request, Role.ADMIN)
+        if not request.args or not isinstance(request.args[0], list):
+            return Response(None, "Usage: bulk_register <users> [ordered]")
+        ordered = bool(request.args[1]) if len(request.args) > 1 else False
+
+        users = []
+        for index, record in enumerate(request.args[0]):
+            try:
+                user = user_from_record(record)
+                if not user.password:
+                    raise ValueError("Password is required")
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                return Response(None, f"Invalid user at index {index}: {e}")
+            users.append(user)
+
+        if self.hash_pool is None:
+            self.hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+        summary = self.__user_db.add_users(users, ordered=ordered, executor=self.hash_pool)
+        self.metrics.inc("users_imported", summary["inserted"])
+        log.info("Bulk register", inserted=summary["inserted"], duplicates=len(summary["duplicates"]),
+                 users_per_sec=round(summary["users_per_sec"], 1))
+        return Response(summary, None)
+
+    # ============== Handoff ============
+    def take_over(self, listener, snapshot):
+        """
+        Serve on the predecessor's listening socket with its rooms, as returned
+        by request_handoff(); call before start(). Build this server after the
+        request: by then the predecessor has closed the history directory.
+        Players are marked disconnected until their clients resume, so the
+        usual reconnection window applies.
+        """
+        self.server_socket = listener
+        self.host, self.port = self.server_socket.getsockname()[:2]
+        for room_id, names in snapshot["bots"].items():
+            self.bots[room_id] = {name: BotPlayer(name) for name in names}
+        for room in snapshot["rooms"]:
+            game = GameRoom.restore(room)
+            self._add_room(game)
+            for username in list(game.players):
+                if username not in self.bots.get(game.room_id, {}):
+                    game.disconnect_player(username)
+        self._handoff_paused_at = snapshot["paused_at"]
+        log.info("Took over", rooms=len(self.games), port=self.port)
+
+    def _hand_off(self, conn):
+        """
+        Give the listening socket, then the rooms, to the successor on `conn`.
+        Connections keep queueing on the shared socket meanwhile; requests in
+        flight finish, newer ones are answered RESTARTING. Then this server stops.
+        """
+        try:
+            with conn:
+                send_listener(conn, self.server_socket)
+                paused_at = time.time()
+                with self._requests:
+                    self._draining = True
+                    drained = self._requests.wait_for(lambda: self._inflight == 0, timeout=5.0)
+                self.running = False
+                self._wake_accept()
+                snapshot = {"rooms": [game.snapshot() for game in list(self.games.values())],
+                            "bots": {room_id: list(bots) for room_id, bots in self.bots.items()},
+                            "paused_at": paused_at}
+                self.stop()  # scores and history are persisted before the successor loads them
+                send_snapshot(conn, snapshot)
+            for client_socket in list(self._client_sockets):
+                try:
+                    client_socket.shutdown(socket.SHUT_RD)  # its thread answers RESTARTING, then closes
+                except OSError:
+                    pass
+            log.info("Handed off", rooms=len(snapshot["rooms"]), drained=drained,
+                     snapshot_ms=round((time.time() - paused_at) * 1000, 1))
+        finally:
+            self._handed_off.set()
+
+    def _wake_accept(self):
+        """ Return start() from accept(): only this process accepts until the successor has the rooms. """
+        host, port = self.server_socket.getsockname()[:2]
+        try:
+            socket.create_connection(("127.0.0.1" if host in ("0.0.0.0", "") else host, port), timeout=1).close()
+        except OSError:
+            pass
+
     def stop(self):
         self.running = False
-        self.server_socket.close()
+        if self.hash_pool:
+            self.hash_pool.shutdown(wait=False)
+        self.__auth_service.stop()
+        self.leaderboard.stop()
+        self.spectators.stop()
+        if self.history:
+            self.history.stop()
+        if self.exporter:
+            self.exporter.stop()
+        if self._handoff_listener:
+            self._handoff_listener.close()
+        if self.server_socket:
+            self.server_socket.close()
 
 if __name__ == '__main__':
-    server = MindRollServer(port=8080)
-    print("MindRoll Server with 'pull-style' game state for reveal_result -> all players see same info next poll.")
+    import argparse
+    parser = argparse.ArgumentParser(description="MindRoll game server")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this local port")
+    parser.add_argument("--metrics-file", default=None, help="periodically write Prometheus metrics to this file")
+    parser.add_argument("--stateless-tokens", action="store_true",
+                        help="issue HMAC-signed tokens validated without a database lookup")
+    parser.add_argument("--backend", choices=["memory", "sqlite", "mongo"], default="mongo",
+                        help="where users and tokens are stored")
+    parser.add_argument("--db-path", default="mindroll.db", help="database file for --backend sqlite")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017", help="for --backend mongo")
+    parser.add_argument("--history-dir", default="history", help="where room event segments are written")
+    parser.add_argument("--no-rate-limit", action="store_true", help="serve every request (e.g. for load tests)")
+    parser.add_argument("--max-concurrency", type=int, default=16,
+                        help="requests running at once before the rest queue by priority (0: no admission control)")
+    parser.add_argument("--handoff", default=None, metavar="PATH",
+                        help="unix socket for zero-downtime restarts: take over from the server waiting there, "
+                             "then wait there for the next one (needs --backend sqlite/mongo or --stateless-tokens)")
+    parser.add_argument("--compress-min-size", type=int, default=MIN_SIZE,
+                        help="compress responses of at least this many bytes for clients that negotiate it")
+    parser.add_argument("--no-compression", action="store_true", help="never compress responses")
+    parser.add_argument("--backup-port", type=int, default=None,
+                        help="also run a read-only replica on this port (get_game_state, list_rooms, leaderboard)")
+    args = parser.parse_args()
+    if args.stateless_tokens and not os.environ.get("MINDROLL_TOKEN_SECRET"):
+        parser.error("--stateless-tokens needs MINDROLL_TOKEN_SECRET set to the secret shared by all servers")
+    store_options = {"sqlite": {"path": args.db_path}, "mongo": {"uri": args.mongo_uri}}.get(args.backend, {})
+    handoff = None
+    if args.handoff and os.path.exists(args.handoff):
+        try:
+            handoff = request_handoff(args.handoff)
+        except OSError as e:
+            log.warning("No server to take over from", path=args.handoff, error=e)
+    server = MindRollServer(port=args.port, metrics_port=args.metrics_port, metrics_file=args.metrics_file,
+                            stateless_tokens=args.stateless_tokens, backend=args.backend, store_options=store_options,
+                            history_dir=args.history_dir, rate_limits=False if args.no_rate_limit else None,
+                            max_concurrency=args.max_concurrency, handoff_path=args.handoff,
+                            compress_min_size=None if args.no_compression else args.compress_min_size)
+    if handoff:
+        server.take_over(*handoff)
+    if args.backup_port is not None:
+        backup = BackupServer(port=args.backup_port, compress_min_size=server.compress_min_size)
+        server.set_backup_server(backup)
+        threading.Thread(target=backup.start, name="backup", daemon=True).start()
     server.start()
@@ -0,0 +1,172 @@
+# src/server/spectators.py
+
+import json
+import select
+import threading
+
+from src.common.log import get_logger
+from src.common.utils import EncodedResponse, Response, encode_message
+
+log = get_logger("spectators")
+
+
+class Watcher:
+    """ One spectating connection and the newest frame it has not been sent yet. """
+
+    __slots__ = ("sock", "frame", "version", "wake", "lock", "closed", "skipped")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.frame = None    # newest unsent frame; a newer one replaces it
+        self.version = -1
+        self.wake = threading.Event()
+        self.lock = threading.Lock()
+        self.closed = False  # the room is gone
+        self.skipped = 0
+
+    def offer(self, frame, version):
+        with self.lock:
+            if version <= self.version:
+                return
+            if self.frame is not None:
+                self.skipped += 1  # still busy with an older state; only the latest is sent
+            self.frame, self.version = frame, version
+        self.wake.set()
+
+    def take(self):
+        with self.lock:
+            frame, self.frame = self.frame, None
+            return frame
+
+
+class SpectatorHub:
+    """
+    Pushes room states to spectators.
+
+    Spectators are not players: they never appear in GameRoom.players, so
+    they do not count for turns or reconnection timeouts. Room listeners only
+    mark the room dirty; a broadcaster thread encodes each dirty room's state
+    once and hands the same bytes to every watcher of the room. Every watcher
+    is served by its own connection thread and holds at most one pending frame,
+    so a slow spectator gets the latest state when it catches up instead of a
+    growing backlog.
+    """
+
+    def __init__(self, get_game, metrics=None, send_timeout=10.0):
+        self.get_game = get_game  # room_id -> GameRoom or None
+        self.metrics = metrics
+        self.send_timeout = send_timeout
+        self.rooms = {}  # { room_id: set(Watcher) }
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def count(self, room_id=None) -> int:
+        with self._lock:
+            if room_id is not None:
+                return len(self.rooms.get(room_id, ()))
+            return sum(len(watchers) for watchers in self.rooms.values())
+
+    # ---------------------- Broadcasting ----------------------
+    def on_event(self, room_id, event):
+        """ GameRoom listener. """
+        if room_id in self.rooms:
+            self._dirty.add(room_id)
+            self._wake.set()
+
+    def encode(self, room_id, game):
+        version = game.version
+        head = json.dumps({"room": room_id, "version": version})[:-1].encode("utf-8")
+        return EncodedResponse(head + b', "state": ' + game.state_json() + b"}").encode()
+
+    def publish(self, room_id):
+        """ Encode the room's state once and offer it to all of its watchers. """
+        with self._lock:
+            watchers = list(self.rooms.get(room_id, ()))
+        if not watchers:
+            return
+        game = self.get_game(room_id)
+        if game is None:
+            self.close_room(room_id)
+            return
+        version = game.version
+        frame = self.encode(room_id, game)
+        for watcher in watchers:
+            watcher.offer(frame, version)
+
+    def close_room(self, room_id):
+        with self._lock:
+            watchers = self.rooms.pop(room_id, ())
+        for watcher in watchers:
+            watcher.closed = True
+            watcher.wake.set()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._broadcast_loop, name="spectators", daemon=True)
+        self._thread.start()
+
+    def _broadcast_loop(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            while self._dirty:
+                room_id = self._dirty.pop()
+                try:
+                    self.publish(room_id)
+                except Exception as e:
+                    log.warning("Broadcast failed", room=room_id, error=e)
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        for room_id in list(self.rooms):
+            self.close_room(room_id)
+
+    # ---------------------- Watching ----------------------
+    def watch(self, room_id, sock) -> bool:
+        """
+        Serve one spectator on the calling connection thread until the room
+        closes (returns True, the connection can go back to RPCs) or the
+        spectator goes away (returns False).
+        """
+        game = self.get_game(room_id)
+        if game is None:
+            return True
+        watcher = Watcher(sock)
+        with self._lock:
+            self.rooms.setdefault(room_id, set()).add(watcher)
+        watcher.offer(self.encode(room_id, game), game.version)
+        log.info("Spectator joined", room=room_id, spectators=self.count(room_id))
+        timeout = sock.gettimeout()
+        sock.settimeout(self.send_timeout)
+        try:
+            while True:
+                watcher.wake.wait(1.0)
+                watcher.wake.clear()
+                frame = watcher.take()
+                if frame is not None:
+                    sock.sendall(frame)
+                if watcher.closed:
+                    sock.sendall(encode_message(Response(None, "Room closed")))
+                    return True
+                if select.select([sock], [], [], 0)[0] and not sock.recv(4096):
+                    return False  # spectators only listen; anything else is discarded
+        except OSError:  # includes the send timeout
+            return False
+        finally:
+            with self._lock:
+                watchers = self.rooms.get(room_id)
+                if watchers is not None:
+                    watchers.discard(watcher)
+                    if not watchers:
+                        del self.rooms[room_id]
+            if self.metrics and watcher.skipped:
+                self.metrics.inc("spectator_frames_skipped", watcher.skipped)
+            try:
+                sock.settimeout(timeout)
+            except OSError:
+                pass
+            log.info("Spectator left", room=room_id)
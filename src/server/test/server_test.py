@@ -17,6 +17,10 @@ class TestIntegration(unittest.TestCase):
         self.backup_server = BackupServer()
         self.main_server.set_backup_server(self.backup_server)
 
+    def tearDown(self):
+        self.main_server.stop()
+        self.backup_server.stop()
+
     def test_failover(self):
         # 
         main_thread = threading.Thread(target=self.main_server.start)
@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.common.utils import Request
+from src.server.admission import AdmissionController, Overloaded
+from src.server.metrics import Metrics
+from src.server.rpc_server import MindRollServer
+
+
+class TestAdmissionController(unittest.TestCase):
+    def controller(self, **kwargs):
+        self.metrics = Metrics()
+        kwargs.setdefault("interval", 60.0)
+        return AdmissionController(metrics=self.metrics, **kwargs)
+
+    def submit(self, controller, method, fn):
+        thread = threading.Thread(target=controller.run, args=(method, fn), daemon=True)
+        thread.start()
+        return thread
+
+    def test_most_important_first(self):
+        controller = self.controller(concurrency=1)
+        release, order = threading.Event(), []
+        blocker = self.submit(controller, "call_number", release.wait)
+        while controller._free:
+            time.sleep(0.01)  # the only slot is taken
+        threads = []
+        for method in ["login", "get_game_state", "list_rooms", "reveal_result"]:
+            threads.append(self.submit(controller, method, lambda method=method: order.append(method)))
+            while controller.depth() < len(threads):
+                time.sleep(0.01)
+        release.set()
+        for thread in [blocker] + threads:
+            thread.join(5)
+        self.assertEqual(order, ["reveal_result", "get_game_state", "list_rooms", "login"])
+        self.assertEqual(self.metrics.snapshot()["gauges"]["queue_depth_login"], 0)
+        self.assertEqual(self.metrics.snapshot()["timings"]["queue_wait.login"]["count"], 1)
+
+    def test_logins_cannot_take_every_slot(self):
+        controller = self.controller(concurrency=2, login_slots=1)
+        release = threading.Event()
+        logins = [self.submit(controller, "login", release.wait) for _ in range(2)]
+        while controller.depth() < 1:
+            time.sleep(0.01)  # the second login waits for the login slot
+        self.assertEqual(controller.run("call_number", lambda: "called"), "called")
+        release.set()
+        for thread in logins:
+            thread.join(5)
+        self.assertEqual((controller._free, controller.depth()), (2, 0))
+
+    def test_shed_order(self):
+        controller = self.controller(concurrency=2)
+        shed_at = {}
+        for level in range(1, 4):
+            controller.adjust(1.0)  # way over target: one level up
+            self.assertEqual(controller.level, level)
+            for method in ["login", "list_rooms", "get_game_state", "call_number"]:
+                try:
+                    controller.run(method, lambda: None)
+                except Overloaded as e:
+                    self.assertRegex(str(e), r"^Server overloaded, retry after \d+ ms$")
+                    shed_at.setdefault(method, level)
+        self.assertEqual(shed_at, {"login": 1, "list_rooms": 2, "get_game_state": 3})
+        self.assertEqual(self.metrics.counter("shed", method="login", reason="admission"), 3)
+
+        controller.adjust(0.0)
+        self.assertEqual(controller.level, 2)
+        controller.adjust(controller.target_delay * 0.75)  # between half and full target: stays
+        self.assertEqual(controller.level, 2)
+
+    def test_slow_critical_requests_raise_the_level(self):
+        controller = self.controller(concurrency=2, interval=0.0)
+        for _ in range(10):
+            controller.record("call_number", 0.2)
+            controller.record("get_game_state", 0.0)
+        with self.assertRaises(Overloaded):
+            controller.run("login", lambda: None)  # the check happens on arrival
+        self.assertEqual(controller.level, 1)
+
+    def test_errors_reach_the_caller(self):
+        controller = self.controller(concurrency=1)
+        with self.assertRaises(ZeroDivisionError):
+            controller.run("call_number", lambda: 1 / 0)
+        self.assertEqual(controller._free, 1)
+
+
+class TestListRooms(unittest.TestCase):
+    def test_list_rooms(self):
+        server = MindRollServer(port=0, backend="memory")
+        self.addCleanup(server.stop)
+        for room_id in ["b", "a", "c"]:
+            server.create_room(Request("create_room", [room_id]))
+        server.games["a"].add_player("alice")
+        result = server.list_rooms(Request("list_rooms", [0, 2])).result
+        self.assertEqual(result["total"], 3)
+        self.assertEqual(result["rooms"], [{"room_id": "a", "players": 1, "started": False, "spectators": 0},
+                                           {"room_id": "b", "players": 0, "started": False, "spectators": 0}])
+        self.assertEqual([room["room_id"] for room in server.list_rooms(Request("list_rooms", [2])).result["rooms"]],
+                         ["c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import shutil
+import tempfile
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.assets import DiceAtlas
+
+ASSET_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "dice")
+
+
+class TestDiceAtlas(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_lazy_and_cached(self):
+        atlas = DiceAtlas(ASSET_DIR, (40, 40), cache_dir=self.cache_dir)
+        self.assertIsNone(atlas.surface)
+        face = atlas.get("blue", 4)
+        self.assertEqual(face.get_size(), (40, 40))
+        self.assertFalse(atlas.loaded_from_cache)
+
+        warm = DiceAtlas(ASSET_DIR, (40, 40), cache_dir=self.cache_dir).load()
+        self.assertTrue(warm.loaded_from_cache)
+        self.assertEqual(warm.get("blue", 4).get_at((20, 20)), face.get_at((20, 20)))
+
+    def test_cache_keyed_by_size(self):
+        small = DiceAtlas(ASSET_DIR, (40, 40), cache_dir=self.cache_dir)
+        large = DiceAtlas(ASSET_DIR, (50, 50), cache_dir=self.cache_dir)
+        self.assertNotEqual(small.cache_path(), large.cache_path())
+
+    def test_corrupt_cache_is_rebuilt(self):
+        atlas = DiceAtlas(ASSET_DIR, (40, 40), cache_dir=self.cache_dir)
+        with open(atlas.cache_path(), "wb") as f:
+            f.write(b"truncated")
+        atlas.load()
+        self.assertFalse(atlas.loaded_from_cache)
+        self.assertEqual(atlas.get("red", 6).get_size(), (40, 40))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.server.bot import BotPlayer, dice_sum_counts, prob_sum_at_most
+from src.server.game_logic import GameRoom
+from src.server.rpc_server import MindRollServer
+from src.common.utils import Request
+
+
+class TestBot(unittest.TestCase):
+    def test_dice_sum_counts(self):
+        self.assertEqual(dice_sum_counts(1), (0, 1, 1, 1, 1, 1, 1))
+        counts = dice_sum_counts(3)
+        self.assertEqual(sum(counts), 6 ** 3)
+        self.assertEqual(counts[10], 27)
+
+    def test_prob_sum_at_most(self):
+        self.assertEqual(prob_sum_at_most(2, 1), 0.0)
+        self.assertEqual(prob_sum_at_most(2, 12), 1.0)
+        self.assertAlmostEqual(prob_sum_at_most(2, 7), 21 / 36)
+
+    def test_first_turn_calls(self):
+        room = GameRoom("room1")
+        room.add_player("bot1")
+        room.add_player("player2")
+        action, number = BotPlayer("bot1").decide(room)
+        self.assertEqual(action, "call")
+        self.assertEqual(number, 8)
+
+    def test_reveals_on_high_call(self):
+        room = GameRoom("room1")
+        room.add_player("bot1")
+        room.add_player("player2")
+        room.called_number = 12
+        action, _ = BotPlayer("bot1").act(room)
+        self.assertEqual(action, "reveal")
+        self.assertEqual(room.players["bot1"]["score"], 1)
+
+
+class TestBotRooms(unittest.TestCase):
+    def test_disconnect_closes_bot_only_room(self):
+        server = MindRollServer(port=0, backend="memory")
+        self.addCleanup(server.stop)
+        server.register(Request("register", ["alice", "pw"]))
+        token = server.login(Request("login", ["alice", "pw"])).result["token"]
+        metadata = {"token": {"token": token}}
+        server.create_room(Request("create_room", ["room1"]))
+        server.join_room(Request("join_room", ["room1", "alice"], metadata))
+        server.add_bot(Request("add_bot", ["room1"], metadata))
+
+        server.mark_player_disconnected(token)
+        self.assertNotIn("room1", server.games)
+        self.assertNotIn("room1", server.bots)
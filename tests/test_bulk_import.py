@@ -0,0 +1,91 @@
+import shutil
+import tempfile
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from benchmarks.fake_mongo import FakeMongoClient
+from src.common.log import set_level
+from src.common.users import Role, User
+from src.common.users.bulk_import import read_users
+from src.common.users.mongo_user_service import MongoUserService
+
+
+class TestReadUsers(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        set_level("ERROR")  # bad rows are logged as warnings
+
+    def tearDown(self):
+        set_level("INFO")
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_csv(self):
+        path = self.write("users.csv", "username,password,name,role\n"
+                                       "alice,pw1,Alice,\n"
+                                       "bob,pw2,,admin\n"
+                                       ",pw3,,\n"
+                                       "carol,pw4,,wizard\n")
+        errors = []
+        users = list(read_users(path, errors=errors))
+        self.assertEqual([(u.username, u.name, u.role) for u in users],
+                         [("alice", "Alice", Role.USER), ("bob", "bob", Role.ADMIN)])
+        self.assertEqual(users[0].password, "pw1")
+        self.assertEqual(errors, [4, 5])
+
+    def test_jsonl(self):
+        path = self.write("users.jsonl", '{"username": "dave", "password": "x"}\n'
+                                         '\n'
+                                         'not json\n'
+                                         '{"username": "erin"}\n')
+        errors = []
+        users = list(read_users(path, errors=errors))
+        self.assertEqual([u.username for u in users], ["dave"])
+        self.assertEqual(errors, [3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestAddUsers(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeMongoClient()
+        self.service = MongoUserService(client=self.client)
+        self.service.add_user(User("alice", None, None, "pw"))
+
+    def users(self, *names):
+        return [User(name, None, None, "pw") for name in names]
+
+    def test_unordered_skips_duplicates(self):
+        self.client.reset_ops()
+        # alice exists already; the second bob is only caught by insert_many (BulkWriteError)
+        summary = self.service.add_users(self.users("bob", "alice", "carol", "bob"))
+        self.assertEqual(summary["inserted"], 2)
+        self.assertEqual(sorted(summary["duplicates"]), ["alice", "bob"])
+        self.assertEqual(summary["failed"], 0)
+        self.assertFalse(summary["stopped"])
+        self.assertEqual(self.client.ops[("users", "insert_many")], 1)
+        self.assertIsNotNone(self.service.get_user_by_username("carol"))
+
+    def test_ordered_stops_at_first_duplicate(self):
+        summary = self.service.add_users(self.users("bob", "alice", "carol"), ordered=True)
+        self.assertEqual(summary["inserted"], 1)
+        self.assertEqual(summary["duplicates"], ["alice"])
+        self.assertTrue(summary["stopped"])
+        self.assertIsNone(self.service.get_user_by_username("carol"))
+
+    def test_ordered_stops_inside_batch(self):
+        summary = self.service.add_users(self.users("bob", "bob", "carol"), ordered=True)
+        self.assertEqual(summary["inserted"], 1)
+        self.assertEqual(summary["duplicates"], ["bob"])
+        self.assertTrue(summary["stopped"])
+        self.assertIsNone(self.service.get_user_by_username("carol"))
@@ -0,0 +1,92 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.pipelined_client import PipelinedMindRollClient
+from src.client.rpc_client import MindRollClient
+from src.common.compression import FrameCompressor, FrameDecompressor, accept
+from src.common.utils import MessageReader, Request, Response, encode_message
+from src.server.rpc_server import MindRollServer
+
+
+def page(n):
+    return encode_message(Response([{"rank": i + 1, "username": f"player{i}", "score": 1000 - i} for i in range(n)]))
+
+
+class TestFrames(unittest.TestCase):
+    def test_round_trip(self):
+        compressor, decompressor = FrameCompressor(min_size=1024), FrameDecompressor()
+        small = encode_message(Response("Player joined"))
+        self.assertIs(compressor.compress(small), small)
+
+        first = compressor.compress(page(40))
+        self.assertTrue(first.startswith(b'{"z": "') and first.endswith(b'"}\n'))
+        self.assertEqual(first.count(b"\n"), 1)
+        self.assertLess(len(first), len(page(40)) / 3)
+        second = compressor.compress(page(40))
+        self.assertLess(len(second), len(first) / 4)  # the window still holds the first page
+
+        self.assertEqual(decompressor.decompress(json.loads(small)), json.loads(small))
+        for frame in (first, second):
+            self.assertEqual(decompressor.decompress(json.loads(frame)), json.loads(page(40)))
+
+    def test_message_reader(self):
+        ours, theirs = socket.socketpair()
+        self.addCleanup(ours.close)
+        self.addCleanup(theirs.close)
+        compressor = FrameCompressor(min_size=1024)
+        theirs.sendall(b"".join(compressor.compress(frame) for frame in (page(50), page(2), page(200))))
+        reader = MessageReader(ours)
+        reader.decompressor = FrameDecompressor()
+        self.assertEqual([len(reader.read_message()["result"]) for _ in range(3)], [50, 2, 200])
+
+    def test_accept(self):
+        self.assertEqual(accept({"compression": ["brotli", "zlib"]}, 512), {"compression": "zlib", "min_size": 512})
+        self.assertIsNone(accept({"compression": ["brotli"]})["compression"])
+        self.assertIsNone(accept(None)["compression"])
+        self.assertIsNone(accept({"compression": ["zlib"]}, None)["compression"])
+
+
+class TestNegotiation(unittest.TestCase):
+    def start(self, **kwargs):
+        server = MindRollServer(host="127.0.0.1", port=0, backend="memory", rate_limits=False, **kwargs)
+        threading.Thread(target=server.start, daemon=True).start()
+        while not server.running:
+            time.sleep(0.01)
+        self.addCleanup(server.stop)
+        for i in range(150):
+            server.create_room(Request("create_room", [f"room{i:03}"]))
+        return server, ("127.0.0.1", server.server_socket.getsockname()[1])
+
+    def client(self, cls, address, **kwargs):
+        client = cls(address, auto_reconnect=False, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_large_responses_are_compressed(self):
+        server, address = self.start()
+        plain = self.client(MindRollClient, address).list_rooms(0, 150).result
+        self.assertEqual(len(plain["rooms"]), 150)
+        for cls in (MindRollClient, PipelinedMindRollClient):
+            client = self.client(cls, address, compression=True)
+            self.assertEqual(client.list_rooms(0, 150).result, plain)
+            self.assertEqual(client.get_game_state("room000").result["players"], {})
+        self.assertEqual(server.metrics.counter("compressed_frames"), 2)  # the two lobby pages only
+        self.assertGreater(server.metrics.counter("compression_saved_bytes"), len(json.dumps(plain)))
+
+    def test_server_without_compression(self):
+        server, address = self.start(compress_min_size=None)
+        client = self.client(MindRollClient, address, compression=True)
+        self.assertEqual(client.list_rooms(0, 150).result["total"], 150)
+        self.assertIsNone(client.reader.decompressor)
+        self.assertEqual(server.metrics.counter("compressed_frames"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import unittest
 import sys
 import os
@@ -33,4 +34,14 @@ class TestGameLogic(unittest.TestCase):
         room = GameRoom("room1")
         room.add_player("player1")
         room.remove_player("player1")
-        self.assertNotIn("player1", room.players)
\ No newline at end of file
+        self.assertNotIn("player1", room.players)
+
+    def test_state_json_cache(self):
+        room = GameRoom("room1")
+        room.add_player("player1")
+        room.add_player("player2")
+        first = room.state_json()
+        self.assertIs(room.state_json(), first)  # unchanged room: same bytes
+        room.call_number("player1", 10)
+        self.assertEqual(json.loads(room.state_json()), json.loads(json.dumps(room.state())))
+        self.assertEqual(json.loads(room.state_json())["called_number"], 10)
\ No newline at end of file
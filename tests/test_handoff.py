@@ -0,0 +1,78 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.rpc_client import MindRollClient
+from src.server.game_logic import GameRoom
+from src.server.handoff import request_handoff
+from src.server.rpc_server import MindRollServer
+
+
+class TestGameRoomSnapshot(unittest.TestCase):
+    def test_restore(self):
+        game = GameRoom("room1")
+        game.add_player("alice")
+        game.add_player("bob")
+        game.call_number("alice", 14)
+        restored = GameRoom.restore(game.snapshot())
+        self.assertEqual(restored.state_json(), game.state_json())
+        self.assertEqual((restored.room_id, restored.version), ("room1", game.version))
+        restored.call_number("bob", 15)  # and it plays on
+        self.assertEqual(restored.current_turn, "alice")
+
+
+class TestHandoff(unittest.TestCase):
+    def server(self, directory):
+        return MindRollServer(host="127.0.0.1", port=0, backend="sqlite",
+                              store_options={"path": os.path.join(directory, "users.db")},
+                              rate_limits=False, handoff_path=os.path.join(directory, "handoff.sock"))
+
+    def start(self, server):
+        threading.Thread(target=server.start, daemon=True).start()
+        while not server.running:
+            time.sleep(0.01)
+        self.addCleanup(server.stop)
+
+    def test_clients_resume_on_the_successor(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        old = self.server(directory.name)
+        self.start(old)
+        while not os.path.exists(old.handoff_path):
+            time.sleep(0.01)
+        address = ("127.0.0.1", old.server_socket.getsockname()[1])
+
+        alice, bob = MindRollClient(address), MindRollClient(address)
+        for client, name in ((alice, "alice"), (bob, "bob")):
+            self.addCleanup(client.close)
+            client.register(name, "pw")
+            client.login(name, "pw")
+        alice.create_room("duel")
+        alice.join_room("duel", "alice")
+        bob.join_room("duel", "bob")
+        self.assertIsNone(alice.call_number("duel", "alice", 14).error)
+
+        handoff = request_handoff(old.handoff_path)
+        new = self.server(directory.name)
+        new.take_over(*handoff)
+        self.start(new)
+        self.assertEqual(new.port, address[1])
+        self.assertFalse(old.running)
+        while old.metrics.snapshot()["gauges"]["open_connections"]:
+            time.sleep(0.01)  # the old process has let go of every client
+
+        # bob's next call is cut off by the old process, resent to the new one after resume_session
+        self.assertIsNone(bob.call_number("duel", "bob", 15).error)
+        state = alice.get_game_state("duel").result
+        self.assertEqual((state["called_number"], state["current_turn"]), (15, "alice"))
+        self.assertTrue(all(player["connected"] for player in state["players"].values()))
+        self.assertLess(new.handoff_pause, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.common.utils import Request
+from src.server.game_logic import GameRoom
+from src.server.history import RoomHistory
+from src.server.rpc_server import MindRollServer
+
+
+class TestRoomHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def test_game_events(self):
+        events = []
+        game = GameRoom("room1")
+        game.add_listener(lambda room_id, event: events.append((room_id, event)))
+        game.add_player("alice")
+        game.add_player("bob")
+        dice = {name: p["dice_number"] for name, p in game.players.items()}
+        game.call_number("alice", 20)
+        game.reveal_result("bob")
+        game.disconnect_player("alice")
+        game.remove_player("bob")
+
+        self.assertEqual([event["type"] for _, event in events],
+                         ["join", "join", "call", "reveal", "disconnect", "leave"])
+        reveal = events[3][1]
+        self.assertEqual(reveal["dice"], dice)  # the dice of the round, not the re-rolled ones
+        self.assertEqual(reveal["total"], sum(dice.values()))
+        self.assertTrue(all(room_id == "room1" for room_id, _ in events))
+
+    def test_pages_and_reopen(self):
+        history = RoomHistory(self.directory, segment_size=2048)
+        for i in range(300):
+            history.append(f"room{i % 3}", {"t": float(i), "type": "call", "number": i})
+            if i % 7 == 0:
+                history.flush()  # many small blocks across several segments
+        history.stop()
+        self.assertGreater(len([n for n in os.listdir(self.directory) if n.endswith(".idx")]), 1)
+
+        history = RoomHistory(self.directory)
+        self.addCleanup(history.stop)
+        numbers, cursor = [], None
+        while True:
+            events, cursor = history.read("room1", cursor=cursor, limit=17)
+            numbers += [event["number"] for event in events]
+            if cursor is None:
+                break
+        self.assertEqual(numbers, list(range(1, 300, 3)))
+
+        events, _ = history.read("room2", since=250.0, limit=500)
+        self.assertEqual([event["number"] for event in events], list(range(251, 300, 3)))
+        self.assertEqual(history.read("nowhere"), ([], None))
+
+    def test_torn_block_is_dropped(self):
+        history = RoomHistory(self.directory)
+        history.append("room1", {"t": 1.0, "type": "join", "player": "alice"})
+        history.stop()
+        with open(os.path.join(self.directory, "segment-000001.log"), "ab") as f:
+            f.write(b"\x10\x00\x00")  # half a block header
+
+        history = RoomHistory(self.directory)
+        history.append("room1", {"t": 2.0, "type": "leave", "player": "alice"})
+        history.stop()
+        history = RoomHistory(self.directory)
+        self.addCleanup(history.stop)
+        self.assertEqual([event["type"] for event in history.read("room1")[0]], ["join", "leave"])
+
+    def test_get_room_history_rpc(self):
+        server = MindRollServer(port=0, backend="memory", history_dir=self.directory)
+        self.addCleanup(server.stop)
+        server.create_room(Request("create_room", ["room1"]))
+        server.register(Request("register", ["alice", "pw"]))
+        token = server.login(Request("login", ["alice", "pw"])).result["token"]
+        metadata = {"token": {"token": token}}
+        server.join_room(Request("join_room", ["room1", "alice"], metadata))
+        server.add_bot(Request("add_bot", ["room1"], metadata))
+        server.leave_room(Request("leave_room", ["room1", "alice"]))
+        server.history.flush()
+
+        response = server.get_room_history(Request("get_room_history", ["room1", None, None, 2]))
+        self.assertEqual([event["type"] for event in response.result["events"]], ["join", "join"])
+        response = server.get_room_history(Request("get_room_history", ["room1", None, response.result["next"]]))
+        self.assertEqual([event["type"] for event in response.result["events"]], ["leave", "close"])
+        self.assertIsNone(response.result["next"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import bisect
+import random
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.common.users.store import create_store
+from src.server.leaderboard import Leaderboard, SkipList
+
+
+class TestSkipList(unittest.TestCase):
+    def test_matches_sorted_list(self):
+        rng = random.Random(7)
+        skiplist, reference = SkipList(seed=7), []
+        for _ in range(3000):
+            if reference and rng.random() < 0.4:
+                key = rng.choice(reference)
+                reference.remove(key)
+                skiplist.remove(key)
+            else:
+                key = rng.random()
+                bisect.insort(reference, key)
+                skiplist.insert(key)
+        self.assertEqual(len(skiplist), len(reference))
+        for i in range(0, len(reference), 13):
+            self.assertEqual(skiplist[i], reference[i])
+            self.assertEqual(skiplist.index(reference[i]), i)
+        self.assertEqual(skiplist.slice(5, 20), reference[5:25])
+        with self.assertRaises(KeyError):
+            skiplist.remove(2.0)
+
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.store = create_store("memory")
+        self.board = Leaderboard(self.store, batch_size=2)
+
+    def test_ranking(self):
+        for name, delta in [("alice", 1), ("bob", 1), ("bob", 1), ("carol", -1), ("alice", 1), ("alice", 1)]:
+            self.board.add(name, delta)
+        self.assertEqual([(e["rank"], e["username"], e["score"]) for e in self.board.top(2)],
+                         [(1, "alice", 3), (2, "bob", 2)])
+        self.assertEqual(self.board.top(5, offset=2), [{"rank": 3, "username": "carol", "score": -1}])
+        self.assertEqual(self.board.rank("bob"), {"rank": 2, "username": "bob", "score": 2, "players": 3})
+        self.assertIsNone(self.board.rank("dave"))
+
+    def test_write_behind(self):
+        self.board.add("alice", 1)
+        self.board.add("alice", 1)
+        self.board.add("bob", -1)
+        self.assertEqual(self.store.load_scores(), {})  # nothing written on the request path
+        self.assertEqual(self.board.flush(), 2)  # alice's two changes coalesce
+        self.assertEqual(self.store.load_scores(), {"alice": 2, "bob": -1})
+
+        restored = Leaderboard(self.store)
+        restored.load()
+        self.assertEqual(restored.rank("alice")["rank"], 1)
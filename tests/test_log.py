@@ -0,0 +1,48 @@
+import io
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.common import log
+
+
+class TestLog(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        log.set_stream(self.stream)
+
+    def tearDown(self):
+        log.flush()
+        log.set_stream(None)
+        log.set_level("INFO")
+
+    def test_level_filtering_and_fields(self):
+        log.set_level("INFO")
+        logger = log.get_logger("test")
+        logger.debug("hidden")
+        logger.info("Client connected", address="127.0.0.1", port=8080)
+        log.flush()
+        output = self.stream.getvalue()
+        self.assertNotIn("hidden", output)
+        self.assertIn("INFO    test: Client connected address=127.0.0.1 port=8080", output)
+
+    def test_sampling(self):
+        log.set_level("DEBUG")
+        logger = log.get_logger("test_sampling")
+        for i in range(10):
+            logger.debug("Received request", sample=5)
+        log.flush()
+        self.assertEqual(self.stream.getvalue().count("Received request"), 2)
+
+    def test_flush_keeps_one_writer(self):
+        logger = log.get_logger("test_flush")
+        logger.info("first")
+        self.assertTrue(log.flush())
+        writer = log._manager.writer.thread
+        logger.info("second")
+        self.assertTrue(log.flush())
+        self.assertIs(log._manager.writer.thread, writer)
+        output = self.stream.getvalue()
+        self.assertLess(output.index("first"), output.index("second"))
@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.server.metrics import Histogram, Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_percentiles(self):
+        histogram = Histogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        self.assertEqual(histogram.total, 10000)
+        self.assertAlmostEqual(histogram.percentile(50), 5000, delta=5000 * 0.07)
+        self.assertAlmostEqual(histogram.percentile(99), 9900, delta=9900 * 0.07)
+        self.assertEqual(histogram.max, 10000)
+
+    def test_histogram_is_bounded(self):
+        histogram = Histogram()
+        buckets = len(histogram.counts)
+        histogram.record(10 ** 15)
+        histogram.record(-1)
+        self.assertEqual(len(histogram.counts), buckets)
+        self.assertEqual(histogram.total, 2)
+
+    def test_observe_and_snapshot(self):
+        metrics = Metrics()
+        metrics.observe("login", 0.002)
+        metrics.observe("login", 0.004, error=True)
+        metrics.inc("throttled", method="login")
+        metrics.gauge_callback("active_rooms", lambda: 3)
+        snap = metrics.snapshot()
+        self.assertEqual(snap["methods"]["login"]["requests"], 2)
+        self.assertEqual(snap["methods"]["login"]["errors"], 1)
+        self.assertEqual(snap["gauges"]["active_rooms"], 3)
+        self.assertEqual(metrics.counter("throttled", method="login"), 1)
+
+    def test_prometheus_text(self):
+        metrics = Metrics()
+        metrics.observe("get_game_state", 0.001)
+        metrics.set_gauge("open_connections", 2)
+        text = metrics.prometheus_text()
+        self.assertIn('mindroll_rpc_requests_total{method="get_game_state"} 1', text)
+        self.assertIn("mindroll_open_connections 2", text)
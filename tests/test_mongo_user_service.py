@@ -0,0 +1,54 @@
+import time
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from benchmarks.fake_mongo import FakeMongoClient
+from src.common.users import User, Role
+from src.common.users.mongo_user_service import MongoUserService
+
+
+class TestMongoUserService(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeMongoClient()
+        self.service = MongoUserService(client=self.client)
+        self.service.add_user(User("alice", "Alice", Role.ADMIN, "pw"))
+        self.client.reset_ops()
+
+    def test_profile_cache(self):
+        self.service.cache_ttl = 0.1
+        self.assertEqual(self.service.get_user_by_username("alice").role, Role.ADMIN)
+        self.assertEqual(self.service.get_user_by_username("alice").name, "Alice")
+        self.assertEqual(self.client.ops[("users", "find_one")], 1)
+        self.assertEqual(self.service.cache_hit_rate, 0.5)
+
+        time.sleep(0.15)  # past cache_ttl
+        self.service.get_user_by_username("alice")
+        self.assertEqual(self.client.ops[("users", "find_one")], 2)
+
+    def test_add_user_invalidates(self):
+        self.assertIsNone(self.service.get_user_by_username("bob"))
+        self.service.add_user(User("bob", "Bob", Role.USER, "pw"))
+        self.assertEqual(self.service.get_user_by_username("bob").name, "Bob")
+
+    def test_taken_username_skips_hashing(self):
+        self.service.get_user_by_username("alice")
+        self.client.reset_ops()
+        started = time.perf_counter()
+        with self.assertRaises(ValueError):
+            self.service.add_user(User("alice", None, None, "pw"))
+        self.assertLess(time.perf_counter() - started, 0.05)  # no bcrypt round
+        self.assertEqual(self.client.ops[("users", "insert_one")], 0)
+
+    def test_authenticate_user(self):
+        user = self.service.authenticate_user("alice", "pw")
+        self.assertEqual(user, User("alice", "Alice", Role.ADMIN, None))
+        self.assertEqual(self.client.ops[("users", "find_one")], 1)
+        self.assertIsNone(self.service.authenticate_user("alice", "wrong"))
+        self.assertIsNone(self.service.authenticate_user("nobody", "pw"))
+        # the profile was cached by the successful login
+        self.client.reset_ops()
+        self.service.get_user_by_username("alice")
+        self.assertEqual(self.client.ops[("users", "find_one")], 0)
@@ -0,0 +1,85 @@
+import socket
+import threading
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.pipelined_client import PipelinedMindRollClient
+from src.common.utils import Request, Response, EncodedResponse, MessageReader, FrameTooLarge, deserialize, encode_message
+
+
+class TestProtocol(unittest.TestCase):
+    def setUp(self):
+        self.left, self.right = socket.socketpair()
+        self.reader = MessageReader(self.right, bufsize=7)
+
+    def tearDown(self):
+        self.left.close()
+        self.right.close()
+
+    def test_pipelined_frames(self):
+        self.left.sendall(encode_message(Request("get_game_state", ["room1"], id=1)) +
+                          encode_message(Request("get_game_state", ["room2"], id=2)))
+        first = Request.from_dict(self.reader.read_message())
+        second = Request.from_dict(self.reader.read_message())
+        self.assertEqual((first.id, first.args), (1, ["room1"]))
+        self.assertEqual((second.id, second.args), (2, ["room2"]))
+
+    def test_frame_without_newline(self):
+        self.left.sendall(b'{"name": "login", "args": ["a", "b"]}')
+        self.assertEqual(self.reader.read_message()["name"], "login")
+
+    def test_bad_frame_is_skipped(self):
+        self.left.sendall(b'not json\n{"name": "login"}\n')
+        with self.assertRaises(ValueError):
+            self.reader.read_message()
+        self.assertEqual(self.reader.read_message()["name"], "login")
+
+    def test_oversized_frame(self):
+        reader = MessageReader(self.right, bufsize=64, max_message_size=256)
+        self.left.sendall(b'{"name": "' + b"x" * 1000)
+        with self.assertRaises(FrameTooLarge):
+            reader.read_message()
+
+    def test_eof(self):
+        self.left.close()
+        self.assertIsNone(self.reader.read_message())
+
+    def test_response_id_round_trip(self):
+        response = deserialize('{"result": "ok", "error": null, "id": 7}')
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.id, 7)
+        self.assertNotIn("id", Response("ok").to_dict())
+
+    def test_encoded_response(self):
+        result = {"players": {"a": {"dice_number": 3}}, "winner": None}
+        for id in (None, 7, "x"):
+            encoded = EncodedResponse(b'{"players": {"a": {"dice_number": 3}}, "winner": null}', id)
+            self.assertEqual(encode_message(encoded), encode_message(Response(result, None, id)))
+            self.assertEqual(encoded.result, result)
+
+
+class TestPipelinedTimeout(unittest.TestCase):
+    def test_slow_response_keeps_connection(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        self.addCleanup(server.close)
+
+        def serve():
+            conn, _ = server.accept()
+            reader = MessageReader(conn)
+            while (message := reader.read_message()) is not None:
+                if message["name"] != "slow":
+                    conn.sendall(encode_message(Response("ok", None, message["id"])))
+            conn.close()
+        threading.Thread(target=serve, daemon=True).start()
+
+        client = PipelinedMindRollClient(server.getsockname(), timeout=0.2)
+        self.addCleanup(client.close)
+        self.assertIsNone(client.send_request("slow"))
+        self.assertTrue(client.connected)
+        self.assertEqual(client.send_request("fast").result, "ok")
+        self.assertEqual(client.in_flight(), 0)
@@ -0,0 +1,78 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.rpc_client import MindRollClient
+from src.server.ratelimit import RateLimiter, TokenBucket
+from src.server.rpc_server import MindRollServer
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10.0, burst=3, now=0.0)
+        self.assertEqual([bucket.take(0.0) for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.take(0.0), 0.1)
+        self.assertAlmostEqual(bucket.take(0.05), 0.05)
+        self.assertEqual(bucket.take(0.1), 0.0)
+        self.assertFalse(bucket.idle(0.2))
+        self.assertTrue(bucket.idle(0.5))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_per_connection_and_per_token(self):
+        limiter = RateLimiter({"get_game_state": (1.0, 2), "login": None}, default=(100.0, 100))
+        first, second = limiter.connection_buckets(), limiter.connection_buckets()
+        self.assertEqual(limiter.check(first, None, "get_game_state", now=0.0), (0.0, None))
+        self.assertEqual(limiter.check(first, None, "get_game_state", now=0.0), (0.0, None))
+        self.assertEqual(limiter.check(first, None, "get_game_state", now=0.0), (1.0, "connection"))
+        self.assertEqual(limiter.check(second, None, "get_game_state", now=0.0), (0.0, None))  # its own bucket
+        self.assertEqual(limiter.check(first, None, "call_number", now=0.0), (0.0, None))      # per method
+
+        # one token shared by two connections: the token's bucket runs out first
+        third, fourth = limiter.connection_buckets(), limiter.connection_buckets()
+        self.assertEqual(limiter.check(third, "t", "get_game_state", now=10.0), (0.0, None))
+        self.assertEqual(limiter.check(fourth, "t", "get_game_state", now=10.0), (0.0, None))
+        self.assertEqual(limiter.check(fourth, "t", "get_game_state", now=10.0), (1.0, "token"))
+
+        for _ in range(100):
+            self.assertEqual(limiter.check(first, None, "login", now=10.0), (0.0, None))  # unlimited
+
+    def test_idle_token_buckets_are_swept(self):
+        limiter = RateLimiter({}, default=(10.0, 5), sweep_every=3)
+        buckets = limiter.connection_buckets()
+        limiter.check(buckets, "a", "get_game_state", now=0.0)
+        limiter.check(buckets, "b", "get_game_state", now=0.0)
+        self.assertEqual(limiter.token_buckets(), 2)
+        limiter.check(buckets, "c", "get_game_state", now=5.0)  # third check sweeps the refilled ones
+        self.assertEqual(limiter.token_buckets(), 1)
+
+
+class TestThrottledClient(unittest.TestCase):
+    def test_client_waits_and_retries(self):
+        server = MindRollServer(host="127.0.0.1", port=0, backend="memory",
+                                rate_limits={"get_game_state": (20.0, 1)})
+        threading.Thread(target=server.start, daemon=True).start()
+        while not server.running:
+            time.sleep(0.01)
+        self.addCleanup(server.stop)
+        address = ("127.0.0.1", server.server_socket.getsockname()[1])
+
+        impatient = MindRollClient(address, auto_reconnect=False, throttle_retries=0)
+        self.addCleanup(impatient.close)
+        impatient.create_room("room1")
+        self.assertIsNone(impatient.get_game_state("room1").error)
+        self.assertRegex(impatient.get_game_state("room1").error, r"^Rate limited, retry after \d+ ms$")
+
+        patient = MindRollClient(address, auto_reconnect=False)
+        self.addCleanup(patient.close)
+        for _ in range(5):
+            self.assertIsNone(patient.get_game_state("room1").error)
+        self.assertGreaterEqual(server.metrics.counter("throttled", method="get_game_state", scope="connection"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
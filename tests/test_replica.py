@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.rpc_client import MindRollClient
+from src.common.utils import Request, encode_message
+from src.server.backup_server import BackupServer
+from src.server.rpc_server import MindRollServer
+
+
+class TestBackupServer(unittest.TestCase):
+    def setUp(self):
+        self.server = MindRollServer(port=0, backend="memory")
+        self.addCleanup(self.server.stop)
+        self.backup = BackupServer(port=0)
+        self.server.set_backup_server(self.backup)
+
+    def read(self, name, *args, min_version=0):
+        return self.backup.handle_request(Request(name, list(args), {"min_version": min_version}))
+
+    def test_rooms_are_copied_on_every_change(self):
+        self.server.create_room(Request("create_room", ["room1"]))
+        game = self.server.games["room1"]
+        game.add_player("alice")
+        game.add_player("bob")
+        self.assertEqual(self.backup.applied_version, self.server.replication_version)
+
+        state = self.read("get_game_state", "room1")
+        self.assertEqual(state.result, json.loads(game.state_json()))
+        self.assertEqual(set(state.result["players"]), {"alice", "bob"})
+        self.assertEqual(self.read("list_rooms").result, self.server.list_rooms(Request("list_rooms")).result)
+
+        game.remove_player("bob")  # a change no RPC handler syncs by hand
+        self.assertEqual(set(self.read("get_game_state", "room1").result["players"]), {"alice"})
+        self.server.close_room("room1")
+        self.assertEqual(self.read("get_game_state", "room1").error, "Room does not exist")
+        self.assertEqual(self.read("list_rooms").result["total"], 0)
+
+    def test_scores(self):
+        self.server.leaderboard.add("alice", 3)
+        self.server.leaderboard.add("bob", 5)
+        self.server.set_backup_server(self.backup)  # attaching copies the scores there are
+        self.server.sync_scores({"alice": self.server.leaderboard.add("alice", 4)})
+        self.assertEqual(self.read("leaderboard_top").result, self.server.leaderboard.top())
+        self.assertEqual(self.read("player_rank", "alice").result["rank"], 1)
+        self.assertEqual(self.read("player_rank", "carol").error, "Player has no score yet")
+
+    def test_refuses_what_it_cannot_answer(self):
+        self.server.create_room(Request("create_room", ["room1"]))
+        self.assertRegex(self.read("get_game_state", "room1", min_version=self.backup.applied_version + 1).error,
+                         r"^Replica behind")
+        self.assertRegex(self.read("call_number", "room1", "alice", 14).error, r"^Read-only replica")
+        self.backup.last_update_time = time.time() - self.backup.max_staleness - 1
+        self.assertRegex(self.read("get_game_state", "room1").error, r"^Replica stale")
+
+    def test_responses_carry_the_version(self):
+        self.backup.update_room("room1", (b'{"players": {}}', {"room_id": "room1"}), 7)
+        response = self.backup.handle_request(Request("get_game_state", ["room1"]))
+        response.version = self.backup.applied_version
+        self.assertEqual(encode_message(response), b'{"result": {"players": {}}, "error": null, "version": 7}\n')
+
+
+class TestReplicaReads(unittest.TestCase):
+    def assertCount(self, server, method, expected, field="requests"):
+        """ A server records a request just after answering it, so give it a moment. """
+        deadline = time.time() + 5
+        count = None
+        while count != expected and time.time() < deadline:
+            stats = server.metrics.methods.get(method)
+            count = getattr(stats, field) if stats else 0
+            time.sleep(0.01)
+        self.assertEqual(count, expected)
+
+    def start(self, server):
+        threading.Thread(target=server.start, daemon=True).start()
+        while not server.running:
+            time.sleep(0.01)
+        self.addCleanup(server.stop)
+        return ("127.0.0.1", server.server_socket.getsockname()[1])
+
+    def test_read_your_writes(self):
+        server = MindRollServer(host="127.0.0.1", port=0, backend="memory", rate_limits=False)
+        backup = BackupServer(host="127.0.0.1", port=0)
+        server.set_backup_server(backup)
+        client = MindRollClient(self.start(server), auto_reconnect=False, replica_address=self.start(backup))
+        self.addCleanup(client.close)
+
+        client.register("alice", "pw")
+        client.login("alice", "pw")
+        client.create_room("room1")
+        client.join_room("room1", "alice")
+        client.join_room("room1", "bob")
+        self.assertGreater(client.written_version, 0)
+        state = client.get_game_state("room1")
+        self.assertGreaterEqual(state.version, client.written_version)
+        self.assertCount(backup, "get_game_state", 1)
+        self.assertEqual(client.list_rooms().result["total"], 1)
+
+        # a replica that has not applied our last write yet is skipped
+        client.written_version = backup.applied_version + 1000
+        self.assertEqual(set(client.get_game_state("room1").result["players"]), {"alice", "bob"})
+        self.assertCount(backup, "get_game_state", 1, "errors")
+        self.assertCount(server, "get_game_state", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
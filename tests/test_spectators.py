@@ -0,0 +1,101 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.rpc_client import MindRollClient
+from src.common.utils import MessageReader
+from src.server.game_logic import GameRoom
+from src.server.rpc_server import MindRollServer
+from src.server.spectators import SpectatorHub, Watcher
+
+
+class TestSpectatorHub(unittest.TestCase):
+    def test_one_encoding_per_change(self):
+        game = GameRoom("room1")
+        hub = SpectatorHub({"room1": game}.get)
+        game.add_listener(hub.on_event)
+        watchers = [Watcher(None) for _ in range(50)]
+        hub.rooms["room1"] = set(watchers)
+        encoded = []
+        encode = hub.encode
+        hub.encode = lambda room_id, g: encoded.append(room_id) or encode(room_id, g)
+
+        game.add_player("alice")
+        hub.publish("room1")
+        self.assertEqual(len(encoded), 1)
+        frames = {watcher.take() for watcher in watchers}
+        self.assertEqual(len(frames), 1)  # the very same bytes for everyone
+        self.assertEqual(json.loads(frames.pop())["result"]["state"]["players_order"], ["alice"])
+
+    def test_slow_watcher_keeps_latest_only(self):
+        game = GameRoom("room1")
+        hub = SpectatorHub({"room1": game}.get)
+        watcher = Watcher(None)
+        hub.rooms["room1"] = {watcher}
+        for name in ["alice", "bob", "carol"]:
+            game.add_player(name)
+            hub.publish("room1")
+        hub.publish("room1")  # nothing changed: not offered again
+        self.assertEqual(watcher.skipped, 2)
+        frame = json.loads(watcher.take())["result"]
+        self.assertEqual((frame["version"], frame["state"]["players_order"]), (3, ["alice", "bob", "carol"]))
+        self.assertIsNone(watcher.take())
+
+
+class TestSpectateRoom(unittest.TestCase):
+    def setUp(self):
+        self.server = MindRollServer(host="127.0.0.1", port=0, backend="memory")
+        threading.Thread(target=self.server.start, daemon=True).start()
+        while not self.server.running:
+            time.sleep(0.01)
+        self.address = ("127.0.0.1", self.server.server_socket.getsockname()[1])
+        self.addCleanup(self.server.stop)
+
+    def test_spectator_follows_room(self):
+        player = MindRollClient(self.address, auto_reconnect=False)
+        self.addCleanup(player.close)
+        player.register("alice", "pw")
+        player.login("alice", "pw")
+        player.create_room("room1")
+        player.join_room("room1", "alice")
+
+        spectator = MindRollClient(self.address, auto_reconnect=False)
+        self.addCleanup(spectator.close)
+        updates = spectator.spectate("room1")
+        self.assertEqual(next(updates)["state"]["players_order"], ["alice"])
+
+        player.add_bot("room1", "robo")
+        self.assertEqual(next(updates)["state"]["players_order"], ["alice", "robo"])
+        self.assertEqual(self.server.spectators.count("room1"), 1)
+        self.assertEqual(len(self.server.games["room1"].players), 2)  # spectators are not players
+
+        player.leave_room("room1", "alice")  # only the bot is left: the room closes
+        for _ in updates:  # ends on "Room closed"
+            pass
+        self.assertEqual(self.server.spectators.count(), 0)
+        self.assertIsNotNone(spectator.get_game_state("room1").error)  # back to plain RPCs
+
+    def test_gone_spectator_is_dropped(self):
+        player = MindRollClient(self.address, auto_reconnect=False)
+        self.addCleanup(player.close)
+        player.create_room("room1")
+        sock = socket.create_connection(self.address)
+        sock.sendall(b'{"name": "spectate_room", "args": ["room1"]}\n')
+        reader = MessageReader(sock)
+        self.assertIsNone(reader.read_message()["error"])
+        self.assertEqual(reader.read_message()["result"]["room"], "room1")
+        sock.close()
+        deadline = time.time() + 5
+        while self.server.spectators.count() and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.server.spectators.count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
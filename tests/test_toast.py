@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.client.toast import ToastManager
+
+
+class TestToastManager(unittest.TestCase):
+    def setUp(self):
+        self.toasts = ToastManager(lifetime=2.0, max_visible=2)
+
+    def messages(self, now):
+        return [toast.message for toast in self.toasts.update(now)]
+
+    def test_queue_and_expiry(self):
+        for message in ("a", "b", "c"):
+            self.toasts.push(message, now=0)
+        self.assertEqual(self.messages(0), ["a", "b"])
+        self.assertEqual(self.messages(1.5), ["a", "b"])
+        # "c" only starts its lifetime once a slot frees up
+        self.assertEqual(self.messages(2.5), ["c"])
+        self.assertEqual(self.messages(4.0), ["c"])
+        self.assertEqual(self.messages(5.0), [])
+
+    def test_visible_duplicate_refreshes(self):
+        self.toasts.push("Call success: 7", now=0)
+        self.toasts.update(0)
+        self.assertFalse(self.toasts.push("Call success: 7", now=1.5))
+        self.assertEqual(self.messages(3.0), ["Call success: 7"])
+
+    def test_keyed_result_shown_once(self):
+        self.assertTrue(self.toasts.push("alice wins!", key="last_result", now=0))
+        self.toasts.update(0)
+        self.toasts.update(10)
+        self.assertFalse(self.toasts.push("alice wins!", key="last_result", now=10))
+        self.toasts.forget("last_result")
+        self.assertTrue(self.toasts.push("alice wins!", key="last_result", now=11))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import unittest
+import sys
+import os
+from datetime import timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from benchmarks.fake_mongo import FakeMongoClient
+from src.common.users import User, Role, Credentials
+from src.common.users.mongo_auth_service import MongoAuthenticationService
+from src.common.users.mongo_user_service import MongoUserService
+from src.common.users.store import utcnow
+from src.server.metrics import Metrics
+
+
+def forge(payload, key):
+    """ A stateless token signed with `key`, built by hand. """
+    encode = lambda data: base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+    body = "v1." + encode(json.dumps(payload).encode("utf-8"))
+    return f"{body}.{encode(hmac.new(key, body.encode('ascii'), hashlib.sha256).digest())}"
+
+
+class TestStatelessTokens(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.users = MongoUserService(client=FakeMongoClient())
+        cls.users.add_user(User("alice", "Alice", Role.USER, "pw"))
+
+    def setUp(self):
+        self.auth = self.make_auth()
+
+    def tearDown(self):
+        self.auth.stop()
+
+    def make_auth(self, **kwargs):
+        auth = MongoAuthenticationService(self.users, secret="test-secret", debug=False, stateless=True, **kwargs)
+        self.addCleanup(auth.stop)
+        return auth
+
+    def login(self, duration=None):
+        return self.auth.authenticate(Credentials("alice", "pw"), duration).signature
+
+    def test_round_trip(self):
+        token = self.login()
+        token_obj = self.auth.validate_token_by_str(token)
+        self.assertEqual(token_obj.user, User("alice", "Alice", Role.USER, None))
+        self.assertEqual(self.users.token_count(), 0)  # nothing stored
+
+    def test_secret_required(self):
+        os.environ.pop("MINDROLL_TOKEN_SECRET", None)
+        with self.assertRaises(ValueError):
+            MongoAuthenticationService(self.users, debug=False, stateless=True)
+
+    def test_rejects_tampered_and_forged(self):
+        token = self.login()
+        body, _, signature = token.rpartition(".")
+        payload = json.loads(base64.urlsafe_b64decode(body[3:] + "=" * (-len(body[3:]) % 4)))
+        payload["r"] = "ADMIN"
+        tampered = forge(payload, b"wrong-key").rpartition(".")[0] + "." + signature
+        self.assertIsNone(self.auth.validate_token_by_str(tampered))
+        self.assertIsNone(self.auth.validate_token_by_str(forge(payload, b"mindroll-secret")))
+        self.assertIsNone(self.auth.validate_token_by_str("v1.garbage"))
+        self.assertEqual(self.auth.validate_token_by_str(forge(payload, b"test-secret")).user.role, Role.ADMIN)
+
+    def test_rejects_expired(self):
+        token = self.login(timedelta(seconds=-1))
+        self.assertIsNone(self.auth.validate_token_by_str(token))
+
+    def test_revoke_token(self):
+        kept, revoked = self.login(), self.login()
+        self.assertTrue(self.auth.revoke(revoked))
+        self.assertIsNone(self.auth.validate_token_by_str(revoked))
+        self.assertIsNotNone(self.auth.validate_token_by_str(kept))
+        self.assertFalse(self.auth.revoke(revoked))
+
+    def test_revoke_user_cutoff(self):
+        before = self.login()
+        time.sleep(0.01)
+        self.auth.revoke_user("alice")
+        time.sleep(0.01)
+        after = self.login()
+        self.assertIsNone(self.auth.validate_token_by_str(before))
+        self.assertIsNotNone(self.auth.validate_token_by_str(after))
+
+    def test_late_revocation_is_replicated(self):
+        other = self.make_auth()
+        token = self.login()
+        other.revocations.refresh()
+        # written by a server whose clock is behind what `other` has already seen
+        self.auth.revoke(self.login())
+        other.revocations.refresh()
+        self.users.insert_revocation({"jti": self.auth._payload(token)["j"], "username": "alice",
+                                      "expiration": utcnow() + timedelta(hours=1),
+                                      "created": utcnow() - timedelta(seconds=30)})
+        other.revocations.refresh()
+        self.assertIsNone(other.validate_token_by_str(token))
+
+
+class TestStoredTokens(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeMongoClient()
+        self.users = MongoUserService(client=self.client)
+        self.users.add_user(User("alice", "Alice", Role.USER, "pw"))
+        self.metrics = Metrics()
+        self.auth = MongoAuthenticationService(self.users, debug=False, max_tokens_per_user=2, metrics=self.metrics)
+        self.addCleanup(self.auth.stop)
+
+    def login(self, duration=None):
+        return self.auth.authenticate(Credentials("alice", "pw"), duration).signature
+
+    def test_cap_evicts_oldest(self):
+        tokens = [self.login() for _ in range(3)]
+        self.assertIsNone(self.auth.validate_token_by_str(tokens[0]))
+        self.assertIsNotNone(self.auth.validate_token_by_str(tokens[1]))
+        self.assertIsNotNone(self.auth.validate_token_by_str(tokens[2]))
+        self.assertEqual(self.auth.token_count(), 2)
+        self.assertEqual(self.metrics.counter("tokens_evicted"), 1)
+
+    def test_sweep_expired(self):
+        expired, live = self.login(timedelta(seconds=-1)), self.login()
+        self.assertIsNone(self.auth.validate_token_by_str(expired))
+        self.assertEqual(self.auth.sweep_expired(), 1)
+        self.assertEqual(self.auth.token_count(), 1)
+        self.assertIsNotNone(self.auth.validate_token_by_str(live))
+        self.assertEqual(self.metrics.counter("tokens_swept"), 1)
+
+    def test_lookup_timing_is_not_an_rpc(self):
+        self.auth.validate_token_by_str(self.login())
+        snapshot = self.metrics.snapshot()
+        self.assertNotIn("auth.token_lookup", snapshot["methods"])
+        self.assertEqual(snapshot["timings"]["auth.token_lookup"]["count"], 1)
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "needs time.tzset")
+    def test_expiration_is_utc(self):
+        saved = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        time.tzset()
+        try:
+            token = self.login()
+        finally:
+            if saved is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = saved
+            time.tzset()
+        stored = self.users.find_token(token)["expiration"]
+        # what Mongo's TTL monitor compares against: UTC
+        self.assertAlmostEqual((stored - utcnow()).total_seconds(), 3600, delta=5)
+        self.assertEqual(stored.microsecond % 1000, 0)  # survives Mongo's millisecond precision
+        self.assertIsNotNone(self.auth.validate_token_by_str(token))
@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from src.common.users import User, Role, Credentials
+from src.common.users.auth_service import AuthService
+from src.common.users.store import create_store, utcnow
+
+
+class UserStoreContract:
+    """ Behaviour every UserStore backend must share; subclasses provide make_store(). """
+
+    def setUp(self):
+        self.store = self.make_store()
+        self.store.add_user(User("alice", "Alice", Role.ADMIN, "pw"))
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_users(self):
+        self.assertEqual(self.store.get_user_by_username("alice"),
+                         User("alice", "Alice", Role.ADMIN, None))
+        self.assertIsNone(self.store.get_user_by_username("nobody"))
+        self.assertEqual(self.store.authenticate_user("alice", "pw").role, Role.ADMIN)
+        self.assertIsNone(self.store.authenticate_user("alice", "wrong"))
+        with self.assertRaises(ValueError):
+            self.store.add_user(User("alice", None, None, "again"))
+
+    def test_add_users(self):
+        users = [User(name, None, None, "pw") for name in ("bob", "alice", "carol", "bob")]
+        summary = self.store.add_users(users, batch_size=3)
+        self.assertEqual(summary["inserted"], 2)
+        self.assertEqual(sorted(summary["duplicates"]), ["alice", "bob"])
+        summary = self.store.add_users([User("dave", None, None, "pw"), User("carol", None, None, "pw"),
+                                        User("erin", None, None, "pw")], ordered=True)
+        self.assertEqual((summary["inserted"], summary["stopped"]), (1, True))
+        self.assertIsNone(self.store.get_user_by_username("erin"))
+
+    def test_tokens(self):
+        now = utcnow()
+        for i in range(3):
+            self.store.insert_token({"signature": f"s{i}", "username": "alice",
+                                     "expiration": now + timedelta(seconds=i - 1), "created": now})
+        self.assertEqual(self.store.find_token("s2")["expiration"], now + timedelta(seconds=1))
+        self.assertEqual(sorted(t["signature"] for t in self.store.user_tokens("alice")), ["s0", "s1", "s2"])
+        self.assertEqual(self.store.delete_expired(now), 1)
+        self.store.delete_tokens(["s1"])
+        self.assertEqual(self.store.token_count(), 1)
+        self.store.delete_user_tokens("alice")
+        self.assertIsNone(self.store.find_token("s2"))
+
+    def test_auth_service(self):
+        auth = AuthService(self.store, debug=False, max_tokens_per_user=2)
+        tokens = [auth.authenticate(Credentials("alice", "pw")).signature for _ in range(3)]
+        self.assertIsNone(auth.validate_token_by_str(tokens[0]))  # evicted by the cap
+        self.assertEqual(auth.validate_token_by_str(tokens[2]).user.username, "alice")
+        self.assertTrue(auth.revoke(tokens[2]))
+        self.assertIsNone(auth.validate_token_by_str(tokens[2]))
+        auth.stop()
+
+    def test_scores(self):
+        self.store.save_scores({"alice": 3, "bob": -1})
+        self.store.save_scores({"alice": 4})
+        self.assertEqual(self.store.load_scores(), {"alice": 4, "bob": -1})
+
+    def test_stateless_revocation_is_replicated(self):
+        issuer = AuthService(self.store, secret="test-secret", debug=False, stateless=True)
+        other = AuthService(self.store, secret="test-secret", debug=False, stateless=True)
+        token = issuer.authenticate(Credentials("alice", "pw")).signature
+        self.assertEqual(other.validate_token_by_str(token).user.role, Role.ADMIN)
+        issuer.revoke(token)
+        other.revocations.refresh()
+        self.assertIsNone(other.validate_token_by_str(token))
+        self.assertEqual(self.store.token_count(), 0)
+        issuer.stop()
+        other.stop()
+
+
+class TestInMemoryUserStore(UserStoreContract, unittest.TestCase):
+    def make_store(self):
+        return create_store("memory", shards=4)
+
+
+class TestSQLiteUserStore(UserStoreContract, unittest.TestCase):
+    def make_store(self):
+        self.tmp = tempfile.mkdtemp()
+        return create_store("sqlite", path=os.path.join(self.tmp, "users.db"))
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmp)
+
+    def test_shared_between_threads(self):
+        import threading
+        found = []
+        thread = threading.Thread(target=lambda: found.append(self.store.get_user_by_username("alice")))
+        thread.start()
+        thread.join()
+        self.assertEqual(found[0].username, "alice")
+
+
+if __name__ == "__main__":
+    unittest.main()